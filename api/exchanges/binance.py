@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 
 from directionalscalper.api.exchanges.exchange import Exchange
 from directionalscalper.api.exchanges.utils import Intervals
@@ -17,6 +18,24 @@ class Binance(Exchange):
     exchange = "binance"
     futures_api_url = "https://fapi.binance.com"
     max_weight = 1000
+    weight_window = 60
+
+    def update_weight_from_headers(self, headers) -> None:
+        # X-MBX-USED-WEIGHT-1M: weight used by this IP in the current minute
+        if not headers or headers.get("X-MBX-USED-WEIGHT-1M") is None:
+            return
+        used = int(headers["X-MBX-USED-WEIGHT-1M"])
+        now = time.time()
+        self.request_weight.update(used=used, limit=self.max_weight, reset_at=now - now % 60 + 60)
+
+    def kline_weight(self, limit: int) -> int:
+        if limit < 100:
+            return 1
+        if limit < 500:
+            return 2
+        if limit <= 1000:
+            return 5
+        return 10
 
     def get_futures_symbols(self) -> dict:
         self.check_weight()
@@ -27,6 +46,7 @@ class Binance(Exchange):
             url_path="/fapi/v1/exchangeInfo",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         leverages = self.get_max_leverages()
         if "symbols" in raw_json:
             for symbol in raw_json["symbols"]:
@@ -65,6 +85,7 @@ class Binance(Exchange):
             url_path="/fapi/v1/exchangeInfo",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         leverages = {}
         for symbol in raw_json:
             leverages[symbol] = float(0)
@@ -83,19 +104,21 @@ class Binance(Exchange):
             url_path="/fapi/v1/ticker/price",
             payload=params,
         )
+        self.update_weight_from_headers(header)
 
         if "price" in [*raw_json]:
             return float(raw_json["price"])
         return float(-1.0)
 
     def get_futures_prices(self) -> dict:
-        self.check_weight()
+        self.check_weight(2)
         params: dict = {}
         header, raw_json = send_public_request(
             url=self.futures_api_url,
             url_path="/fapi/v1/ticker/price",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         prices = {}
         if len(raw_json) > 0:
             for pair in raw_json:
@@ -103,7 +126,7 @@ class Binance(Exchange):
         return prices
 
     def get_futures_volumes(self) -> dict:
-        self.check_weight()
+        self.check_weight(40)
         params: dict = {}
 
         header, raw_json = send_public_request(
@@ -111,6 +134,7 @@ class Binance(Exchange):
             url_path="/api/v3/ticker/24hr",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         volumes = {}
         if len(raw_json) > 0:
             for pair in raw_json:
@@ -123,7 +147,7 @@ class Binance(Exchange):
         interval: Intervals = Intervals.ONE_DAY,
         limit: int = 200,
     ) -> list:
-        self.check_weight()
+        self.check_weight(self.kline_weight(limit))
 
         params = {"symbol": symbol, "limit": limit, "interval": interval}
         header, raw_json = send_public_request(
@@ -131,6 +155,7 @@ class Binance(Exchange):
             url_path="/fapi/v1/klines",
             payload=params,
         )
+        self.update_weight_from_headers(header)
 
         if len(raw_json) > 0:
             return [
@@ -154,6 +179,7 @@ class Binance(Exchange):
             url_path="/fapi/v1/fundingRate",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         if len(raw_json) > 0:
             return float(raw_json[0]["fundingRate"])
         return 0.0
@@ -169,6 +195,7 @@ class Binance(Exchange):
             url_path="/fapi/v1/openInterest",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         if len(raw_json) > 0:
             return [float(raw_json["openInterest"])]
         return oi
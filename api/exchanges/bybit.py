@@ -4,7 +4,7 @@ import logging
 
 from directionalscalper.api.exchanges.exchange import Exchange
 from directionalscalper.api.exchanges.utils import Intervals
-from directionalscalper.core.utils import send_public_request
+from directionalscalper.core.utils import async_send_public_request, send_public_request
 from decimal import Decimal
 
 log = logging.getLogger(__name__)
@@ -17,7 +17,26 @@ class Bybit(Exchange):
 
     exchange = "bybit"
     futures_api_url = "https://api.bybit.com"
-    max_weight = 1200
+    # Bybit allows 600 HTTP requests per IP in any 5 second window
+    max_weight = 600
+    weight_window = 5
+
+    def update_weight_from_headers(self, headers) -> None:
+        """
+        X-Bapi-Limit-Status: requests left of X-Bapi-Limit until
+        X-Bapi-Limit-Reset-Timestamp (ms). Bybit only sends these on private
+        endpoints; the public market endpoints this adapter calls come without
+        them and are paced by the local count against max_weight.
+        """
+        if not headers:
+            return
+        status = headers.get("X-Bapi-Limit-Status")
+        limit = headers.get("X-Bapi-Limit")
+        reset = headers.get("X-Bapi-Limit-Reset-Timestamp")
+        if status is None or limit is None or reset is None:
+            return
+        used = int(limit) - int(status)
+        self.request_weight.update(used=used, limit=int(limit), reset_at=int(reset) / 1000)
 
     def get_futures_symbols(self) -> dict:
         self.check_weight()
@@ -28,6 +47,7 @@ class Bybit(Exchange):
             url_path="/v5/market/instruments-info",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         if "result" in raw_json:
             if "list" in raw_json["result"]:
                 for symbol in raw_json["result"]["list"]:
@@ -52,6 +72,7 @@ class Bybit(Exchange):
         header, raw_json = send_public_request(
             url=self.futures_api_url, url_path="/v5/market/tickers", payload=params
         )
+        self.update_weight_from_headers(header)
         if "result" in [*raw_json]:
             if "list" in [*raw_json["result"]]:
                 if len(raw_json["result"]["list"]) > 0:
@@ -65,6 +86,7 @@ class Bybit(Exchange):
         header, raw_json = send_public_request(
             url=self.futures_api_url, url_path="/v5/market/tickers", payload=params
         )
+        self.update_weight_from_headers(header)
         prices = {}
         if "result" in [*raw_json]:
             if "list" in [*raw_json["result"]]:
@@ -78,6 +100,7 @@ class Bybit(Exchange):
         header, raw_json = send_public_request(
             url=self.futures_api_url, url_path="/v5/market/tickers", payload=params
         )
+        self.update_weight_from_headers(header)
         volumes = {}
         if "result" in [*raw_json]:
             if "list" in [*raw_json["result"]]:
@@ -190,6 +213,30 @@ class Bybit(Exchange):
     ) -> list:
         log.info(f"Fetching kline data for {symbol}")
         self.check_weight()
+        params = self.kline_params(symbol=symbol, interval=interval, limit=limit)
+        log.info(f"Sending request with params: {params}")
+        header, raw_json = send_public_request(
+            url=self.futures_api_url, url_path="/v5/market/kline", payload=params
+        )
+        self.update_weight_from_headers(header)
+        return self.parse_kline(symbol=symbol, raw_json=raw_json)
+
+    async def async_get_futures_kline(
+        self,
+        session,
+        symbol: str,
+        interval: Intervals = Intervals.ONE_DAY,
+        limit: int = 200,
+    ) -> list:
+        await self.async_check_weight()
+        params = self.kline_params(symbol=symbol, interval=interval, limit=limit)
+        header, raw_json = await async_send_public_request(
+            session, url=self.futures_api_url, url_path="/v5/market/kline", payload=params
+        )
+        self.update_weight_from_headers(header)
+        return self.parse_kline(symbol=symbol, raw_json=raw_json)
+
+    def kline_params(self, symbol: str, interval: str, limit: int) -> dict:
         custom_intervals = {
             "1m": 1,
             "5m": 5,
@@ -202,17 +249,14 @@ class Bybit(Exchange):
         }
 
         # Increase the limit by 1 to fetch an additional candle
-        params = {
+        return {
             "category": "linear",
             "symbol": symbol,
             "limit": limit + 1,
             "interval": custom_intervals[interval],
         }
-        log.info(f"Sending request with params: {params}")
-        header, raw_json = send_public_request(
-            url=self.futures_api_url, url_path="/v5/market/kline", payload=params
-        )
 
+    def parse_kline(self, symbol: str, raw_json) -> list:
         if "result" in [*raw_json]:
             if "list" in [*raw_json["result"]]:
                 if len(raw_json["result"]["list"]) > 0:
@@ -334,13 +378,29 @@ class Bybit(Exchange):
 
     def get_funding_rate(self, symbol: str) -> float:
         self.check_weight()
-        funding = 0.0
         params = {"category": "linear", "symbol": symbol}
         header, raw_json = send_public_request(
             url=self.futures_api_url,
             url_path="/v5/market/funding/history",
             payload=params,
         )
+        self.update_weight_from_headers(header)
+        return self.parse_funding_rate(raw_json)
+
+    async def async_get_funding_rate(self, session, symbol: str) -> float:
+        await self.async_check_weight()
+        params = {"category": "linear", "symbol": symbol}
+        header, raw_json = await async_send_public_request(
+            session,
+            url=self.futures_api_url,
+            url_path="/v5/market/funding/history",
+            payload=params,
+        )
+        self.update_weight_from_headers(header)
+        return self.parse_funding_rate(raw_json)
+
+    def parse_funding_rate(self, raw_json) -> float:
+        funding = 0.0
         if "result" in [*raw_json]:
             if "list" in [*raw_json["result"]]:
                 if len(raw_json["result"]["list"]) > 0:
@@ -372,6 +432,7 @@ class Bybit(Exchange):
             url_path="/v5/market/open-interest",
             payload=params,
         )
+        self.update_weight_from_headers(header)
         if "result" in [*raw_json]:
             if "list" in [*raw_json["result"]]:
                 for item in raw_json["result"]["list"]:
@@ -1,34 +1,149 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 import time
+from collections import deque
 
-from directionalscalper.api.exchanges.utils import Intervals
+from .utils import Intervals
 
 log = logging.getLogger(__name__)
 
 
+class RequestWeight:
+    """
+    Sliding-window request weight counter shared by every adapter instance
+    of one exchange.
+
+    reserve() books the weight of the next request and returns how long to
+    wait before sending it. Requests go out immediately while less than
+    pace_from of the budget is used; past that they are spaced evenly so the
+    rest of the budget lasts until the window (or the exchange's own reset
+    time) rolls over, instead of running into the limit and stopping.
+
+    The exchange's view of the used weight, read from its response headers,
+    is tracked next to the local count and whichever is stricter wins.
+    """
+
+    def __init__(self, limit: int, window: float = 60, pace_from: float = 0.5):
+        self.limit = limit
+        self.window = window
+        self.pace_from = pace_from
+        self.entries: deque = deque()
+        self.used = 0
+        self.next_at = 0.0
+        self.server_used = 0
+        self.server_limit = 0
+        self.server_reset = 0.0
+        self.lock = threading.Lock()
+
+    def expire(self, now: float) -> None:
+        while self.entries and self.entries[0][0] <= now - self.window:
+            self.used -= self.entries.popleft()[1]
+
+    def local_wait(self, now: float, at: float, cost: int) -> float:
+        if self.used + cost > self.limit:
+            # Wait for enough of the oldest weight to leave the window
+            freed = 0
+            for sent_at, weight in self.entries:
+                freed += weight
+                if self.used - freed + cost <= self.limit:
+                    return max(at, sent_at + self.window)
+            return at + self.window
+        if self.used >= self.limit * self.pace_from:
+            return max(at, self.next_at + self.window * cost / self.limit)
+        return at
+
+    def server_wait(self, now: float, at: float, cost: int) -> float:
+        if not self.server_limit or now >= self.server_reset:
+            return at
+        remaining = self.server_limit - self.server_used
+        if remaining < cost:
+            return max(at, self.server_reset)
+        if self.server_used >= self.server_limit * self.pace_from:
+            paced = self.next_at + (self.server_reset - now) * cost / remaining
+            return max(at, min(paced, self.server_reset))
+        return at
+
+    def reserve(self, cost: int = 1) -> float:
+        """
+        :returns float: seconds to wait before sending the request
+        """
+        with self.lock:
+            now = time.time()
+            self.expire(now)
+            at = self.server_wait(now, self.local_wait(now, now, cost), cost)
+            self.next_at = max(self.next_at, at)
+            self.entries.append((self.next_at, cost))
+            self.used += cost
+            if self.server_limit and now < self.server_reset:
+                self.server_used += cost
+            return self.next_at - now
+
+    def update(self, used: int, limit: int, reset_at: float) -> None:
+        """
+        Record the weight the exchange reports as used out of limit, until reset_at.
+        """
+        with self.lock:
+            self.server_used = used
+            self.server_limit = limit
+            self.server_reset = reset_at
+
+
 class Exchange:
     def __init__(self):
-        pass
+        # Instruments info indexed by symbol, see get_symbols_info()
+        self.symbols_info: dict = {}
+        self.symbols_info_updated = 0.0
+        self.symbols_info_lock = threading.Lock()
 
     exchange: str | None = None
     futures_api_url: str | None = None
-    weight: int = 0
     max_weight: int = 100
+    weight_window: float = 60
+    symbols_info_ttl: int = 3600
+
+    request_weights: dict = {}
+    request_weights_lock = threading.Lock()
 
     def check_api_permissions(self, account: dict) -> None:
         pass
 
-    def check_weight(self) -> None:
-        if self.weight >= self.max_weight:
-            log.info(
-                f"Weight {self.weight} is greater than {self.max_weight}, sleeping for 60 seconds"
-            )
-            time.sleep(60)
+    @property
+    def request_weight(self) -> RequestWeight:
+        # One counter per exchange, shared by every instance and thread
+        with Exchange.request_weights_lock:
+            if self.exchange not in Exchange.request_weights:
+                Exchange.request_weights[self.exchange] = RequestWeight(
+                    limit=self.max_weight, window=self.weight_window
+                )
+            return Exchange.request_weights[self.exchange]
+
+    def check_weight(self, cost: int = 1) -> None:
+        delay = self.request_weight.reserve(cost)
+        if delay > 0:
+            log.debug(f"Pacing {self.exchange} requests, waiting {delay:.2f} seconds")
+            time.sleep(delay)
+
+    async def async_check_weight(self, cost: int = 1) -> None:
+        delay = self.request_weight.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
 
     def update_weight(self, weight: int) -> None:
-        self.weight = weight
+        self.request_weight.update(
+            used=weight,
+            limit=self.max_weight,
+            reset_at=time.time() + self.weight_window,
+        )
+
+    def update_weight_from_headers(self, headers) -> None:
+        """
+        Read the used request weight from the exchange's rate limit response
+        headers. Responses without them leave pacing to the local count.
+        """
+        pass
 
     def get_futures_symbols(self) -> dict:
         return {}
@@ -50,16 +165,55 @@ class Exchange:
     ) -> list:
         return []
 
+    async def async_get_futures_kline(
+        self,
+        session,
+        symbol: str,
+        interval: Intervals = Intervals.ONE_DAY,
+        limit: int = 500,
+    ) -> list:
+        # Exchanges without an aiohttp implementation make the blocking request
+        # in the loop's default executor instead of stalling every other request
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.get_futures_kline(symbol=symbol, interval=interval, limit=limit)
+        )
+
     def get_funding_rate(self, symbol) -> float:
         return 0.0
 
+    async def async_get_funding_rate(self, session, symbol) -> float:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_funding_rate, symbol)
+
     def get_open_interest(
         self, symbol: str, interval: Intervals = Intervals.ONE_DAY, limit: int = 200
     ) -> list:
         return []
 
+    def get_symbols_info(self, max_age: float | None = None) -> dict:
+        """
+        Cached get_futures_symbols(), downloaded again once it is older than
+        max_age seconds (symbols_info_ttl by default). Concurrent callers
+        share a single download.
+        """
+        if max_age is None:
+            max_age = self.symbols_info_ttl
+        if self.symbols_info and time.time() - self.symbols_info_updated <= max_age:
+            return self.symbols_info
+        started = time.time()
+        with self.symbols_info_lock:
+            if self.symbols_info_updated < started:
+                symbols_info = self.get_futures_symbols()
+                if symbols_info:
+                    self.symbols_info = symbols_info
+                    self.symbols_info_updated = time.time()
+                else:
+                    log.warning("Failed to refresh symbols info, keeping the cached list")
+        return self.symbols_info
+
     def get_symbol_info(self, symbol: str, info: str):
-        symbols_info = self.get_futures_symbols()
+        symbols_info = self.get_symbols_info()
 
         if symbol in symbols_info:
             if info in symbols_info[symbol]:
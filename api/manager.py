@@ -6,15 +6,20 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 import pandas as pd
 
 import requests  # type: ignore
 
 from directionalscalper.core.utils import send_public_request
+from api.quantdata import ASSET_VALUE_FIELDS, COLUMNAR_SUFFIX, AssetData, QuantSnapshot
 
 
 log = logging.getLogger(__name__)
 
+QUANT_DATA_URL = "http://api.tradesimple.xyz/data/quantdatav2.json"
+ROTATOR_SYMBOLS_URL = "http://api.tradesimple.xyz/data/rotatorsymbols.json"
+
 from time import sleep
 
 class InvalidAPI(Exception):
@@ -30,22 +35,58 @@ class Manager:
         cache_life_seconds: int = 10,
         path: Path | None = None,
         url: str = "",
+        rotator_refresh_seconds: int = 60,
+        delta_url: str = "",
+        long_poll_seconds: int = 0,
+        rotator_url: str = ROTATOR_SYMBOLS_URL,
+        bootstrap_timeout: int = 120,
     ):
         self.exchange = exchange
         log.info("Starting API Manager")
         self.api = api
         self.cache_life_seconds = cache_life_seconds
         self.path = path
-        self.url = url
+        self.url = url if len(url) >= 6 else QUANT_DATA_URL
+        # Give up on the first snapshot after this many seconds instead of waiting forever
+        self.bootstrap_timeout = bootstrap_timeout
         self.last_checked = 0.0
-        self.data = {}
+        self.last_refreshed = 0.0
+        self.data_etag = None
+        # Delta stream published next to a columnar snapshot, see QuantPublisher
+        self.delta_url = delta_url
+        self.delta_etag = None
+        # When set, a background thread holds a request open on the server
+        # until the next scraper cycle instead of refreshing every cache period
+        self.long_poll_seconds = long_poll_seconds
+        self.watch_thread = None
+        self.data = QuantSnapshot()
+        self.refresh_lock = Lock()
+
+        # Rotator symbol list, refreshed in the background with conditional GETs
+        self.rotator_url = rotator_url
+        self.rotator_refresh_seconds = rotator_refresh_seconds
+        self.rotator_symbols = []
+        self.rotator_filtered = {}
+        self.rotator_etag = None
+        self.rotator_last_modified = None
+        self.rotator_last_refresh = 0.0
+        # Successful or not, so threads queued behind a failed request do not repeat it
+        self.rotator_last_attempt = 0.0
+        self.rotator_failures = 0
+        self.rotator_max_retries = 10
+        self.rotator_retry_seconds = 30
+        self.rotator_lock = Lock()
+        # Guards the symbol list together with the filtered lists derived from it
+        self.rotator_filter_lock = Lock()
+        self.rotator_thread = None
+        self.session = requests.Session()
 
         if self.api == "remote":
             log.info("API manager mode: remote")
-            if len(self.url) < 6:
-                self.url = "http://api.tradesimple.xyz/data/quantdatav2.json"
             log.info(f"Remote API URL: {self.url}")
             self.data = self.get_remote_data()
+            if self.long_poll_seconds > 0:
+                self.start_watching()
 
         elif self.api == "local":
             if len(str(self.path)) < 6:
@@ -75,7 +116,8 @@ class Manager:
             raise InvalidAPI(message=f"{self.path} is not a file")
         f = open(self.path)
         try:
-            self.data = json.load(f)
+            self.data = QuantSnapshot(json.load(f))
+            self.last_refreshed = self.data.created
         except json.JSONDecodeError as exc:
             raise ValueError(
                 f"ERROR: Invalid JSON: {exc.msg}, line {exc.lineno}, column {exc.colno}"
@@ -84,58 +126,115 @@ class Manager:
         return self.data
 
     def get_auto_rotate_symbols(self, min_qty_threshold: float = None, whitelist: list = None, blacklist: list = None, max_retries: int = 10, delay_between_retries: int = 30):
+        """
+        Filtered rotator symbols from the cached list. Only the first call
+        makes a request, shared with the threads calling meanwhile. If it
+        fails the list stays empty while the background refresher retries up
+        to `max_retries` times, `delay_between_retries` seconds apart.
+        """
+        if self.rotator_last_attempt == 0:
+            self.refresh_rotator_symbols()
+        self.start_rotator_refresher(max_retries, delay_between_retries)
+
+        key = (min_qty_threshold, tuple(whitelist or ()), tuple(blacklist or ()))
+        with self.rotator_filter_lock:
+            symbols = self.rotator_filtered.get(key)
+            if symbols is None:
+                symbols = self.filter_rotator_symbols(self.rotator_symbols, min_qty_threshold, whitelist, blacklist)
+                self.rotator_filtered[key] = symbols
+        return list(symbols)
+
+    def filter_rotator_symbols(self, assets, min_qty_threshold=None, whitelist=None, blacklist=None):
         symbols = []
-        url = "http://api.tradesimple.xyz/data/rotatorsymbols.json"
-
-        for retry in range(max_retries):
+        for asset in assets:
+            symbol = asset.get("Asset", "")
+            min_qty = asset.get("Min qty", 0)
+
+            # Only consider the whitelist if it's not empty or None
+            if whitelist and symbol not in whitelist and len(whitelist) > 0:
+                continue
+
+            # Consider the blacklist regardless of whether it's empty or not
+            if blacklist and symbol in blacklist:
+                continue
+
+            if min_qty_threshold is None or min_qty <= min_qty_threshold:
+                symbols.append(symbol)
+
+        log.debug(f"Filtered {len(assets)} rotator assets to {len(symbols)} symbols")
+        return symbols
+
+    def start_rotator_refresher(self, max_retries: int = 10, delay_between_retries: int = 30):
+        if self.rotator_thread is not None:
+            return
+        with self.rotator_lock:
+            if self.rotator_thread is not None:
+                return
+            self.rotator_max_retries = max_retries
+            self.rotator_retry_seconds = delay_between_retries
+            self.rotator_thread = Thread(target=self.rotator_refresh_loop, daemon=True)
+            self.rotator_thread.start()
+
+    def rotator_refresh_loop(self):
+        while True:
+            # Retry sooner after a failure, then fall back to the usual period
+            retrying = 0 < self.rotator_failures <= self.rotator_max_retries
+            sleep(self.rotator_retry_seconds if retrying else self.rotator_refresh_seconds)
+            self.refresh_rotator_symbols()
+
+    def refresh_rotator_symbols(self) -> bool:
+        """
+        Fetch the rotator symbol list unless another thread just tried.
+        Callers arriving while a request is in flight wait for it and share
+        its outcome, failures included.
+
+        :returns bool: True if the latest attempt succeeded
+        """
+        started = time.time()
+        with self.rotator_lock:
+            if self.rotator_last_attempt >= started:
+                return self.rotator_failures == 0
             try:
-                log.debug(f"Sending request to {url} (Attempt: {retry + 1})")
-                header, raw_json = send_public_request(url=url)
-                
-                if isinstance(raw_json, list):
-                    log.debug(f"Received {len(raw_json)} assets from API")
-                    
-                    for asset in raw_json:
-                        symbol = asset.get("Asset", "")
-                        min_qty = asset.get("Min qty", 0)
-                        log.debug(f"Processing symbol {symbol} with min_qty {min_qty}")
-
-                        # Only consider the whitelist if it's not empty or None
-                        if whitelist and symbol not in whitelist and len(whitelist) > 0:
-                            log.debug(f"Skipping {symbol} as it's not in whitelist")
-                            continue
-
-                        # Consider the blacklist regardless of whether it's empty or not
-                        if blacklist and symbol in blacklist:
-                            log.debug(f"Skipping {symbol} as it's in blacklist")
-                            continue
-
-                        if min_qty_threshold is None or min_qty <= min_qty_threshold:
-                            symbols.append(symbol)
-
-                    log.debug(f"Returning {len(symbols)} symbols")
-                    return symbols
-
-                else:
-                    log.error("Unexpected data format. Expected a list of assets.")
-                    if retry < max_retries - 1:
-                        sleep(delay_between_retries)
-                    else:
-                        return []
-
+                self.fetch_rotator_symbols()
+                self.rotator_failures = 0
             except requests.exceptions.RequestException as e:
                 log.error(f"Request failed: {e}")
+                self.rotator_failures += 1
             except json.decoder.JSONDecodeError as e:
                 log.error(f"Failed to parse JSON: {e}")
+                self.rotator_failures += 1
             except Exception as e:
                 log.error(f"Unexpected error occurred: {e}")
-
-            # Wait before the next retry
-            if retry < max_retries - 1:
-                sleep(delay_between_retries)
-        
-        # Return empty list if all retries fail
-        return []
+                self.rotator_failures += 1
+            self.rotator_last_attempt = time.time()
+            return self.rotator_failures == 0
+
+    def fetch_rotator_symbols(self):
+        headers = {}
+        if self.rotator_etag:
+            headers["If-None-Match"] = self.rotator_etag
+        if self.rotator_last_modified:
+            headers["If-Modified-Since"] = self.rotator_last_modified
+
+        log.debug(f"Sending request to {self.rotator_url}")
+        response = self.session.get(self.rotator_url, headers=headers, timeout=5)
+        if response.status_code == 304:
+            log.debug("Rotator symbols not modified")
+            self.rotator_last_refresh = time.time()
+            return
+        response.raise_for_status()
+
+        raw_json = response.json()
+        if not isinstance(raw_json, list):
+            raise ValueError("Unexpected data format. Expected a list of assets.")
+
+        log.debug(f"Received {len(raw_json)} assets from API")
+        self.rotator_etag = response.headers.get("ETag")
+        self.rotator_last_modified = response.headers.get("Last-Modified")
+        with self.rotator_filter_lock:
+            self.rotator_symbols = raw_json
+            self.rotator_filtered = {}
+        self.rotator_last_refresh = time.time()
 
     # def get_auto_rotate_symbols(self, min_qty_threshold: float = None, whitelist: list = None, blacklist: list = None, max_symbols: int = 12, max_retries: int = 10, delay_between_retries: int = 30):
     #     symbols = []
@@ -196,23 +295,10 @@ class Manager:
     #     return []
 
     def get_symbols(self):
-        url = "http://api.tradesimple.xyz/data/rotatorsymbols.json"
-        try:
-            header, raw_json = send_public_request(url=url)
-            if isinstance(raw_json, list):
-                return raw_json
-            else:
-                log.error("Unexpected data format. Expected a list of symbols.")
-                return []
-        except requests.exceptions.RequestException as e:
-            log.error(f"Request failed: {e}")
-            return []
-        except json.decoder.JSONDecodeError as e:
-            log.error(f"Failed to parse JSON: {e}")
-            return []
-        except Exception as e:
-            log.error(f"Unexpected error occurred: {e}")
-            return []
+        if self.rotator_last_attempt == 0:
+            self.refresh_rotator_symbols()
+        self.start_rotator_refresher()
+        return self.rotator_symbols
 
     # def get_remote_data(self):
     #     if not self.check_timestamp():
@@ -223,28 +309,157 @@ class Manager:
     #     return self.data
 
     def get_remote_data(self):
-            if not self.check_timestamp():
-                return self.data
-            while True:  # Keep trying until a successful request is made
-                try:
-                    header, raw_json = send_public_request(url=self.url)
-                    self.data = raw_json
-                    break  # if the request was successful, break the loop
-                except requests.exceptions.RequestException as e:
-                    log.error(f"Request failed: {e}, retrying...")
-                except json.decoder.JSONDecodeError as e:
-                    log.error(f"Failed to parse JSON: {e}, retrying...")
-                except Exception as e:
-                    log.error(f"Unexpected error occurred: {e}, retrying...")
-                finally:
-                    self.update_last_checked()
+        """
+        Stale-while-revalidate read of the remote quant data.
+
+        Until the first snapshot arrives one thread fetches and the others
+        wait for it. After that a stale snapshot is returned right away while
+        a single background thread refreshes it, so the remote API sees at
+        most one request per cache period however many symbols are running.
+        """
+        if self.last_refreshed == 0:
+            with self.refresh_lock:
+                deadline = time.time() + self.bootstrap_timeout
+                while self.last_refreshed == 0:
+                    if self.fetch_remote_data():
+                        break
+                    if time.time() >= deadline:
+                        raise InvalidAPI(
+                            message=f"No quant data from {self.url} after {self.bootstrap_timeout}s, "
+                            "check the api url (a local feed needs the scraper running with --serve)"
+                        )
+                    sleep(5)
             return self.data
+        self.refresh_in_background()
+        return self.data
+
+    def fetch_remote_data(self, wait: int = 0) -> Optional[bool]:
+        """
+        Make one request for the remote quant data and swap in the new
+        snapshot. On failure the previous snapshot is kept.
+
+        :param wait: seconds the server may hold the request until new data
+            is published (long-poll, columnar and delta urls only)
+        :returns: True if a new snapshot was swapped in, False if the server
+            answered 304 Not Modified, None if the request failed
+        """
+        try:
+            if self.url.endswith(COLUMNAR_SUFFIX) and self.delta_url:
+                data = self.fetch_delta_data(wait=wait)
+            elif self.url.endswith(COLUMNAR_SUFFIX):
+                data = self.fetch_columnar_data(wait=wait)
+            else:
+                header, raw_json = send_public_request(url=self.url)
+                # send_public_request returns a blank response instead of raising
+                if not isinstance(raw_json, list):
+                    raise ValueError(f"unexpected response {str(raw_json)[:100]!r}")
+                data = QuantSnapshot(raw_json)
+            # Not modified still confirms the current snapshot is fresh
+            self.last_refreshed = time.time()
+            if data is None:
+                return False
+            self.data = data
+            return True
+        except Exception as e:
+            if self.last_refreshed:
+                log.error(f"Failed to refresh quant data, serving snapshot {self.data_age():.0f}s old: {e}")
+            else:
+                log.error(f"Failed to load quant data, retrying: {e}")
+            return None
+        finally:
+            self.update_last_checked()
+
+    def fetch_columnar_data(self, conditional: bool = True, wait: int = 0) -> Optional[QuantSnapshot]:
+        """
+        Conditional GET of a columnar (.qdc) snapshot, decoded straight into
+        a QuantSnapshot. None when the server answers 304 Not Modified.
+        """
+        headers = {}
+        if conditional and self.data_etag and self.last_refreshed:
+            headers["If-None-Match"] = self.data_etag
+        response = self.session.get(self.url, headers=headers, **self.long_poll_args(wait if headers else 0))
+        if response.status_code == 304:
+            log.debug("Quant data not modified")
+            return None
+        response.raise_for_status()
+        data = QuantSnapshot.from_columns(response.content)
+        self.data_etag = response.headers.get("ETag")
+        return data
+
+    def fetch_delta_data(self, wait: int = 0) -> Optional[QuantSnapshot]:
+        """
+        Bring the snapshot up to date from the delta stream. Deltas newer
+        than the snapshot are applied in order; a full snapshot is fetched
+        first when there is none yet or when deltas are missing (the scraper
+        restarted, or we fell further behind than the deltas it keeps).
+        None when neither has changed since the current snapshot.
+        """
+        data = self.data
+        if data.seq is None:
+            data = self.fetch_columnar_data(conditional=False)
+
+        headers = {}
+        if self.delta_etag and data is self.data:
+            headers["If-None-Match"] = self.delta_etag
+        response = self.session.get(self.delta_url, headers=headers, **self.long_poll_args(wait if headers else 0))
+        if response.status_code == 304:
+            log.debug("Quant data deltas not modified")
+            return None
+        response.raise_for_status()
+        stream = response.json()
+
+        deltas = [delta for delta in stream["deltas"] if delta["seq"] > data.seq]
+        if stream["seq"] < data.seq or (deltas and deltas[0]["seq"] != data.seq + 1):
+            log.info(f"Quant data sequence gap at {data.seq} (latest {stream['seq']}), fetching full snapshot")
+            data = self.fetch_columnar_data(conditional=False)
+            deltas = [delta for delta in stream["deltas"] if delta["seq"] > data.seq]
+            if deltas and deltas[0]["seq"] != data.seq + 1:
+                raise ValueError(f"snapshot {data.seq} is not covered by deltas from {deltas[0]['seq']}")
+
+        for delta in deltas:
+            data = data.apply_delta(delta)
+        self.delta_etag = response.headers.get("ETag")
+        return data
+
+    def long_poll_args(self, wait: int) -> dict:
+        if wait <= 0:
+            return {"timeout": 5}
+        return {"params": {"wait": wait}, "timeout": wait + 5}
+
+    def start_watching(self):
+        if not self.url.endswith(COLUMNAR_SUFFIX):
+            log.warning("Long-poll needs a columnar (.qdc) quant data url, refreshing every cache period instead")
+            return
+        self.watch_thread = Thread(target=self.watch_loop, daemon=True)
+        self.watch_thread.start()
+
+    def watch_loop(self):
+        while True:
+            started = time.time()
+            with self.refresh_lock:
+                refreshed = self.fetch_remote_data(wait=self.long_poll_seconds)
+            if refreshed is None:
+                sleep(5)
+            elif not refreshed and time.time() - started < self.long_poll_seconds / 2:
+                # Answered 304 without holding the request: the server does not
+                # long-poll (e.g. nginx), so poll once per cache period instead
+                sleep(self.cache_life_seconds)
+
+    def data_age(self) -> float:
+        """
+        :returns float: seconds since the quant data was last refreshed
+        """
+        if self.last_refreshed == 0:
+            return float("inf")
+        return time.time() - self.last_refreshed
 
     def check_timestamp(self):
         return datetime.now().timestamp() - self.last_checked > self.cache_life_seconds
 
     def get_asset_data(self, symbol: str, data):
         try:
+            if isinstance(data, QuantSnapshot):
+                return data.rows.get(symbol)
             for asset in data:
                 if asset["Asset"] == symbol:
                     return asset
@@ -260,58 +475,61 @@ class Manager:
 
     def get_asset_value(self, symbol: str, data, value: str):
         try:
-            asset_data = self.get_asset_data(symbol, data)
-            if asset_data is not None:
-                if value == "Price" and "Price" in asset_data:
-                    return asset_data["Price"]
-                if value == "1mVol" and "1m 1x Volume (USDT)" in asset_data:
-                    return asset_data["1m 1x Volume (USDT)"]
-                if value == "5mVol" and "5m 1x Volume (USDT)" in asset_data:
-                    return asset_data["5m 1x Volume (USDT)"]
-                if value == "1hVol" and "1m 1h Volume (USDT)" in asset_data:
-                    return asset_data["1h 1x Volume (USDT)"]
-                if value == "1mSpread" and "1m Spread" in asset_data:
-                    return asset_data["1m Spread"]
-                if value == "5mSpread" and "5m Spread" in asset_data:
-                    return asset_data["5m Spread"]
-                if value == "15mSpread" and "15m Spread" in asset_data:
-                    return asset_data["15m Spread"]
-                if value == "30mSpread" and "30m Spread" in asset_data:
-                    return asset_data["30m Spread"]
-                if value == "1hSpread" and "1h Spread" in asset_data:
-                    return asset_data["1h Spread"]
-                if value == "4hSpread" and "4h Spread" in asset_data:
-                    return asset_data["4h Spread"]
-                if value == "Trend" and "Trend" in asset_data:
-                    return asset_data["Trend"]
-                if value == "Funding" and "Funding" in asset_data:
-                    return asset_data["Funding"]
-                if value == "MFI" and "MFI" in asset_data:
-                    return asset_data["MFI"]
-                if value == "ERI Bull Power" in asset_data:
-                    return asset_data["ERI Bull Power"]
-                if value == "ERI Bear Power" in asset_data:
-                    return asset_data["ERI Bear Power"]
-                if value == "ERI Trend" in asset_data:
-                    return asset_data["ERI Trend"]
+            if isinstance(data, QuantSnapshot):
+                return data.value(symbol, value)
+            # Raw list: parse only the row asked for
+            row = self.get_asset_data(symbol, data)
+            field = ASSET_VALUE_FIELDS.get(value)
+            if row is None or field is None:
+                return None
+            return getattr(AssetData.from_row(row), field)
         except Exception as e:
             log.warning(f"{e}")
         return None
 
+    def refresh_in_background(self):
+        """
+        Start one background refresh when the snapshot is stale, so readers
+        never wait on the network.
+        """
+        if self.watch_thread is not None:
+            # The long-poll thread keeps the snapshot current
+            return
+        if not self.check_timestamp() or not self.refresh_lock.acquire(blocking=False):
+            return
+        if not self.check_timestamp():
+            # Another thread finished a refresh while we were checking
+            self.refresh_lock.release()
+            return
+
+        def refresh():
+            try:
+                if self.api == "remote":
+                    self.fetch_remote_data()
+                else:
+                    self.get_local_data()
+            finally:
+                self.refresh_lock.release()
+
+        Thread(target=refresh, daemon=True).start()
+
     def get_api_data(self, symbol):
-        data = self.get_data()
+        # Served from the current snapshot, refreshes happen off this thread
+        self.refresh_in_background()
+        data = self.data
         api_data = {
-            '1mVol': self.get_asset_value(symbol, data, "1mVol"),
-            '1hVol': self.get_asset_value(symbol, data, "1hVol"),
-            '1mSpread': self.get_asset_value(symbol, data, "1mSpread"),
-            '5mSpread': self.get_asset_value(symbol, data, "5mSpread"),
-            '30mSpread': self.get_asset_value(symbol, data, "30mSpread"),
-            '1hSpread': self.get_asset_value(symbol, data, "1hSpread"),
-            '4hSpread': self.get_asset_value(symbol, data, "4hSpread"),
-            'Trend': self.get_asset_value(symbol, data, "Trend"),
-            'MFI': self.get_asset_value(symbol, data, "MFI"),
-            'ERI Trend': self.get_asset_value(symbol, data, "ERI Trend"),
-            'Funding': self.get_asset_value(symbol, data, "Funding"),
-            'Symbols': self.get_symbols()
+            '1mVol': data.value(symbol, "1mVol"),
+            '1hVol': data.value(symbol, "1hVol"),
+            '1mSpread': data.value(symbol, "1mSpread"),
+            '5mSpread': data.value(symbol, "5mSpread"),
+            '30mSpread': data.value(symbol, "30mSpread"),
+            '1hSpread': data.value(symbol, "1hSpread"),
+            '4hSpread': data.value(symbol, "4hSpread"),
+            'Trend': data.value(symbol, "Trend"),
+            'MFI': data.value(symbol, "MFI"),
+            'ERI Trend': data.value(symbol, "ERI Trend"),
+            'Funding': data.value(symbol, "Funding"),
+            # The rotator list is only fetched once a rotator asks for it
+            'Symbols': self.rotator_symbols or list(data)
         }
-        return api_data
\ No newline at end of file
+        return api_data
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import sys
+import time
+import os
+import zlib
+from array import array
+from collections import deque
+from typing import NamedTuple, Optional
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _str(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+class AssetData(NamedTuple):
+    asset: str
+    min_qty: Optional[float]
+    price: Optional[float]
+    one_minute_volume: Optional[float]
+    five_minute_volume: Optional[float]
+    thirty_minute_volume: Optional[float]
+    one_hour_volume: Optional[float]
+    one_minute_spread: Optional[float]
+    five_minute_spread: Optional[float]
+    fifteen_minute_spread: Optional[float]
+    thirty_minute_spread: Optional[float]
+    one_hour_spread: Optional[float]
+    four_hour_spread: Optional[float]
+    trend_pct: Optional[float]
+    trend: Optional[str]
+    ma6_high_5m: Optional[float]
+    ma6_low_5m: Optional[float]
+    funding: Optional[float]
+    mfi: Optional[str]
+    eri_bull_power: Optional[float]
+    eri_bear_power: Optional[float]
+    eri_trend: Optional[str]
+    timestamp: Optional[str]
+
+    @classmethod
+    def from_row(cls, row: dict) -> AssetData:
+        return cls(row["Asset"], *(convert(row.get(column)) for column, convert in ASSET_DATA_COLUMNS[1:]))
+
+    @classmethod
+    def from_columns(cls, columns: dict, float_columns=()) -> list:
+        """
+        :param columns: value list per quant data column, as in a columnar snapshot
+        :param float_columns: columns already holding only floats and None
+        :returns list: one AssetData per row
+        """
+        rows = len(columns["Asset"])
+        converted = [columns["Asset"]]
+        for column, convert in ASSET_DATA_COLUMNS[1:]:
+            if column not in columns:
+                converted.append([None] * rows)
+            elif convert is _float and column in float_columns:
+                converted.append(columns[column])
+            else:
+                converted.append(list(map(convert, columns[column])))
+        return list(map(cls._make, zip(*converted)))
+
+
+# Quant data column and converter of every AssetData field, in field order
+ASSET_DATA_COLUMNS = (
+    ("Asset", str),
+    ("Min qty", _float),
+    ("Price", _float),
+    ("1m 1x Volume (USDT)", _float),
+    ("5m 1x Volume (USDT)", _float),
+    ("30m 1x Volume (USDT)", _float),
+    ("1h 1x Volume (USDT)", _float),
+    ("1m Spread", _float),
+    ("5m Spread", _float),
+    ("15m Spread", _float),
+    ("30m Spread", _float),
+    ("1h Spread", _float),
+    ("4h Spread", _float),
+    ("trend%", _float),
+    ("Trend", _str),
+    ("5m MA6 high", _float),
+    ("5m MA6 low", _float),
+    ("Funding", _float),
+    ("MFI", _str),
+    ("ERI Bull Power", _float),
+    ("ERI Bear Power", _float),
+    ("ERI Trend", _str),
+    ("Timestamp", _str),
+)
+
+
+# Manager.get_asset_value() keys and the AssetData field each one reads
+ASSET_VALUE_FIELDS = {
+    "Price": "price",
+    "1mVol": "one_minute_volume",
+    "5mVol": "five_minute_volume",
+    "30mVol": "thirty_minute_volume",
+    "1hVol": "one_hour_volume",
+    "1mSpread": "one_minute_spread",
+    "5mSpread": "five_minute_spread",
+    "15mSpread": "fifteen_minute_spread",
+    "30mSpread": "thirty_minute_spread",
+    "1hSpread": "one_hour_spread",
+    "4hSpread": "four_hour_spread",
+    "Trend": "trend",
+    "Funding": "funding",
+    "MFI": "mfi",
+    "ERI Bull Power": "eri_bull_power",
+    "ERI Bear Power": "eri_bear_power",
+    "ERI Trend": "eri_trend",
+}
+
+
+# Columnar snapshot file (.qdc): magic, schema version and SHA-256 of the
+# body, then the zlib-compressed body. The body starts with a JSON index
+# line {"rows": n, "columns": [[name, type], ...], "seq": publication
+# sequence number, when published by QuantPublisher} followed by one block per
+# column: "f8"/"i8" columns are n little-endian doubles/int64s (NaN for
+# null), "json" columns a JSON list of the values.
+COLUMNAR_MAGIC = b"QDC"
+COLUMNAR_SCHEMA_VERSION = 1
+COLUMNAR_HEADER = struct.Struct("<3sB32s")
+COLUMNAR_SUFFIX = ".qdc"
+
+
+def _column_type(values: list) -> str:
+    if all(type(value) is int for value in values):
+        return "i8"
+    if all(type(value) in (int, float) or value is None for value in values):
+        return "f8"
+    return "json"
+
+
+def _pack_column(values: list, column_type: str) -> bytes:
+    if column_type == "json":
+        return json.dumps(values, separators=(",", ":")).encode() + b"\n"
+    if column_type == "f8":
+        values = [float("nan") if value is None else value for value in values]
+    packed = array("q" if column_type == "i8" else "d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_column(body: bytes, offset: int, rows: int, column_type: str):
+    if column_type == "json":
+        end = body.index(b"\n", offset)
+        return json.loads(body[offset:end]), end + 1
+    packed = array("q" if column_type == "i8" else "d")
+    end = offset + rows * packed.itemsize
+    packed.frombytes(body[offset:end])
+    if sys.byteorder == "big":
+        packed.byteswap()
+    values = packed.tolist()
+    if column_type == "f8":
+        # NaN stands for null, like DataFrame.to_json() writes it
+        values = [None if value != value else value for value in values]
+    return values, end
+
+
+def encode_columns(rows: list, columns: Optional[list] = None, seq: Optional[int] = None) -> bytes:
+    """
+    :param rows: asset rows as returned by the quant data API
+    :param columns: column order, the keys of the first row by default
+    :param seq: publication sequence number to store in the index
+    :returns bytes: the .qdc payload
+    """
+    if columns is None:
+        columns = list(rows[0]) if rows else []
+    values = [[row.get(column) for row in rows] for column in columns]
+    types = [_column_type(column_values) for column_values in values]
+    index = {"rows": len(rows), "columns": [list(column) for column in zip(columns, types)]}
+    if seq is not None:
+        index["seq"] = seq
+    index = json.dumps(index)
+    blocks = [_pack_column(column_values, column_type) for column_values, column_type in zip(values, types)]
+    body = zlib.compress(index.encode() + b"\n" + b"".join(blocks))
+    return COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_SCHEMA_VERSION, hashlib.sha256(body).digest()) + body
+
+
+def decode_column_block(payload: bytes):
+    """
+    :returns tuple: (value list per column in column order, JSON index) of a .qdc payload
+    :raises ValueError: on an unknown format or schema version, or a corrupt body
+    """
+    if len(payload) < COLUMNAR_HEADER.size:
+        raise ValueError("truncated columnar snapshot")
+    magic, version, digest = COLUMNAR_HEADER.unpack_from(payload)
+    if magic != COLUMNAR_MAGIC:
+        raise ValueError("not a columnar snapshot")
+    if version != COLUMNAR_SCHEMA_VERSION:
+        raise ValueError(f"unsupported columnar schema version {version}")
+    compressed = payload[COLUMNAR_HEADER.size:]
+    if hashlib.sha256(compressed).digest() != digest:
+        raise ValueError("columnar snapshot checksum mismatch")
+    body = zlib.decompress(compressed)
+    end = body.index(b"\n")
+    index = json.loads(body[:end])
+    offset = end + 1
+    columns = {}
+    for name, column_type in index["columns"]:
+        columns[name], offset = _unpack_column(body, offset, index["rows"], column_type)
+    return columns, index
+
+
+def decode_columns(payload: bytes) -> list:
+    """
+    :returns list: the asset rows of a .qdc payload
+    """
+    columns, index = decode_column_block(payload)
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def write_atomic(path: str, data: bytes):
+    # Write to a temporary file and rename it, so readers never see a partial file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class QuantSnapshot(tuple):
+    """
+    Immutable quant data snapshot.
+
+    Iterates like the raw list of asset rows the API returns, and also
+    indexes every row by Asset, both raw (`rows`) and parsed into typed
+    AssetData (`assets`). A new snapshot is built for every refresh and
+    swapped in with a single reference assignment.
+    """
+
+    def __new__(cls, rows=(), assets=None, seq=None):
+        if assets is None:
+            rows = [row for row in rows or () if isinstance(row, dict) and "Asset" in row]
+            assets = [AssetData.from_row(row) for row in rows]
+        snapshot = super().__new__(cls, rows)
+        snapshot.rows = {row["Asset"]: row for row in rows}
+        snapshot.assets = {asset.asset: asset for asset in assets}
+        snapshot.seq = seq
+        snapshot.created = time.time()
+        return snapshot
+
+    @classmethod
+    def from_columns(cls, payload: bytes) -> QuantSnapshot:
+        columns, index = decode_column_block(payload)
+        if "Asset" not in columns:
+            return cls(seq=index.get("seq"))
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        float_columns = {name for name, column_type in index["columns"] if column_type == "f8"}
+        return cls(rows, AssetData.from_columns(columns, float_columns), seq=index.get("seq"))
+
+    def apply_delta(self, delta: dict) -> QuantSnapshot:
+        """
+        :param delta: one QuantPublisher delta, the one following this snapshot
+        :returns QuantSnapshot: a new snapshot with the delta applied; rows
+            the delta does not touch are shared with this one
+        """
+        rows = dict(self.rows)
+        assets = dict(self.assets)
+        for asset in delta.get("removed", ()):
+            rows.pop(asset, None)
+            assets.pop(asset, None)
+        for asset, changes in delta.get("changed", {}).items():
+            row = dict(rows.get(asset, {"Asset": asset}))
+            row.update(changes)
+            rows[asset] = row
+            assets[asset] = AssetData.from_row(row)
+        order = delta.get("order")
+        if order is None:
+            order = [asset for asset in self.rows if asset in rows]
+            order += [asset for asset in rows if asset not in self.rows]
+        return QuantSnapshot([rows[asset] for asset in order], [assets[asset] for asset in order], seq=delta["seq"])
+
+    def age(self) -> float:
+        return time.time() - self.created
+
+    def get(self, symbol: str) -> Optional[AssetData]:
+        return self.assets.get(symbol)
+
+    def value(self, symbol: str, value: str):
+        asset = self.assets.get(symbol)
+        field = ASSET_VALUE_FIELDS.get(value)
+        if asset is None or field is None:
+            return None
+        return getattr(asset, field)
+
+
+def diff_rows(old_rows: dict, old_order: list, rows: list) -> dict:
+    """
+    :param old_rows: previous rows by Asset
+    :param old_order: previous Asset order
+    :param rows: new rows
+    :returns dict: the changed fields of every asset (whole rows for new
+        assets), the removed assets, and the new order when it changed
+    """
+    changed = {}
+    for row in rows:
+        old = old_rows.get(row["Asset"])
+        if old is None:
+            changed[row["Asset"]] = row
+            continue
+        fields = {column: value for column, value in row.items() if old.get(column) != value}
+        if fields:
+            changed[row["Asset"]] = fields
+    new_assets = {row["Asset"] for row in rows}
+    delta = {
+        "changed": changed,
+        "removed": [asset for asset in old_order if asset not in new_assets],
+    }
+    order = [row["Asset"] for row in rows]
+    if order != old_order:
+        delta["order"] = order
+    return delta
+
+
+class QuantPublisher:
+    """
+    Publishes every scraper cycle as a full columnar snapshot and as a
+    sequence-numbered delta (the fields that changed since the previous
+    cycle) in a JSON document holding the last `keep` deltas. Consumers load
+    the snapshot once and then only apply deltas, while clients that only
+    read the snapshot are never more than one cycle behind.
+
+    Sequence numbers start from the current time in seconds, so they keep
+    increasing across scraper restarts and consumers see the restart as a gap.
+    """
+    def __init__(self, snapshot_path: str, delta_path: str, keep: int = 30):
+        self.snapshot_path = snapshot_path
+        self.delta_path = delta_path
+        self.deltas: deque = deque(maxlen=keep)
+        self.seq = int(time.time())
+        self.rows: dict = {}
+        self.order: list = []
+        # Payloads of the latest cycle, for serving from memory (see api/server.py)
+        self.snapshot = b""
+        self.delta_document = b""
+
+    def publish(self, rows: list, columns: Optional[list] = None) -> int:
+        """
+        :param rows: asset rows of the new cycle
+        :returns int: the sequence number of the cycle
+        """
+        # NaN never compares equal, publish it as null like DataFrame.to_json() does
+        rows = [
+            {column: None if isinstance(value, float) and value != value else value for column, value in row.items()}
+            for row in rows
+        ]
+        self.seq += 1
+        delta = diff_rows(self.rows, self.order, rows)
+        delta["seq"] = self.seq
+        self.deltas.append(delta)
+
+        # Kept in memory for the server and written for nginx, both every cycle
+        self.snapshot = encode_columns(rows, columns, seq=self.seq)
+        self.delta_document = json.dumps({"seq": self.seq, "deltas": list(self.deltas)}).encode()
+        write_atomic(self.snapshot_path, self.snapshot)
+        write_atomic(self.delta_path, self.delta_document)
+
+        self.rows = {row["Asset"]: row for row in rows}
+        self.order = [row["Asset"] for row in rows]
+        return self.seq
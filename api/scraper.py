@@ -8,22 +8,28 @@ from datetime import datetime
 
 import pandas as pd
 import pidfile
-import ta
 
 sys.path.append(".")
 from directionalscalper.api.exchanges.binance import Binance
 from directionalscalper.api.exchanges.bybit import Bybit
+from directionalscalper.api.quantdata import QuantPublisher
+from directionalscalper.api.server import DEFAULT_PORT, QuantDataServer
 from directionalscalper.core.logger import Logger
+from directionalscalper.core.utils import configure_session_pool
+from directionalscalper.core.indicators import ATR, EMA, SMA, run
 
 log = Logger(filename="scraper.log", stream=True)
 
+PUBLISH_DIR = "/opt/bitnami/nginx/html/data"
+
 
 class Scraper:
     def __init__(self, exchange, filters: dict):
         log.info("Scraper initalising")
         self.exchange = exchange
         self.filters = filters
-        self.symbols = self.exchange.get_futures_symbols()
+        # Refresh instruments info once per cycle, get_symbol_info() reads it from the cache
+        self.symbols = self.exchange.get_symbols_info(max_age=0)
         self.prices = self.exchange.get_futures_prices()
         log.info(f"{len(self.symbols)} symbols found")
         if "quote_symbols" in self.filters:
@@ -108,34 +114,23 @@ class Scraper:
         bars = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df["MA_3_High"] = df.high.rolling(3).mean()
-        df["MA_3_Low"] = df.low.rolling(3).mean()
-        df["MA_6_High"] = df.high.rolling(6).mean()
-        df["MA_6_Low"] = df.low.rolling(6).mean()
+        highs = [bar["high"] for bar in bars]
+        lows = [bar["low"] for bar in bars]
 
         return {
-            "high_3": df["MA_3_High"].iat[-1],
-            "low_3": df["MA_3_Low"].iat[-1],
-            "high_6": df["MA_6_High"].iat[-1],
-            "low_6": df["MA_6_Low"].iat[-1],
+            "high_3": run(SMA(3), highs)[-1],
+            "low_3": run(SMA(3), lows)[-1],
+            "high_6": run(SMA(6), highs)[-1],
+            "low_6": run(SMA(6), lows)[-1],
         }
 
     def get_ema(self, symbol: str, interval: str, limit: int, column: str, window: int):
         bars = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )  # 1m, 18, 6
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df[f"EMA{window} {column}"] = ta.trend.EMAIndicator(
-            df[column], window=6
-        ).ema_indicator()
+        ema = run(EMA(span=6, min_periods=6), [bar[column] for bar in bars])
         return round(
-            (df[f"EMA{window} {column}"][limit - 1]).astype(float),
+            float(ema[limit - 1]),
             self.symbols["price_scale"],
         )
 
@@ -143,10 +138,7 @@ class Scraper:
         bars = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        sma = ta.trend.SMAIndicator(df[column], window=window).sma_indicator()
+        sma = run(SMA(window), [bar[column] for bar in bars])
 
         current_sma = float(sma[limit - 1])
 
@@ -158,8 +150,12 @@ class Scraper:
         data = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )
-        data["tr"] = self.get_true_range(data=data)
-        atr = data["tr"].rolling(period).mean()
+        atr = run(
+            ATR(period),
+            [bar["high"] for bar in data],
+            [bar["low"] for bar in data],
+            [bar["close"] for bar in data],
+        )
         return atr
 
     def get_true_range(self, data):
@@ -240,6 +236,8 @@ class Scraper:
 
     def analyse_all_symbols(self, max_workers: int = 20):
         data = []
+        # One pooled connection per worker thread
+        configure_session_pool(max_workers)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_data = {
@@ -330,6 +328,19 @@ if __name__ == "__main__":
     quote_symbols = ["USDT"]
     top_volume = 400
     filters = {"quote_symbols": quote_symbols, "top_volume": top_volume}
+    # Published feed, served by nginx from its docroot unless --output-dir says otherwise
+    publish_dir = sys.argv[sys.argv.index("--output-dir") + 1] if "--output-dir" in sys.argv else PUBLISH_DIR
+    # Full columnar snapshot and a delta against the previous cycle, every cycle
+    publisher = QuantPublisher(
+        snapshot_path=f"{publish_dir}/quantdatav2.qdc",
+        delta_path=f"{publish_dir}/quantdatav2.delta.json",
+    )
+    # Opt-in: also serve every cycle from memory to bots on this host or LAN
+    server = None
+    if "--serve" in sys.argv:
+        port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else DEFAULT_PORT
+        server = QuantDataServer(port=port)
+        server.start()
     while True:
         try:
             with pidfile.PIDFile("scraper.pid"):
@@ -342,7 +353,8 @@ if __name__ == "__main__":
                 elapsed_time = end_time - start_time
                 print(f"Time taken to analyse all symbols: {elapsed_time:.2f} seconds")
                 print(data)
-                scraper.output_df(dataframe=data, path="/opt/bitnami/nginx/html/data/quantdatav2.json", to="json")
+                scraper.output_df(dataframe=data, path=f"{publish_dir}/quantdatav2.json", to="json")
+                publisher.publish(data.to_dict(orient="records"), columns=list(data.columns))
                 scraper.output_df(dataframe=data, path="data/quantdata.csv", to="csv")
 
                 to_trade = scraper.filter_df(
@@ -357,6 +369,13 @@ if __name__ == "__main__":
                 scraper.output_df(
                     dataframe=to_trade, path="data/whattotrade.json", to="json"
                 )
+                if server is not None:
+                    server.publish({
+                        "quantdatav2.json": data.to_json(orient="records").encode(),
+                        "quantdatav2.qdc": publisher.snapshot,
+                        "quantdatav2.delta.json": publisher.delta_document,
+                        "rotatorsymbols.json": to_trade.to_json(orient="records").encode(),
+                    })
 
                 negative = scraper.filter_df(
                     dataframe=data, filter_col="Funding", operator="<", value=0
@@ -1,29 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
 import json
 import sys
 import time
 from datetime import datetime
+from operator import itemgetter
 
+import aiohttp
+import numpy as np
 import pandas as pd
 import pidfile
-import ta
 
 
 sys.path.append(".")
 from directionalscalper.api.exchanges.binance import Binance
 from directionalscalper.api.exchanges.bybit import Bybit
+from directionalscalper.api.quantdata import QuantPublisher
+from directionalscalper.api.server import DEFAULT_PORT, QuantDataServer
 from directionalscalper.core.logger import Logger
+from directionalscalper.core.utils import configure_session_pool
+from directionalscalper.core import batch_indicators
+from directionalscalper.core.candles import KlineCache
+from directionalscalper.core.indicators import ATR, ERI, EMA, MFI, RSI, SMA, run
 
 log = Logger(filename="scraper.log", stream=True)
 
+PUBLISH_DIR = "/opt/bitnami/nginx/html/data"
+KLINE_CACHE_PATH = "data/klines.bin"
+
 class Scraper:
-    def __init__(self, exchange, filters: dict):
+    def __init__(self, exchange, filters: dict, kline_cache: KlineCache | None = None):
         log.info("Scraper initalising")
         self.exchange = exchange
         self.filters = filters
-        self.symbols = self.exchange.get_futures_symbols()
+        self.kline_cache = kline_cache
+        # Refresh instruments info once per cycle, get_symbol_info() reads it from the cache
+        self.symbols = self.exchange.get_symbols_info(max_age=0)
         self.prices = self.exchange.get_futures_prices()
         log.info(f"{len(self.symbols)} symbols found")
         if "quote_symbols" in self.filters:
@@ -37,6 +51,8 @@ class Scraper:
                 volumes=self.volumes,
                 limit=self.filters["top_volume"],
             )
+        if self.kline_cache is not None:
+            self.kline_cache.prune(self.symbols)
 
     def filter_quote(self, symbols, quotes):
         log.info(f"Filtering on {len(quotes)} quote symbols")
@@ -104,24 +120,95 @@ class Scraper:
 
         return df
 
-    def get_candle_data(self, symbol: str, interval: str, limit: int):
-        bars = self.exchange.get_futures_kline(
-            symbol=symbol, interval=interval, limit=limit
-        )
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df["MA_3_High"] = df.high.rolling(3).mean()
-        df["MA_3_Low"] = df.low.rolling(3).mean()
-        df["MA_6_High"] = df.high.rolling(6).mean()
-        df["MA_6_Low"] = df.low.rolling(6).mean()
+    def get_kline_plan(self, symbol: str) -> dict:
+        """
+        Fetch the klines analyse_symbol needs in two requests: 240 1m candles
+        (4h spread, ERI, SMA, MFI, 1m and 30m volume) and 20 5m candles
+        (5m volume and MA6). Other timeframes are resampled from the 1m window.
+        """
+        return {
+            "1m": self.get_klines(symbol=symbol, interval="1m", limit=240),
+            "5m": self.get_klines(symbol=symbol, interval="5m", limit=20),
+        }
+
+    def get_klines(self, symbol: str, interval: str, limit: int) -> list:
+        """
+        The newest `limit` closed klines, through the kline cache when the
+        scraper has one, so only candles closed since the last cycle are requested.
+        """
+        if self.kline_cache is None:
+            return self.exchange.get_futures_kline(symbol=symbol, interval=interval, limit=limit)
+        fetch_limit = self.kline_cache.fetch_limit(symbol, interval, limit)
+        if fetch_limit:
+            bars = self.exchange.get_futures_kline(symbol=symbol, interval=interval, limit=fetch_limit)
+            if not bars:
+                return []
+            if not self.kline_cache.merge(symbol, interval, bars):
+                bars = self.exchange.get_futures_kline(symbol=symbol, interval=interval, limit=limit)
+                if not bars:
+                    return []
+                self.kline_cache.merge(symbol, interval, bars)
+        return self.kline_cache.window(symbol, interval, limit)
+
+    async def async_get_klines(self, session, symbol: str, interval: str, limit: int) -> list:
+        if self.kline_cache is None:
+            return await self.exchange.async_get_futures_kline(session, symbol=symbol, interval=interval, limit=limit)
+        fetch_limit = self.kline_cache.fetch_limit(symbol, interval, limit)
+        if fetch_limit:
+            bars = await self.exchange.async_get_futures_kline(session, symbol=symbol, interval=interval, limit=fetch_limit)
+            if not bars:
+                return []
+            if not self.kline_cache.merge(symbol, interval, bars):
+                bars = await self.exchange.async_get_futures_kline(session, symbol=symbol, interval=interval, limit=limit)
+                if not bars:
+                    return []
+                self.kline_cache.merge(symbol, interval, bars)
+        return self.kline_cache.window(symbol, interval, limit)
+
+    def resample_klines(self, bars: list, minutes: int) -> list:
+        """
+        Aggregate 1m klines into complete candles of the given number of minutes,
+        aligned on the exchange's candle open times.
+        """
+        span = minutes * 60 * 1000
+        end = bars[-1]["timestamp"] + 60 * 1000 if bars else 0
+        candles: list = []
+        for bar in bars:
+            start = bar["timestamp"] - bar["timestamp"] % span
+            # Skip the candle still forming after the last 1m bar, and the
+            # leading candle whose first minutes are outside the window
+            if start + span > end:
+                break
+            if candles and candles[-1]["timestamp"] == start:
+                candle = candles[-1]
+                candle["high"] = max(candle["high"], bar["high"])
+                candle["low"] = min(candle["low"], bar["low"])
+                candle["close"] = bar["close"]
+                candle["volume"] += bar["volume"]
+            elif bar["timestamp"] == start:
+                candles.append({
+                    "timestamp": start,
+                    "open": bar["open"],
+                    "high": bar["high"],
+                    "low": bar["low"],
+                    "close": bar["close"],
+                    "volume": bar["volume"],
+                })
+        return candles
+
+    def get_candle_data(self, symbol: str, interval: str, limit: int, bars: list | None = None):
+        if bars is None:
+            bars = self.exchange.get_futures_kline(
+                symbol=symbol, interval=interval, limit=limit
+            )
+        highs = [bar["high"] for bar in bars]
+        lows = [bar["low"] for bar in bars]
 
         return {
-            "high_3": df["MA_3_High"].iat[-1],
-            "low_3": df["MA_3_Low"].iat[-1],
-            "high_6": df["MA_6_High"].iat[-1],
-            "low_6": df["MA_6_Low"].iat[-1],
+            "high_3": run(SMA(3), highs)[-1],
+            "low_3": run(SMA(3), lows)[-1],
+            "high_6": run(SMA(6), highs)[-1],
+            "low_6": run(SMA(6), lows)[-1],
         }
 
     # def get_candle_data(self, symbol: str, interval: str, limit: int):
@@ -156,29 +243,22 @@ class Scraper:
         bars = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )  # 1m, 18, 6
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df[f"EMA{window} {column}"] = ta.trend.EMAIndicator(
-            df[column], window=6
-        ).ema_indicator()
+        ema = run(EMA(span=6, min_periods=6), [bar[column] for bar in bars])
         return round(
-            (df[f"EMA{window} {column}"][limit - 1]).astype(float),
+            float(ema[limit - 1]),
             self.symbols["price_scale"],
         )
 
-    def get_sma(self, symbol: str, interval: str, limit: int, column: str, window: int):
-        bars = self.exchange.get_futures_kline(
-            symbol=symbol, interval=interval, limit=limit
-        )
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        sma = ta.trend.SMAIndicator(df[column], window=window).sma_indicator()
+    def get_sma(self, symbol: str, interval: str, limit: int, column: str, window: int, bars: list | None = None):
+        if bars is None:
+            bars = self.exchange.get_futures_kline(
+                symbol=symbol, interval=interval, limit=limit
+            )
+        sma = run(SMA(window), [bar[column] for bar in bars])
 
-        current_sma = float(sma[limit - 1])
+        current_sma = float(sma[-1])
 
-        last_close_price = bars[limit - 1]["close"]
+        last_close_price = bars[-1]["close"]
 
         return round((last_close_price - current_sma) / last_close_price * 100, 4)
 
@@ -186,8 +266,12 @@ class Scraper:
         data = self.exchange.get_futures_kline(
             symbol=symbol, interval=interval, limit=limit
         )
-        data["tr"] = self.get_true_range(data=data)
-        atr = data["tr"].rolling(period).mean()
+        atr = run(
+            ATR(period),
+            [bar["high"] for bar in data],
+            [bar["low"] for bar in data],
+            [bar["close"] for bar in data],
+        )
         return atr
 
     def get_true_range(self, data):
@@ -198,60 +282,38 @@ class Scraper:
         tr = data[["high-low", "high-pc", "low-pc"]].max(axis=1)
         return tr
 
-    def get_mfi(self, symbol: str, interval: str, limit: int, lookback: int = 100) -> str:
+    def get_mfi(self, symbol: str, interval: str, limit: int, lookback: int = 100, bars: list | None = None) -> str:
         log.info(f"Getting MFI for symbol: {symbol}, interval: {interval}, limit: {limit}")
-        bars = self.exchange.get_futures_kline(
-            symbol=symbol, interval=interval, limit=limit
-        )
-        df = pd.DataFrame(
-            bars, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
+        if bars is None:
+            bars = self.exchange.get_futures_kline(
+                symbol=symbol, interval=interval, limit=limit
+            )
+        opens = [bar["open"] for bar in bars]
+        highs = [bar["high"] for bar in bars]
+        lows = [bar["low"] for bar in bars]
+        closes = [bar["close"] for bar in bars]
+        volumes = [bar["volume"] for bar in bars]
 
         # Calculate MFI, RSI, MA and whether open < close
-        log.info(f"Input data for MFI calculation: {df[['high', 'low', 'close', 'volume']].tail(15)}")
-        df['mfi'] = ta.volume.MFIIndicator(
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
-            volume=df['volume'],
-            window=14,
-            fillna=False
-        ).money_flow_index()
-        log.info(f"Calculated MFI: {df['mfi'].tail(15)}")
-        df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-        df['ma'] = ta.trend.sma_indicator(df['close'], window=14)
-        df['open_less_close'] = (df['open'] < df['close']).astype(int)
-
-        last_mfi = df.iloc[-1]['mfi']
-        last_rsi = df.iloc[-1]['rsi']
-        last_ma = df.iloc[-1]['ma']
-        last_open = df.iloc[-1]['open']
-        last_close = df.iloc[-1]['close']
-        log.info(f"Calculated MFI: {last_mfi}, RSI: {last_rsi}, MA: {last_ma}, Open: {last_open}, Close: {last_close} for symbol: {symbol}")
-
-        df['buy_condition'] = ((df['mfi'] < 20) & (df['rsi'] < 35) & (df['open_less_close'] == 1)).astype(int)
-        df['sell_condition'] = ((df['mfi'] > 80) & (df['rsi'] > 65) & (df['open_less_close'] == 0)).astype(int)
-        #df['sell_condition'] = ((df['mfi'] > 80) & (df['rsi'] > 35) & (df['open_less_close'] == 0)).astype(int)
-
-        # Check the last row for whether it's a buy or sell condition
-        if df.iloc[-1]['buy_condition'] == 1:
-            log.info(f"Buy condition met for symbol: {symbol}")
-            return 'long'
-        elif df.iloc[-1]['sell_condition'] == 1:
-            log.info(f"Sell condition met for symbol: {symbol}")
-            return 'short'
-        else:
-            # If neither condition is met on the last bar, look back at previous bars
-            for i in range(2, min(len(df), lookback) + 1):  # look back up to 'lookback' bars
-                if df.iloc[-i]['buy_condition'] == 1:
-                    log.info(f"Buy condition met on a lookback for symbol: {symbol}")
-                    return 'long'
-                elif df.iloc[-i]['sell_condition'] == 1:
-                    log.info(f"Sell condition met on a lookback for symbol: {symbol}")
-                    return 'short'
-            # In case no buy or sell condition was ever met, return 'neutral'
-            log.info(f"No buy or sell condition met for symbol: {symbol}")
-            return 'neutral'
+        mfi = run(MFI(14), highs, lows, closes, volumes)
+        rsi = run(RSI(14), closes)
+        ma = run(SMA(14), closes)
+        log.info(f"Calculated MFI: {mfi[-1]}, RSI: {rsi[-1]}, MA: {ma[-1]}, Open: {opens[-1]}, Close: {closes[-1]} for symbol: {symbol}")
+
+        buy_condition = [m < 20 and r < 35 and o < c for m, r, o, c in zip(mfi, rsi, opens, closes)]
+        sell_condition = [m > 80 and r > 65 and not o < c for m, r, o, c in zip(mfi, rsi, opens, closes)]
+
+        # Check the last bar first, then look back up to 'lookback' bars
+        for i in range(1, min(len(bars), lookback) + 1):
+            if buy_condition[-i]:
+                log.info(f"Buy condition met for symbol: {symbol}" if i == 1 else f"Buy condition met on a lookback for symbol: {symbol}")
+                return 'long'
+            elif sell_condition[-i]:
+                log.info(f"Sell condition met for symbol: {symbol}" if i == 1 else f"Sell condition met on a lookback for symbol: {symbol}")
+                return 'short'
+        # In case no buy or sell condition was ever met, return 'neutral'
+        log.info(f"No buy or sell condition met for symbol: {symbol}")
+        return 'neutral'
 
     # def get_mfi(self, symbol: str, interval: str, limit: int) -> str:
     #     bars = self.exchange.get_futures_kline(
@@ -503,83 +565,63 @@ class Scraper:
 
 
     def analyse_symbol(self, symbol: str) -> dict:
+        log.info(f"Analysing: {symbol}")
+        return self.analyse_klines(**self.fetch_symbol(symbol))
+
+    def fetch_symbol(self, symbol: str) -> dict:
+        """
+        :returns dict: the analyse_klines() arguments of one symbol
+        """
+        klines = self.get_kline_plan(symbol)
+        if not klines["1m"] or not klines["5m"]:
+            raise ValueError(f"No kline data received for {symbol}")
+        return {
+            "symbol": symbol,
+            "min_qty": self.exchange.get_symbol_info(symbol=symbol, info="min_order_qty"),
+            "price": self.prices[symbol],
+            "klines": klines,
+            "funding": self.exchange.get_funding_rate(symbol=symbol),
+        }
+
+    def analyse_klines(self, symbol: str, min_qty: float, price: float, klines: dict, funding: float) -> dict:
+        """
+        Compute every field of a symbol from already fetched data. Makes no
+        requests, so the asyncio mode can run it in a worker process.
+        """
         len_slow_ma = 64
         len_power_ema = 13
-        log.info(f"Analysing: {symbol}")
         values = {"Asset": symbol}
 
-        values["Min qty"] = exchange.get_symbol_info(
-            symbol=symbol, info="min_order_qty"
-        )
+        values["Min qty"] = min_qty
 
-        values["Price"] = self.prices[symbol]
+        values["Price"] = price
 
-        # Define 1x 30m candle volume
-        candles_30m = self.exchange.get_futures_kline(
-            symbol=symbol, interval="30m", limit=5
-        )
-        df_30m = pd.DataFrame(
-            candles_30m,
-            columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df_30m[['open', 'high', 'low', 'close', 'volume']] = df_30m[['open', 'high', 'low', 'close', 'volume']].apply(pd.to_numeric)
-        df_30m['typical_price'] = (df_30m['high'] + df_30m['low'] + df_30m['close']) / 3
-        onex30mcandlevol = df_30m['typical_price'].iloc[-1] * df_30m['volume'].iloc[-1]
-        volume_1x_30m = values["Price"] * onex30mcandlevol
-        values["30m 1x Volume (USDT)"] = round(volume_1x_30m)
-
-        # Define 1x 5m candle volume
-        candles_5m = self.exchange.get_futures_kline(
-            symbol=symbol, interval="5m", limit=5
-        )
-        df_5m = pd.DataFrame(
-            candles_5m,
-            columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df_5m[['open', 'high', 'low', 'close', 'volume']] = df_5m[['open', 'high', 'low', 'close', 'volume']].apply(pd.to_numeric)
-        df_5m['typical_price'] = (df_5m['high'] + df_5m['low'] + df_5m['close']) / 3
-        onex5mcandlevol = df_5m['typical_price'].iloc[-1] * df_5m['volume'].iloc[-1]
-        volume_1x_5m = values["Price"] * onex5mcandlevol
-        values["5m 1x Volume (USDT)"] = round(volume_1x_5m)
-
-        # Define 1x 1m candle volume
-        candles_1m = self.exchange.get_futures_kline(
-            symbol=symbol, interval="1m", limit=5
-        )
-        df_1m = pd.DataFrame(
-            candles_1m,
-            columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df_1m[['open', 'high', 'low', 'close', 'volume']] = df_1m[['open', 'high', 'low', 'close', 'volume']].apply(pd.to_numeric)
-        df_1m['typical_price'] = (df_1m['high'] + df_1m['low'] + df_1m['close']) / 3
-        onex1mcandlevol = df_1m['typical_price'].iloc[-1] * df_1m['volume'].iloc[-1]
-        volume_1x_1m = values["Price"] * onex1mcandlevol
-        values["1m 1x Volume (USDT)"] = round(volume_1x_1m)
-
-        # Get data for the last 4 hours (240 minutes)
-        data = self.exchange.get_futures_kline(symbol=symbol, interval="1m", limit=240)
-        df = pd.DataFrame(
-            data,
-            columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df[['open', 'high', 'low', 'close', 'volume']] = df[['open', 'high', 'low', 'close', 'volume']].apply(pd.to_numeric)
-        df['typical_price'] = (df['high'] + df['low'] + df['close']) / 3
+        data = klines["1m"]
+        candles_5m = klines["5m"]
+
+        # Define 1x 30m, 5m and 1m candle volume from the last closed candle
+        for label, candles in (("30m", self.resample_klines(data, 30)), ("5m", candles_5m), ("1m", data)):
+            if not candles:
+                # Listed too recently for one complete candle, published as null
+                values[f"{label} 1x Volume (USDT)"] = None
+                continue
+            last = candles[-1]
+            onexcandlevol = (last["high"] + last["low"] + last["close"]) / 3 * last["volume"]
+            values[f"{label} 1x Volume (USDT)"] = round(values["Price"] * onexcandlevol)
 
+        # Spreads over the last 1m, 5m, 30m, 1h and 4h
         values["1m Spread"] = self.get_spread(symbol=symbol, limit=1, data=data[-1:])
         values["5m Spread"] = self.get_spread(symbol=symbol, limit=5, data=data[-5:])
         values["30m Spread"] = self.get_spread(symbol=symbol, limit=30, data=data[-30:])
         values["1h Spread"] = self.get_spread(symbol=symbol, limit=60, data=data[-60:])
         values["4h Spread"] = self.get_spread(symbol=symbol, limit=240, data=data)
 
-        values["5m MA6 high"] = self.get_candle_data(
-            symbol=symbol, interval="5m", limit=20
-        )["high_6"]
-        values["5m MA6 low"] = self.get_candle_data(
-            symbol=symbol, interval="5m", limit=20
-        )["low_6"]
+        ma_5m = self.get_candle_data(symbol=symbol, interval="5m", limit=20, bars=candles_5m)
+        values["5m MA6 high"] = ma_5m["high_6"]
+        values["5m MA6 low"] = ma_5m["low_6"]
 
         ma_order_pct = self.get_sma(
-            symbol=symbol, interval="1m", limit=30, column="close", window=14
+            symbol=symbol, interval="1m", limit=30, column="close", window=14, bars=data[-30:]
         )
         values["trend%"] = ma_order_pct
 
@@ -589,37 +631,25 @@ class Scraper:
             values["Trend"] = "long"
 
         # Define funding rates
-        values["Funding"] = self.exchange.get_funding_rate(symbol=symbol) * 100
+        values["Funding"] = funding * 100
 
         values["Timestamp"] = str(int(datetime.now().timestamp()))
 
         # Get MFI
-        mfi = self.get_mfi(symbol=symbol, interval="1m", limit=100, lookback=100)
+        mfi = self.get_mfi(symbol=symbol, interval="1m", limit=100, lookback=100, bars=data[-100:])
         values["MFI"] = mfi
 
-        # Get ERI
-        df["close"] = pd.to_numeric(df["close"])
-        df["high"] = pd.to_numeric(df["high"])
-        df["low"] = pd.to_numeric(df["low"])
-
-        # Calculate slow EMA of closing prices
-        slow_ma = df['close'].ewm(span=len_slow_ma, adjust=False).mean()
-
-        # Determine the trend
-        last_price = df['close'].values[-1]
-        eri_trend = "bullish" if last_price > slow_ma.values[-1] else "bearish"
-
-        # Calculate bull power and bear power
-        bull_power = df['high'] - slow_ma
-        bear_power = df['low'] - slow_ma
-
-        # Smooth the power values using EMA
-        bull_power_smoothed = bull_power.ewm(span=len_power_ema, adjust=False).mean()
-        bear_power_smoothed = bear_power.ewm(span=len_power_ema, adjust=False).mean()
+        # Get ERI: bull and bear power against a slow EMA, smoothed with an EMA
+        bull_power, bear_power, eri_trend = run(
+            ERI(slow_span=len_slow_ma, power_span=len_power_ema),
+            [bar["high"] for bar in data],
+            [bar["low"] for bar in data],
+            [bar["close"] for bar in data],
+        )[-1]
 
         # Add to the values dict
-        values["ERI Bull Power"] = bull_power_smoothed.values[-1]
-        values["ERI Bear Power"] = bear_power_smoothed.values[-1]
+        values["ERI Bull Power"] = bull_power
+        values["ERI Bear Power"] = bear_power
         values["ERI Trend"] = eri_trend
 
         return values
@@ -733,21 +763,120 @@ class Scraper:
 
 
     def analyse_all_symbols(self, max_workers: int = 20, retry_limit: int = 5):
-        data = []
+        fetched = []
+        # One pooled connection per worker thread
+        configure_session_pool(max_workers)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_data = {
-                executor.submit(self.retry_analyse_symbol, symbol, retry_limit): symbol
+                executor.submit(self.retry_analyse_symbol, symbol, retry_limit, self.fetch_symbol): symbol
                 for symbol in self.symbols
             }
             for future in concurrent.futures.as_completed(future_data):
                 symbol_data = future_data[future]
                 try:
                     symbol_data_result = future.result()
-                    data.append(symbol_data_result)
+                    fetched.append(symbol_data_result)
                 except Exception as e:
                     log.error(f"{symbol_data} generated an exception: {e}")
 
+        return self.build_dataframe(self.analyse_batch(fetched))
+
+    def analyse_batch(self, fetched: list) -> list:
+        """
+        analyse_klines() for many symbols at once. Symbols whose kline
+        windows cover the same candles are stacked into (symbols x bars)
+        arrays and every field is computed for all of them in a few
+        vectorized passes; the rest are analysed one by one.
+        """
+        groups: dict = {}
+        data = []
+        for item in fetched:
+            candles_1m, candles_5m = item["klines"]["1m"], item["klines"]["5m"]
+            if len(candles_1m) == 240 and len(candles_5m) == 20:
+                key = (
+                    candles_1m[0]["timestamp"], candles_1m[-1]["timestamp"],
+                    candles_5m[0]["timestamp"], candles_5m[-1]["timestamp"],
+                )
+                groups.setdefault(key, []).append(item)
+                continue
+            try:
+                data.append(self.analyse_klines(**item))
+            except Exception as e:
+                log.error(f"{item['symbol']} generated an exception: {e}")
+
+        for group in groups.values():
+            data.extend(self.analyse_aligned(group))
+        return data
+
+    def analyse_aligned(self, group: list) -> list:
+        row = itemgetter("timestamp", "open", "high", "low", "close", "volume")
+        bars_1m = np.array([list(map(row, item["klines"]["1m"])) for item in group], dtype=np.float64)
+        bars_5m = np.array([list(map(row, item["klines"]["5m"])) for item in group], dtype=np.float64)
+        timestamps, open_, high, low, close, volume = np.moveaxis(bars_1m, 2, 0)
+        high_5m, low_5m, close_5m, volume_5m = np.moveaxis(bars_5m[:, :, 2:], 2, 0)
+        price = np.array([item["price"] for item in group], dtype=np.float64)
+
+        # Last complete 30m candle, resampled from the 1m window
+        span = 30 * 60 * 1000
+        end = timestamps[0, -1] + 60 * 1000
+        start = end - end % span - span
+        in_30m = (timestamps[0] >= start) & (timestamps[0] < start + span)
+        high_30m = high[:, in_30m].max(axis=1)
+        low_30m = low[:, in_30m].min(axis=1)
+        close_30m = close[:, in_30m][:, -1]
+        volume_30m = volume[:, in_30m].sum(axis=1)
+
+        volume_usdt = {
+            "30m": price * (high_30m + low_30m + close_30m) / 3 * volume_30m,
+            "5m": price * (high_5m[:, -1] + low_5m[:, -1] + close_5m[:, -1]) / 3 * volume_5m[:, -1],
+            "1m": price * (high[:, -1] + low[:, -1] + close[:, -1]) / 3 * volume[:, -1],
+        }
+        spreads = {
+            label: batch_indicators.spread(high[:, -n:], low[:, -n:])
+            for label, n in (("1m", 1), ("5m", 5), ("30m", 30), ("1h", 60), ("4h", 240))
+        }
+        ma6_high = batch_indicators.sma_last(high_5m, 6)
+        ma6_low = batch_indicators.sma_last(low_5m, 6)
+        sma = batch_indicators.sma_last(close, 14)
+        trend_pct = np.round((close[:, -1] - sma) / close[:, -1] * 100, 4)
+
+        # MFI signal over the last 100 bars: the newest bar meeting the buy or sell condition
+        mfi = batch_indicators.mfi(high[:, -100:], low[:, -100:], close[:, -100:], volume[:, -100:])
+        rsi = batch_indicators.rsi(close[:, -100:])
+        rising = open_[:, -100:] < close[:, -100:]
+        buy = ((mfi < 20) & (rsi < 35) & rising)[:, ::-1]
+        sell = ((mfi > 80) & (rsi > 65) & ~rising)[:, ::-1]
+        newest = np.argmax(buy | sell, axis=1)
+        rows = np.arange(len(group))
+        mfi_signal = np.where(
+            ~(buy | sell).any(axis=1), "neutral", np.where(buy[rows, newest], "long", "short")
+        )
+
+        bull, bear, bullish = batch_indicators.eri(high, low, close, slow_span=64, power_span=13)
+
+        timestamp = str(int(datetime.now().timestamp()))
+        data = []
+        for i, item in enumerate(group):
+            values = {"Asset": item["symbol"], "Min qty": item["min_qty"], "Price": item["price"]}
+            for label in ("30m", "5m", "1m"):
+                values[f"{label} 1x Volume (USDT)"] = round(float(volume_usdt[label][i]))
+            for label, spread in spreads.items():
+                values[f"{label} Spread"] = float(spread[i])
+            values["5m MA6 high"] = float(ma6_high[i])
+            values["5m MA6 low"] = float(ma6_low[i])
+            values["trend%"] = float(trend_pct[i])
+            values["Trend"] = "short" if trend_pct[i] > 0 else "long"
+            values["Funding"] = item["funding"] * 100
+            values["Timestamp"] = timestamp
+            values["MFI"] = str(mfi_signal[i])
+            values["ERI Bull Power"] = float(bull[i, -1])
+            values["ERI Bear Power"] = float(bear[i, -1])
+            values["ERI Trend"] = "bullish" if bullish[i, -1] else "bearish"
+            data.append(values)
+        return data
+
+    def build_dataframe(self, data: list):
         df = pd.DataFrame(
             data,
             columns=[
@@ -782,11 +911,89 @@ class Scraper:
         )
         return df
 
-    def retry_analyse_symbol(self, symbol: str, retry_limit: int):
+    async def async_get_kline_plan(self, session, symbol: str) -> dict:
+        candles_1m, candles_5m = await asyncio.gather(
+            self.async_get_klines(session, symbol=symbol, interval="1m", limit=240),
+            self.async_get_klines(session, symbol=symbol, interval="5m", limit=20),
+        )
+        return {"1m": candles_1m, "5m": candles_5m}
+
+    async def async_fetch_symbol(self, session, semaphore, symbol: str, retry_limit: int) -> dict:
+        retry_count = 0
+        while retry_count < retry_limit:
+            try:
+                async with semaphore:
+                    klines, funding = await asyncio.gather(
+                        self.async_get_kline_plan(session, symbol),
+                        self.exchange.async_get_funding_rate(session, symbol=symbol),
+                    )
+                if not klines["1m"] or not klines["5m"]:
+                    raise ValueError(f"No kline data received for {symbol}")
+                return {
+                    "symbol": symbol,
+                    "min_qty": self.exchange.get_symbol_info(symbol=symbol, info="min_order_qty"),
+                    "price": self.prices[symbol],
+                    "klines": klines,
+                    "funding": funding,
+                }
+            except Exception as e:
+                retry_count += 1
+                log.error(f"Exception while analysing {symbol}. Retry attempt {retry_count}. Exception: {e}")
+                await asyncio.sleep(1)
+
+        raise Exception(f"Failed to analyse {symbol} after {retry_limit} attempts.")
+
+    async def async_analyse_all_symbols(self, max_concurrency: int = 50, retry_limit: int = 5, executor=None):
+        """
+        asyncio version of analyse_all_symbols(). At most max_concurrency
+        symbols are fetched at once, each with its klines and funding rate
+        requested concurrently. The batch indicator stage then runs in the
+        given executor, a ProcessPoolExecutor keeps it off the GIL; with None
+        it runs in the loop's default thread pool.
+        """
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # Three requests in flight per symbol
+        connector = aiohttp.TCPConnector(limit=max_concurrency * 3)
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(
+                *(
+                    self.async_fetch_symbol(session, semaphore, symbol, retry_limit)
+                    for symbol in self.symbols
+                ),
+                return_exceptions=True,
+            )
+        fetch_time = time.time() - start_time
+
+        fetched = []
+        for symbol, result in zip(self.symbols, results):
+            if isinstance(result, Exception):
+                log.error(f"{symbol} generated an exception: {result}")
+            else:
+                fetched.append(result)
+
+        data = await asyncio.get_running_loop().run_in_executor(executor, self.analyse_batch, fetched)
+        log.info(
+            f"Analysed {len(data)}/{len(self.symbols)} symbols in {time.time() - start_time:.2f} seconds "
+            f"({fetch_time:.2f} fetching)"
+        )
+        return self.build_dataframe(data)
+
+    def __getstate__(self):
+        # Worker processes only run the indicator stage, which needs neither
+        # the exchange adapter nor the kline cache (both hold sessions and locks)
+        state = self.__dict__.copy()
+        state["exchange"] = None
+        state["kline_cache"] = None
+        return state
+
+    def retry_analyse_symbol(self, symbol: str, retry_limit: int, analyse=None):
+        analyse = analyse or self.analyse_symbol
         retry_count = 0
         while retry_count < retry_limit:
             try:
-                return self.analyse_symbol(symbol)
+                return analyse(symbol)
             except Exception as e:
                 retry_count += 1
                 log.error(f"Exception while analysing {symbol}. Retry attempt {retry_count}. Exception: {e}")
@@ -840,19 +1047,43 @@ if __name__ == "__main__":
     quote_symbols = ["USDT"]
     top_volume = 400
     filters = {"quote_symbols": quote_symbols, "top_volume": top_volume}
+    use_async = "--async" in sys.argv
+    # The indicator stage of the asyncio mode runs in a worker process, started once
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=1) if use_async else None
+    # Kept across cycles (and restarts) so each cycle only fetches the newest candles
+    kline_cache = KlineCache()
+    kline_cache.load(KLINE_CACHE_PATH)
+    # Published feed, served by nginx from its docroot unless --output-dir says otherwise
+    publish_dir = sys.argv[sys.argv.index("--output-dir") + 1] if "--output-dir" in sys.argv else PUBLISH_DIR
+    # Full columnar snapshot and a delta against the previous cycle, every cycle
+    publisher = QuantPublisher(
+        snapshot_path=f"{publish_dir}/quantdatav2.qdc",
+        delta_path=f"{publish_dir}/quantdatav2.delta.json",
+    )
+    # Opt-in: also serve every cycle from memory to bots on this host or LAN
+    server = None
+    if "--serve" in sys.argv:
+        port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else DEFAULT_PORT
+        server = QuantDataServer(port=port)
+        server.start()
     while True:
         try:
             with pidfile.PIDFile("scraper.pid"):
                 exchange = Bybit()
-                scraper = Scraper(exchange=exchange, filters=filters)
+                scraper = Scraper(exchange=exchange, filters=filters, kline_cache=kline_cache)
 
                 start_time = time.time()
-                data = scraper.analyse_all_symbols()
+                if use_async:
+                    data = asyncio.run(scraper.async_analyse_all_symbols(executor=executor))
+                else:
+                    data = scraper.analyse_all_symbols()
                 end_time = time.time()
                 elapsed_time = end_time - start_time
                 print(f"Time taken to analyse all symbols: {elapsed_time:.2f} seconds")
+                kline_cache.save(KLINE_CACHE_PATH)
                 print(data)
-                scraper.output_df(dataframe=data, path="/opt/bitnami/nginx/html/data/quantdatav2.json", to="json")
+                scraper.output_df(dataframe=data, path=f"{publish_dir}/quantdatav2.json", to="json")
+                publisher.publish(data.to_dict(orient="records"), columns=list(data.columns))
                 scraper.output_df(dataframe=data, path="data/quantdata.csv", to="csv")
 
                 to_trade = scraper.filter_df(
@@ -867,6 +1098,13 @@ if __name__ == "__main__":
                 scraper.output_df(
                     dataframe=to_trade, path="data/whattotrade.json", to="json"
                 )
+                if server is not None:
+                    server.publish({
+                        "quantdatav2.json": data.to_json(orient="records").encode(),
+                        "quantdatav2.qdc": publisher.snapshot,
+                        "quantdatav2.delta.json": publisher.delta_document,
+                        "rotatorsymbols.json": to_trade.to_json(orient="records").encode(),
+                    })
 
                 negative = scraper.filter_df(
                     dataframe=data, filter_col="Funding", operator="<", value=0
@@ -15,6 +15,7 @@ sys.path.append(".")
 from directionalscalper.api.exchanges.binance import Binance
 from directionalscalper.api.exchanges.bybit import Bybit
 from directionalscalper.core.logger import Logger
+from directionalscalper.core.utils import configure_session_pool
 
 log = Logger(filename="scraper.log", stream=True)
 
@@ -24,7 +25,8 @@ class Scraper:
         log.info("Scraper initalising")
         self.exchange = exchange
         self.filters = filters
-        self.symbols = self.exchange.get_futures_symbols()
+        # Refresh instruments info once per cycle, get_symbol_info() reads it from the cache
+        self.symbols = self.exchange.get_symbols_info(max_age=0)
         self.prices = self.exchange.get_futures_prices()
         log.info(f"{len(self.symbols)} symbols found")
         if "quote_symbols" in self.filters:
@@ -1050,6 +1052,8 @@ class Scraper:
     
     def analyse_all_symbols(self, max_workers: int = 20):
         data = []
+        # One pooled connection per worker thread
+        configure_session_pool(max_workers)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_data = {
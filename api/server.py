@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import logging
+from threading import Event, Thread
+
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8081
+# Longest a client may hold a request open waiting for the next cycle
+MAX_WAIT_SECONDS = 120
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".qdc": "application/octet-stream",
+}
+
+
+class ServedFile:
+    """
+    One published payload, with its ETag and gzip body computed once per
+    cycle instead of once per request.
+    """
+    def __init__(self, name: str, body: bytes):
+        self.name = name
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.content_type = CONTENT_TYPES.get(name[name.rfind("."):], "application/octet-stream")
+        # Already compressed payloads (.qdc) are served as they are
+        gzipped = gzip.compress(body, compresslevel=6)
+        self.gzipped = gzipped if len(gzipped) < len(body) * 0.9 else None
+
+
+class QuantDataServer:
+    """
+    Serves the scraper's latest quant data from memory at GET /data/<name>.
+
+    Every response carries an ETag and a request whose If-None-Match still
+    matches is answered 304. Bodies are gzipped for clients that accept it.
+    With ?wait=<seconds> a request whose ETag is current is held until the
+    next cycle is published (or the wait runs out, answered 304), so
+    clients see new data as soon as it is computed without polling.
+
+    The server runs its own event loop in a daemon thread, the scraper loop
+    just calls publish() after each cycle.
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_wait: float = MAX_WAIT_SECONDS):
+        self.host = host
+        self.port = port
+        self.max_wait = max_wait
+        self.files: dict = {}
+        self.loop = None
+        self.changed = None
+        self.started = Event()
+        self.error = None
+
+    def start(self):
+        """
+        Start serving in the background, returns once the port is bound.
+        """
+        Thread(target=self.run, daemon=True, name="quant-data-server").start()
+        self.started.wait()
+        if self.error is not None:
+            raise self.error
+        log.info(f"Serving quant data on http://{self.host}:{self.port}/data/")
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.serve())
+        except Exception as e:
+            self.error = e
+            self.started.set()
+            return
+        self.started.set()
+        self.loop.run_forever()
+
+    async def serve(self):
+        self.changed = asyncio.Condition()
+        app = web.Application()
+        app.router.add_get("/data/{name}", self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+
+    def publish(self, files: dict):
+        """
+        Replace the served payloads and wake the clients waiting for them.
+        Files missing from `files` keep their previous payload.
+
+        :param files: file name -> payload bytes
+        """
+        served = {name: ServedFile(name, body) for name, body in files.items()}
+        asyncio.run_coroutine_threadsafe(self.swap(served), self.loop).result()
+
+    async def swap(self, served: dict):
+        async with self.changed:
+            self.files = {**self.files, **served}
+            self.changed.notify_all()
+
+    async def handle(self, request):
+        name = request.match_info["name"]
+        served = self.files.get(name)
+        if served is None:
+            raise web.HTTPNotFound()
+        try:
+            wait = min(float(request.query.get("wait", 0)), self.max_wait)
+        except ValueError:
+            raise web.HTTPBadRequest(text="wait must be a number of seconds")
+
+        etag = request.headers.get("If-None-Match")
+        if etag == served.etag and wait > 0:
+            try:
+                async with self.changed:
+                    await asyncio.wait_for(self.changed.wait_for(lambda: self.files[name].etag != etag), wait)
+            except asyncio.TimeoutError:
+                pass
+            served = self.files[name]
+
+        headers = {"ETag": served.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if etag == served.etag:
+            return web.Response(status=304, headers=headers)
+        body = served.body
+        if served.gzipped is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = served.gzipped
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type=served.content_type, headers=headers)
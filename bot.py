@@ -123,7 +123,7 @@ if __name__ == '__main__':
 
     market_maker = DirectionalMarketMaker(config, exchange_name, account_name)
 
-    manager = Manager(market_maker.exchange, api=config.api.mode, path=Path("data", config.api.filename), url=f"{config.api.url}{config.api.filename}")
+    manager = Manager(market_maker.exchange, api=config.api.mode, path=Path("data", config.api.filename), url=f"{config.api.url}{config.api.filename}", long_poll_seconds=config.api.long_poll_seconds, rotator_url=config.api.rotator_url, delta_url=config.api.delta_url)
     market_maker.manager = manager 
 
     quote = "USDT"
@@ -23,6 +23,9 @@ class API(BaseModel):
     filename: str = "quantdatav2.json"
     mode: str = "remote"
     url: str = "http://api.tradesimple.xyz/data/"
+    rotator_url: str = "http://api.tradesimple.xyz/data/rotatorsymbols.json"
+    long_poll_seconds: int = 0
+    delta_url: str = ""
 
 
 class Bot(BaseModel):
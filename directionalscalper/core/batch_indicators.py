@@ -0,0 +1,91 @@
+import numpy as np
+
+# Vectorized versions of the indicators in indicators.py for many symbols at
+# once. Every input is a 2-D array of shape (symbols, bars), oldest bar first,
+# and every indicator runs along the bar axis for all symbols in one pass.
+# Values match the streaming indicators (NaN for the same warm-up bars).
+
+def ema(x, span=None, alpha=None, min_periods=0):
+    """
+    pandas ewm(span=... or alpha=..., adjust=False, min_periods=...).mean() per row
+    """
+    alpha = alpha if alpha is not None else 2 / (span + 1)
+    decay = 1 - alpha
+    out = np.empty_like(x, dtype=np.float64)
+    mean = x[:, 0].astype(np.float64)
+    out[:, 0] = mean
+    for i in range(1, x.shape[1]):
+        mean = decay * mean + alpha * x[:, i]
+        out[:, i] = mean
+    if min_periods > 1:
+        out[:, :min_periods - 1] = np.nan
+    return out
+
+def sma_last(x, window):
+    """
+    :returns np.ndarray: the last value of a rolling mean of each row
+    """
+    if x.shape[1] < window:
+        return np.full(x.shape[0], np.nan)
+    return x[:, -window:].mean(axis=1)
+
+def rsi(close, window=14):
+    """
+    ta.momentum.rsi(close, window) per row
+    """
+    diff = np.zeros_like(close, dtype=np.float64)
+    diff[:, 1:] = np.diff(close, axis=1)
+    up = ema(np.where(diff > 0, diff, 0.0), alpha=1 / window, min_periods=window)
+    down = ema(np.where(diff < 0, -diff, 0.0), alpha=1 / window, min_periods=window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - (100 / (1 + up / down))
+    out[down == 0] = 100.0
+    out[np.isnan(down)] = np.nan
+    return out
+
+def rolling_sum(x, window):
+    """
+    Sum of the last `window` values at every bar (of fewer at the start)
+    """
+    cumsum = np.cumsum(x, axis=1)
+    out = cumsum.copy()
+    out[:, window:] = cumsum[:, window:] - cumsum[:, :-window]
+    return out
+
+def mfi(high, low, close, volume, window=14):
+    """
+    ta.volume.MFIIndicator(high, low, close, volume, window).money_flow_index() per row
+    """
+    typical_price = (high + low + close) / 3.0
+    direction = np.zeros_like(typical_price)
+    direction[:, 1:] = np.sign(np.diff(typical_price, axis=1))
+    flow = typical_price * volume * direction
+    positive = rolling_sum(np.where(flow >= 0, flow, 0.0), window)
+    negative = rolling_sum(np.where(flow < 0, -flow, 0.0), window)
+    # A window without negative flows has exactly zero negative flow
+    negative[rolling_sum((flow < 0).astype(np.float64), window) == 0] = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - (100 / (1 + positive / negative))
+    out[negative == 0] = np.where(positive[negative == 0] > 0, 100.0, np.nan)
+    out[:, :window - 1] = np.nan
+    return out
+
+def eri(high, low, close, slow_span=64, power_span=13):
+    """
+    Elder Ray bull/bear power per row, returns (bull, bear, bullish) arrays
+    """
+    slow = ema(close, span=slow_span)
+    bull = ema(high - slow, span=power_span)
+    bear = ema(low - slow, span=power_span)
+    return bull, bear, close > slow
+
+def spread(high, low):
+    """
+    (highest high - lowest low) / highest high in percent per row, 0 when there is no high
+    """
+    highest_high = high.max(axis=1)
+    lowest_low = low.min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.round((highest_high - lowest_low) / highest_high * 100, 4)
+    out[~(highest_high > 0)] = 0.0
+    return out
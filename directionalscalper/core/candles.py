@@ -0,0 +1,331 @@
+import os
+import json
+import time
+import struct
+import threading
+import numpy as np
+from ccxt.base.errors import RateLimitExceeded
+from .strategies.logger import Logger
+
+logging = Logger(logger_name="Candles", filename="Candles.log", stream=True)
+
+class CandleBuffer:
+    """
+    Fixed-size ring buffer of OHLCV rows for one (symbol, timeframe).
+    Column 0 is the open time in ms, columns 1-5 open/high/low/close/volume.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.rows = np.zeros((capacity, 6), dtype=np.float64)
+        self.count = 0
+        self.end = 0
+        self.lock = threading.Lock()
+
+    def last_timestamp(self):
+        if self.count == 0:
+            return None
+        return int(self.rows[(self.end - 1) % self.capacity, 0])
+
+    def first_timestamp(self):
+        if self.count == 0:
+            return None
+        return int(self.rows[(self.end - self.count) % self.capacity, 0])
+
+    def append(self, bars):
+        """
+        Merge bars in ascending time order. A bar with the same open time as
+        the newest stored one replaces it (the candle was still forming).
+        """
+        for bar in bars:
+            last = self.last_timestamp()
+            if last is not None and bar[0] < last:
+                continue
+            if last is not None and bar[0] == last:
+                self.rows[(self.end - 1) % self.capacity] = bar[:6]
+                continue
+            self.rows[self.end] = bar[:6]
+            self.end = (self.end + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def restore(self, rows):
+        """
+        Replace the contents with rows in ascending time order.
+        """
+        rows = rows[-self.capacity:]
+        self.rows[:len(rows)] = rows
+        self.count = len(rows)
+        self.end = len(rows) % self.capacity
+
+    def window(self, n=None):
+        """
+        :returns np.ndarray: the newest n rows (all stored rows when None), oldest first
+        """
+        n = self.count if n is None else min(n, self.count)
+        idx = (self.end - n + np.arange(n)) % self.capacity
+        return self.rows[idx]
+
+class CandleStore:
+    """
+    In-memory OHLCV store keyed by (symbol, timeframe).
+
+    The first read fetches a full window; later reads only call
+    fetch_ohlcv(since=last stored open time), once the stored candle has
+    closed or, while it is still forming, once it is forming_ttl seconds
+    old. Each symbol costs at most one request per timeframe per
+    forming_ttl instead of one per read.
+    """
+    def __init__(self, exchange, capacity=500, forming_ttl=2):
+        self.exchange = exchange
+        self.capacity = capacity
+        self.forming_ttl = forming_ttl
+        self.buffers = {}
+        # Exchange time in ms of the last fetch per (symbol, timeframe)
+        self.fetched = {}
+        self.lock = threading.Lock()
+
+    def buffer(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        with self.lock:
+            buffer = self.buffers.get(key)
+            if buffer is None:
+                buffer = CandleBuffer(self.capacity)
+                self.buffers[key] = buffer
+            return buffer
+
+    def timeframe_ms(self, timeframe):
+        return self.exchange.parse_timeframe(timeframe) * 1000
+
+    def update(self, symbol, timeframe, buffer):
+        tf_ms = self.timeframe_ms(timeframe)
+        now = self.exchange.milliseconds()
+        last = buffer.last_timestamp()
+        key = (symbol, timeframe)
+        if last is not None and now < last + tf_ms and now - self.fetched.get(key, 0) < self.forming_ttl * 1000:
+            return
+        missing = None if last is None else int((now - last) // tf_ms) + 1
+        if missing is None or missing + 1 > self.capacity:
+            # Empty, or further behind than the buffer holds: since=last would
+            # return the oldest missing candles, start over from the newest ones
+            buffer.count = 0
+            buffer.end = 0
+            bars = self.exchange.fetch_ohlcv(symbol, timeframe, limit=self.capacity)
+        else:
+            # Refetch the last stored candle too so its latest values replace the partial ones
+            bars = self.exchange.fetch_ohlcv(symbol, timeframe, since=last, limit=missing + 1)
+        buffer.append(bars)
+        self.fetched[key] = now
+
+    def get(self, symbol, timeframe, limit=None):
+        """
+        :param str symbol: unified symbol or exchange market id
+        :param str timeframe: ccxt timeframe, e.g. "1m"
+        :param int limit: number of newest candles to return, all stored when None
+        :returns np.ndarray: rows of [time, open, high, low, close, volume], oldest first
+        """
+        buffer = self.buffer(symbol, timeframe)
+        with buffer.lock:
+            try:
+                self.update(symbol, timeframe, buffer)
+            except RateLimitExceeded as e:
+                # A shed read serves the stored candles rather than failing the caller
+                if buffer.count == 0:
+                    raise
+                logging.info(f"Serving stored {timeframe} candles of {symbol}: {e}")
+            return buffer.window(limit).copy()
+
+# KlineCache snapshot file: magic, version, index length, JSON index, then
+# the float64 rows of every buffer starting at a 64 byte boundary
+KLINE_FILE_MAGIC = b"KLNC"
+KLINE_FILE_VERSION = 1
+KLINE_FILE_HEADER = struct.Struct("<4sIQ")
+
+def kline_data_offset(index_length):
+    return -(-(KLINE_FILE_HEADER.size + index_length) // 64) * 64
+
+# Open time step of the api/exchanges adapter intervals, in ms
+INTERVAL_MS = {
+    "1m": 60 * 1000,
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "30m": 30 * 60 * 1000,
+    "1h": 60 * 60 * 1000,
+    "4h": 4 * 60 * 60 * 1000,
+    "1d": 24 * 60 * 60 * 1000,
+}
+
+class KlineCache:
+    """
+    Closed klines of the api/exchanges adapters, kept across scraper cycles.
+
+    A buffer holds the newest `limit` closed candles of one (symbol,
+    interval). Each cycle only the candles closed since the last one are
+    requested (plus the last stored one, to check continuity); a buffer is
+    refetched in full when it is empty, too far behind or the new candles
+    do not connect to it.
+
+    save() and load() snapshot the buffers to a memory-mapped file so a
+    restarted scraper only backfills the candles closed while it was down.
+    """
+    def __init__(self):
+        self.buffers = {}
+        self.unverified = set()
+        self.lock = threading.Lock()
+
+    def buffer(self, symbol, interval, capacity):
+        key = (symbol, interval)
+        with self.lock:
+            buffer = self.buffers.get(key)
+            if buffer is None or buffer.capacity < capacity:
+                grown = CandleBuffer(capacity)
+                if buffer is not None:
+                    with buffer.lock:
+                        grown.restore(buffer.window())
+                buffer = grown
+                self.buffers[key] = buffer
+            return buffer
+
+    def fetch_limit(self, symbol, interval, limit, now=None):
+        """
+        :returns int: number of newest closed candles to request, 0 when the buffer is up to date
+        """
+        buffer = self.buffer(symbol, interval, limit)
+        last = buffer.last_timestamp()
+        if last is None or buffer.count < limit:
+            # Empty, or grown past the candles it holds (or a listing younger than the window)
+            return limit
+        interval_ms = INTERVAL_MS[interval]
+        now = int(time.time() * 1000) if now is None else now
+        newest_closed = now - now % interval_ms - interval_ms
+        missing = (newest_closed - last) // interval_ms
+        if missing <= 0:
+            return 0
+        return min(missing + 1, limit)
+
+    def merge(self, symbol, interval, bars):
+        """
+        :param list bars: adapter klines, oldest first
+        :returns bool: False when the bars leave a gap after the stored ones
+            and a full refetch is needed
+        """
+        buffer = self.buffer(symbol, interval, len(bars))
+        rows = [
+            (bar["timestamp"], bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"])
+            for bar in bars
+        ]
+        with buffer.lock:
+            last = buffer.last_timestamp()
+            if rows and last is not None and (symbol, interval) in self.unverified:
+                # A buffer restored from disk must agree with the exchange on its last candle
+                self.unverified.discard((symbol, interval))
+                stored = buffer.window(1)[0]
+                if rows[0][0] == last and not np.allclose(stored, rows[0]):
+                    logging.info(f"Stored {interval} klines of {symbol} do not match the exchange, refetching")
+                    buffer.count = 0
+                    buffer.end = 0
+                    last = None
+                    if len(rows) < buffer.capacity:
+                        return False
+            if rows and last is not None and rows[0][0] < buffer.first_timestamp():
+                # A full window reaching further back than the stored candles
+                buffer.count = 0
+                buffer.end = 0
+            if rows and last is not None and rows[0][0] > last + INTERVAL_MS[interval]:
+                if len(rows) < buffer.capacity:
+                    return False
+                buffer.count = 0
+                buffer.end = 0
+            buffer.append(rows)
+        return True
+
+    def window(self, symbol, interval, limit):
+        """
+        :returns list: the newest `limit` klines as adapter kline dicts, oldest first
+        """
+        buffer = self.buffer(symbol, interval, limit)
+        with buffer.lock:
+            rows = buffer.window(limit).tolist()
+        return [
+            {"timestamp": int(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for t, o, h, l, c, v in rows
+        ]
+
+    def prune(self, symbols):
+        """
+        Drop the buffers of symbols that are no longer scraped.
+        """
+        symbols = set(symbols)
+        with self.lock:
+            for key in [key for key in self.buffers if key[0] not in symbols]:
+                del self.buffers[key]
+                self.unverified.discard(key)
+
+    def save(self, path):
+        """
+        Write every buffer to path, atomically replacing the previous snapshot.
+        """
+        with self.lock:
+            items = list(self.buffers.items())
+        index = []
+        blocks = []
+        offset = 0
+        for (symbol, interval), buffer in items:
+            with buffer.lock:
+                rows = buffer.window()
+            index.append({
+                "symbol": symbol,
+                "interval": interval,
+                "capacity": buffer.capacity,
+                "offset": offset,
+                "rows": len(rows),
+            })
+            blocks.append(rows)
+            offset += len(rows)
+
+        header = json.dumps({"buffers": index}).encode()
+        data_offset = kline_data_offset(len(header))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(KLINE_FILE_HEADER.pack(KLINE_FILE_MAGIC, KLINE_FILE_VERSION, len(header)))
+            f.write(header)
+            f.write(b"\0" * (data_offset - KLINE_FILE_HEADER.size - len(header)))
+            for rows in blocks:
+                f.write(rows.astype("<f8").tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """
+        Restore the buffers saved by save(). The rows are read through a
+        memory map, and each buffer is checked against the exchange on its
+        next merge().
+
+        :returns int: number of buffers restored, 0 when there is no usable snapshot
+        """
+        try:
+            with open(path, "rb") as f:
+                magic, version, index_length = KLINE_FILE_HEADER.unpack(f.read(KLINE_FILE_HEADER.size))
+                if magic != KLINE_FILE_MAGIC or version != KLINE_FILE_VERSION:
+                    raise ValueError(f"unsupported kline snapshot {magic!r} v{version}")
+                index = json.loads(f.read(index_length))["buffers"]
+            total = sum(entry["rows"] for entry in index)
+            if total == 0:
+                return 0
+            rows = np.memmap(path, dtype="<f8", mode="r", offset=kline_data_offset(index_length), shape=(total, 6))
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logging.info(f"Ignoring kline snapshot {path}: {e}")
+            return 0
+
+        buffers = {}
+        for entry in index:
+            buffer = CandleBuffer(entry["capacity"])
+            buffer.restore(rows[entry["offset"]:entry["offset"] + entry["rows"]])
+            buffers[(entry["symbol"], entry["interval"])] = buffer
+        del rows
+        with self.lock:
+            self.buffers.update(buffers)
+            self.unverified.update(buffers)
+        logging.info(f"Restored {len(buffers)} kline buffers from {path}")
+        return len(buffers)
@@ -3,31 +3,201 @@ import logging
 import time
 import ccxt
 import pandas as pd
+import numpy as np
 import json
 import requests, hmac, hashlib
 import urllib.parse
+import threading
+from requests.adapters import HTTPAdapter
 from typing import Optional, Tuple, List
 from ccxt.base.errors import RateLimitExceeded
 from .strategies.logger import Logger
+from .market_cache import MarketSpecCache
+from .orderbook import OrderBookStream
+from .positions import PositionService
+from .wallet import WalletService
+from .leverage_tiers import LeverageTierCache
+from .candles import CandleStore
 from requests.exceptions import HTTPError
-from datetime import datetime, timedelta
 from ccxt.base.errors import NetworkError
 import traceback
 
 logging = Logger(logger_name="Exchange", filename="Exchange.log", stream=True)
 
+# Token bucket budgets per endpoint class as (burst, refill per second), in
+# the same weight units ccxt uses for each endpoint's cost. Bybit allows 600
+# public requests per 5s per IP and 10 private requests per second per UID
+# (ccxt weighs private calls 2.5); Binance futures allows 2400 weight per
+# minute per IP, split here between market data and account reads.
+RATE_LIMITS = {
+    "bybit": {
+        "market_data": (120, 100),
+        "account": (25, 25),
+        "trading": (25, 25),
+    },
+    "binance": {
+        "market_data": (40, 20),
+        "account": (40, 20),
+        "trading": (40, 20),
+    },
+}
+
+# Request priorities, lower is served first
+PRIORITY_CANCEL = 0        # cancels and reduce-only / take profit orders
+PRIORITY_ENTRY = 1         # new entries, amends, leverage changes
+PRIORITY_ACCOUNT = 2       # positions, balance, open orders
+PRIORITY_MARKET_DATA = 3   # order books, klines, tickers
+
+class TokenBucket:
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def time_until(self, weight):
+        """
+        :returns float: seconds until `weight` tokens are available, 0 when they already are
+        """
+        self.refill()
+        if self.tokens >= weight:
+            return 0.0
+        return (min(weight, self.capacity) - self.tokens) / self.refill_rate
+
+    def take(self, weight):
+        self.tokens -= weight
+
+class RequestScheduler:
+    """
+    Proactive, thread-safe scheduler in front of a ccxt client.
+
+    Every REST call is classified by endpoint (market data, account or
+    trading), weighed with the endpoint cost ccxt carries for it and admitted
+    against that class's token bucket. Waiting requests are admitted in
+    priority order: cancels and reduce-only orders, then entries, then
+    account reads, then market data. Priorities only order requests that
+    share a bucket, so throttled orders never hold up market data reads.
+    Market data reads that would wait longer than max_defer seconds are
+    shed with RateLimitExceeded; the market data helpers then serve their
+    last known data instead of retrying.
+    """
+    def __init__(self, exchange, limits=None, max_defer=5):
+        self.exchange = exchange
+        self.max_defer = max_defer
+        if limits is None:
+            # Fall back to ccxt's own rateLimit for exchanges without published budgets
+            default_rate = 1000 / self.exchange.rateLimit
+            limits = RATE_LIMITS.get(exchange.id, {
+                "market_data": (default_rate, default_rate),
+                "account": (default_rate, default_rate),
+                "trading": (default_rate, default_rate),
+            })
+        self.buckets = {endpoint_class: TokenBucket(*budget) for endpoint_class, budget in limits.items()}
+        # Waiting requests per bucket and priority
+        self.waiting = {endpoint_class: [0, 0, 0, 0] for endpoint_class in self.buckets}
+        self.condition = threading.Condition()
+
+    def endpoint_class(self, api, method, path):
+        api_name = "/".join(api) if isinstance(api, (list, tuple)) else str(api)
+        if "public" in api_name.lower():
+            return "market_data"
+        if method.upper() != "GET":
+            return "trading"
+        return "account"
+
+    def priority(self, endpoint_class, path, params):
+        if endpoint_class == "market_data":
+            return PRIORITY_MARKET_DATA
+        if endpoint_class == "account":
+            return PRIORITY_ACCOUNT
+        if "cancel" in path.lower() or str(params.get("reduceOnly", "")).lower() == "true":
+            return PRIORITY_CANCEL
+        return PRIORITY_ENTRY
+
+    def acquire(self, api, method, path, params={}, config={}):
+        try:
+            weight = self.exchange.calculate_rate_limiter_cost(api, method, path, params, config)
+        except Exception:
+            weight = 1
+        endpoint_class = self.endpoint_class(api, method, path)
+        priority = self.priority(endpoint_class, path, params)
+        bucket = self.buckets[endpoint_class]
+        waiting = self.waiting[endpoint_class]
+        started = time.monotonic()
+
+        with self.condition:
+            waiting[priority] += 1
+            try:
+                while True:
+                    if any(waiting[:priority]):
+                        # Higher priority traffic is queued, step aside until it is admitted
+                        wait = 0.05
+                    else:
+                        wait = bucket.time_until(weight)
+                        if wait == 0:
+                            bucket.take(weight)
+                            break
+                    if priority == PRIORITY_MARKET_DATA and time.monotonic() - started + wait > self.max_defer:
+                        raise RateLimitExceeded(f"Shed {method} {path}: rate budget reserved for higher priority requests")
+                    self.condition.wait(wait)
+            finally:
+                waiting[priority] -= 1
+                self.condition.notify_all()
+
+        queued = time.monotonic() - started
+        if queued > 1:
+            logging.info(f"Request scheduler queued {method} {path} ({endpoint_class}) for {queued:.2f}s")
+
+    def wrap(self, fetch2):
+        def scheduled_fetch2(path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+            self.acquire(api, method, path, params, config)
+            return fetch2(path, api, method, params, headers, body, config)
+        return scheduled_fetch2
+
 class Exchange:
-    def __init__(self, exchange_id, api_key, secret_key, passphrase=None):
+    # One instance per (exchange, account) shared by every symbol thread
+    shared_instances = {}
+    shared_instances_lock = threading.Lock()
+
+    def __init__(self, exchange_id, api_key, secret_key, passphrase=None, pool_size=50):
         self.exchange_id = exchange_id
         self.api_key = api_key
         self.secret_key = secret_key
         self.passphrase = passphrase
         self.name = exchange_id
+        self.pool_size = pool_size
         self.initialise()
+        self.market_cache = MarketSpecCache(self.exchange)
         self.symbols = self._get_symbols()
         self.market_precisions = {}
-        self.open_positions_cache = None
-        self.last_open_positions_time = None
+        self.position_service = PositionService(self.exchange)
+        self.wallet_service = WalletService(self.exchange)
+        self.candle_store = CandleStore(self.exchange)
+        # Last REST order book per symbol, served when a read is shed
+        self.last_orderbooks = {}
+        self.leverage_tiers = LeverageTierCache(self.exchange) if exchange_id.lower() == 'bybit' else None
+        # Local L2 books fed by the public websocket, only Bybit linear for now
+        self.orderbook_stream = OrderBookStream() if exchange_id.lower() == 'bybit' else None
+
+    @classmethod
+    def get_shared(cls, exchange_id, account_name, api_key, secret_key, passphrase=None):
+        """
+        Return the process-wide Exchange for (exchange_id, account_name),
+        creating it on first use so markets are only loaded once per account.
+        """
+        key = (exchange_id.lower(), account_name)
+        with cls.shared_instances_lock:
+            instance = cls.shared_instances.get(key)
+            if instance is None:
+                logging.info(f"Creating shared exchange instance for {exchange_id} account {account_name}")
+                instance = cls(exchange_id, api_key, secret_key, passphrase)
+                cls.shared_instances[key] = instance
+            return instance
 
     def initialise(self):
         exchange_class = getattr(ccxt, self.exchange_id)
@@ -70,13 +240,38 @@ class Exchange:
         self.exchange = exchange_class(exchange_params)
         #print(self.exchange.describe())  # Print the exchange properties
 
+        # Replace ccxt's single global throttle with per-endpoint-class token
+        # buckets and priority lanes, so order traffic goes ahead of reads
+        self.exchange.enableRateLimit = False
+        self.scheduler = RequestScheduler(self.exchange)
+        self.exchange.fetch2 = self.scheduler.wrap(self.exchange.fetch2)
+        self.exchange.fetch2 = self.invalidate_after_trading(self.exchange.fetch2)
+
+        # Keep-alive pool sized for every symbol thread sharing this client
+        if self.exchange.session is not None:
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            self.exchange.session.mount('https://', adapter)
+            self.exchange.session.mount('http://', adapter)
+
+    def invalidate_after_trading(self, fetch2):
+        """
+        Orders placed or cancelled change positions and margin, so every
+        successful trading request drops the position and wallet snapshots
+        and the next read fetches fresh ones.
+        """
+        def invalidating_fetch2(path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+            response = fetch2(path, api, method, params, headers, body, config)
+            if self.scheduler.endpoint_class(api, method, path) == "trading":
+                self.position_service.invalidate()
+                self.wallet_service.invalidate()
+            return response
+        return invalidating_fetch2
+
     def _get_symbols(self):
         while True:
             try:
                 #self.exchange.set_sandbox_mode(True)
-                markets = self.exchange.load_markets()
-                symbols = [market['symbol'] for market in markets.values()]
-                return symbols
+                return self.market_cache.load()
             except ccxt.errors.RateLimitExceeded as e:
                 logging.info(f"Rate limit exceeded: {e}, retrying in 10 seconds...")
                 time.sleep(10)
@@ -119,31 +314,19 @@ class Exchange:
         return max_trade_qty
     
     def get_market_tick_size_bybit(self, symbol):
-        # Fetch the market data
-        markets = self.exchange.fetch_markets()
-
-        # Filter for the specific symbol
-        for market in markets:
-            if market['symbol'] == symbol:
-                tick_size = market['info']['priceFilter']['tickSize']
-                return tick_size
-        
-        return None
+        # The tickSize string as Bybit reports it, the spec holds it as a float
+        try:
+            market = self.exchange.market(self.market_cache.get(symbol)['symbol'])
+        except ccxt.BadSymbol:
+            return None
+        return ((market.get('info') or {}).get('priceFilter') or {}).get('tickSize')
 
     def get_precision_and_limits_bybit(self, symbol):
-        # Fetch the market data
-        markets = self.exchange.fetch_markets()
-
-        # Filter for the specific symbol
-        for market in markets:
-            if market['symbol'] == symbol:
-                precision_amount = market['precision']['amount']
-                precision_price = market['precision']['price']
-                min_amount = market['limits']['amount']['min']
-
-                return precision_amount, precision_price, min_amount
-
-        return None, None, None
+        try:
+            spec = self.market_cache.get(symbol)
+            return spec['amount_precision'], spec['precision'], spec['min_qty']
+        except ccxt.BadSymbol:
+            return None, None, None
 
     def get_market_precision_data_bybit(self, symbol):
         # Fetch the market data
@@ -354,25 +537,15 @@ class Exchange:
     def get_market_data_bybit(self, symbol: str) -> dict:
         values = {"precision": 0.0, "leverage": 0.0, "min_qty": 0.0}
         try:
-            self.exchange.load_markets()
-            symbol_data = self.exchange.market(symbol)
-            
-            #print("Symbol data:", symbol_data)  # Debug print
-            
-            if "info" in symbol_data:
-                values["precision"] = symbol_data["precision"]["price"]
-                values["min_qty"] = symbol_data["limits"]["amount"]["min"]
+            spec = self.market_cache.get(symbol)
+            values["precision"] = spec["precision"]
+            values["min_qty"] = spec["min_qty"]
 
-            # Fetch positions
-            positions = self.exchange.fetch_positions()
-
-            for position in positions:
-                if position['symbol'] == symbol:
+            # Leverage comes from the shared open positions cache instead of a fetch_positions() per call
+            for position in self.get_all_open_positions_bybit():
+                if position['symbol'] == spec["symbol"]:
                     values["leverage"] = float(position['leverage'])
 
-        # except Exception as e:
-        #     logging.info(f"An unknown error occurred in get_market_data_bybit(): {e}")
-        #     logging.info(f"Call Stack: {traceback.format_exc()}")
         except Exception as e:
             logging.info(f"An unknown error occurred in get_market_data_bybit(): {e}")
         return values
@@ -492,14 +665,19 @@ class Exchange:
             logging.info(f"An unknown error occurred in get_market_data_huobi(): {e}")
         return values
 
+    # Bybit
+    def get_wallet_snapshot_bybit(self) -> dict:
+        """
+        Equity, available balance and margin fields for every coin, fetched
+        at most once per refresh interval for all threads sharing this Exchange.
+        """
+        return self.wallet_service.get_snapshot()
+
     # Bybit
     def get_balance_bybit_unified(self, quote):
         if self.exchange.has['fetchBalance']:
-            # Fetch the balance
-            balance = self.exchange.fetch_balance()
-
             # Find the quote balance
-            unified_balance = balance.get('USDT', {})
+            unified_balance = self.wallet_service.get('USDT') or {}
             total_balance = unified_balance.get('total', None)
             
             if total_balance is not None:
@@ -510,29 +688,22 @@ class Exchange:
     # Bybit
     def get_balance_bybit(self, quote):
         if self.exchange.has['fetchBalance']:
-            # Fetch the balance
-            balance = self.exchange.fetch_balance()
-
             # Find the quote balance
-            for currency_balance in balance['info']['result']['list']:
-                if currency_balance['coin'] == quote:
-                    return float(currency_balance['equity'])
+            currency_balance = self.wallet_service.get(quote)
+            if currency_balance is not None:
+                return currency_balance['equity']
         return None
 
     # Bybit
     def get_available_balance_bybit(self, quote):
         if self.exchange.has['fetchBalance']:
-            # Fetch the balance
-            balance = self.exchange.fetch_balance()
-
             # Find the quote balance
             try:
-                for currency_balance in balance['info']['result']['list']:
-                    if currency_balance['coin'] == quote:
-                        return float(currency_balance['availableBalance'])
+                currency_balance = self.wallet_service.get(quote)
+                if currency_balance is not None:
+                    return currency_balance['available_balance']
             except KeyError as e:
                 print(f"KeyError: {e}")
-                print(balance)  # Print the balance if there was a KeyError
         return None
 
     def get_available_balance_huobi(self, symbol):
@@ -770,17 +941,18 @@ class Exchange:
         return values
     
     # Universal
-    def fetch_ohlcv(self, symbol, timeframe='1d'):
+    def fetch_ohlcv(self, symbol, timeframe='1d', limit=None):
         """
         Fetch OHLCV data for the given symbol and timeframe.
 
         :param symbol: Trading symbol.
         :param timeframe: Timeframe string.
+        :param limit: Number of newest candles, everything in the candle store when None.
         :return: DataFrame with OHLCV data.
         """
         try:
-            # Fetch the OHLCV data from the exchange
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe)
+            # Served from the candle store, which only fetches candles it has not seen
+            ohlcv = self.candle_store.get(symbol, timeframe, limit)
 
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
 
@@ -794,9 +966,29 @@ class Exchange:
             print(f'Failed to fetch OHLCV data: {e}')
             return pd.DataFrame()
 
+    def get_local_orderbook(self, symbol):
+        """
+        Return the streamed LocalOrderBook for symbol, subscribing on first
+        use. Returns None until the stream has a fresh snapshot.
+        """
+        if self.orderbook_stream is None:
+            return None
+        try:
+            market_id = self.exchange.market(symbol)['id']
+        except ccxt.BadSymbol:
+            return None
+        book = self.orderbook_stream.get_book(market_id)
+        if book is None:
+            self.orderbook_stream.subscribe(market_id)
+        return book
+
     def get_orderbook(self, symbol, max_retries=3, retry_delay=5) -> dict:
         values = {"bids": [], "asks": []}
 
+        book = self.get_local_orderbook(symbol)
+        if book is not None and book.best_bid() is not None and book.best_ask() is not None:
+            return book.depth()
+
         for attempt in range(max_retries):
             try:
                 data = self.exchange.fetch_order_book(symbol)
@@ -805,8 +997,14 @@ class Exchange:
                         if len(data["bids"][0]) > 0 and len(data["asks"][0]) > 0:
                             values["bids"] = data["bids"]
                             values["asks"] = data["asks"]
+                            self.last_orderbooks[symbol] = values
                 break  # if the fetch was successful, break out of the loop
 
+            except RateLimitExceeded as e:
+                # Shed by the request scheduler, waiting and retrying would only add to the queue
+                logging.info(f"Order book read for {symbol} shed: {e}, serving the last known book")
+                return self.last_orderbooks.get(symbol, values)
+
             except HTTPError as http_err:
                 print(f"HTTP error occurred: {http_err} - {http_err.response.text}")
 
@@ -909,7 +1107,11 @@ class Exchange:
 
     # Bybit
     def get_best_bid_ask_bybit(self, symbol):
-        orderbook = self.exchange.get_orderbook(symbol)
+        book = self.get_local_orderbook(symbol)
+        if book is not None:
+            return book.best_bid(), book.best_ask()
+
+        orderbook = self.get_orderbook(symbol)
         try:
             best_ask_price = orderbook['asks'][0][0]
         except IndexError:
@@ -924,44 +1126,10 @@ class Exchange:
 
     # Bybit 
     def get_positions_bybit(self, symbol, max_retries=10, retry_delay=5) -> dict:
-        values = {
-            "long": {
-                "qty": 0.0,
-                "price": 0.0,
-                "realised": 0,
-                "cum_realised": 0,
-                "upnl": 0,
-                "upnl_pct": 0,
-                "liq_price": 0,
-                "entry_price": 0,
-            },
-            "short": {
-                "qty": 0.0,
-                "price": 0.0,
-                "realised": 0,
-                "cum_realised": 0,
-                "upnl": 0,
-                "upnl_pct": 0,
-                "liq_price": 0,
-                "entry_price": 0,
-            },
-        }
-
+        # Served from the account-wide snapshot, one fetch_positions() per refresh interval
         for i in range(max_retries):
             try:
-                data = self.exchange.fetch_positions(symbol)
-                if len(data) == 2:
-                    sides = ["long", "short"]
-                    for side in [0, 1]:
-                        values[sides[side]]["qty"] = float(data[side]["contracts"])
-                        values[sides[side]]["price"] = float(data[side]["entryPrice"] or 0)
-                        values[sides[side]]["realised"] = round(float(data[side]["info"]["unrealisedPnl"] or 0), 4)
-                        values[sides[side]]["cum_realised"] = round(float(data[side]["info"]["cumRealisedPnl"] or 0), 4)
-                        values[sides[side]]["upnl"] = round(float(data[side]["info"]["unrealisedPnl"] or 0), 4)
-                        values[sides[side]]["upnl_pct"] = round(float(data[side]["percentage"] or 0), 4)
-                        values[sides[side]]["liq_price"] = float(data[side]["liquidationPrice"] or 0)
-                        values[sides[side]]["entry_price"] = float(data[side]["entryPrice"] or 0)
-                break  # If the fetch was successful, break out of the loop
+                return self.position_service.get(symbol)
             except Exception as e:
                 if i < max_retries - 1:  # If not the last attempt
                     logging.info(f"An unknown error occurred in get_positions_bybit(): {e}. Retrying in {retry_delay} seconds...")
@@ -970,8 +1138,6 @@ class Exchange:
                     logging.info(f"Failed to fetch positions after {max_retries} attempts: {e}")
                     raise e  # If it's still failing after max_retries, re-raise the exception.
 
-        return values
-
     def get_all_open_orders_bybit(self):
         """
         Fetch all open orders for all symbols from the Bybit API.
@@ -986,23 +1152,9 @@ class Exchange:
             return []
 
     def get_all_open_positions_bybit(self, retries=10, delay_factor=10) -> List[dict]:
-        now = datetime.now()
-
-        # Check if the cache is still valid
-        if self.open_positions_cache and self.last_open_positions_time and now - self.last_open_positions_time < timedelta(seconds=15):
-            return self.open_positions_cache
-
         for attempt in range(retries):
             try:
-                # No symbol is passed to fetch_positions to get positions for all symbols.
-                all_positions = self.exchange.fetch_positions() 
-                open_positions = [position for position in all_positions if float(position.get('contracts', 0)) != 0] 
-
-                # Update the cache with the new data
-                self.open_positions_cache = open_positions
-                self.last_open_positions_time = now
-
-                return open_positions
+                return self.position_service.get_open_positions()
             except Exception as e:
                 # If the error is related to rate limiting, wait for some time and retry
                 if "Too many visits" in str(e) and attempt < retries - 1:
@@ -1499,22 +1651,19 @@ class Exchange:
 
         for i in range(max_retries):
             try:
-                bars = self.exchange.fetch_ohlcv(
-                    symbol=symbol, timeframe=timeframe, limit=num_bars
-                )
-                df = pd.DataFrame(
-                    bars, columns=["Time", "Open", "High", "Low", "Close", "Volume"]
-                )
-                df["Time"] = pd.to_datetime(df["Time"], unit="ms")
-                df["MA_3_High"] = df.High.rolling(3).mean()
-                df["MA_3_Low"] = df.Low.rolling(3).mean()
-                df["MA_6_High"] = df.High.rolling(6).mean()
-                df["MA_6_Low"] = df.Low.rolling(6).mean()
-                values["MA_3_H"] = df["MA_3_High"].iat[-1]
-                values["MA_3_L"] = df["MA_3_Low"].iat[-1]
-                values["MA_6_H"] = df["MA_6_High"].iat[-1]
-                values["MA_6_L"] = df["MA_6_Low"].iat[-1]
+                bars = self.candle_store.get(symbol, timeframe, num_bars)
+                highs = bars[:, 2]
+                lows = bars[:, 3]
+                # Same as the last value of a rolling(n).mean(), NaN until n bars exist
+                values["MA_3_H"] = highs[-3:].mean() if len(bars) >= 3 else np.nan
+                values["MA_3_L"] = lows[-3:].mean() if len(bars) >= 3 else np.nan
+                values["MA_6_H"] = highs[-6:].mean() if len(bars) >= 6 else np.nan
+                values["MA_6_L"] = lows[-6:].mean() if len(bars) >= 6 else np.nan
                 break  # If the fetch was successful, break out of the loop
+            except RateLimitExceeded as e:
+                # Shed with no stored candles to serve, NaN keeps every MA condition false
+                logging.info(f"Moving averages read for {symbol} shed: {e}")
+                return {key: np.nan for key in values}
             except Exception as e:
                 if i < max_retries - 1:  # If not the last attempt
                     logging.info(f"An unknown error occurred in get_moving_averages(): {e}. Retrying in {retry_delay} seconds...")
@@ -1992,15 +2141,10 @@ class Exchange:
     #     raise Exception(f"Failed to get max leverage for {symbol} after {max_retries} retries.")
 
     def get_max_leverage_bybit(self, symbol, max_retries=10, backoff_factor=0.5):
-        #logging.info(f"Called get_max_leverage_bybit with symbol: {symbol}")
+        # Tiers for all linear symbols come from one bulk request, refreshed in the background
         for retry in range(max_retries):
             try:
-                tiers = self.exchange.fetch_derivatives_market_leverage_tiers(symbol)
-                for tier in tiers:
-                    info = tier.get('info', {})
-                    if info.get('symbol') == symbol:
-                        return float(info.get('maxLeverage'))
-                return None  # If symbol not found in tiers
+                return self.leverage_tiers.get_max_leverage(symbol)
 
             except (RateLimitExceeded, NetworkError) as e:  # Include NetworkError
                 # Log the exception
@@ -2017,6 +2161,15 @@ class Exchange:
                 raise e
 
         raise Exception(f"Failed to get max leverage for {symbol} after {max_retries} retries.")
+
+    # Bybit
+    def get_leverage_tier_bybit(self, symbol, notional):
+        """
+        :param str symbol: exchange market id or unified symbol
+        :param float notional: position value in quote currency
+        :returns dict: risk limit tier covering the notional, None if unknown
+        """
+        return self.leverage_tiers.get_tier(symbol, notional)
         
     # Bitget 
     def get_max_leverage_bitget(self, symbol):
@@ -2510,6 +2663,11 @@ class Exchange:
             else:
                 logging.warning(f"side {side} does not exist")
                 return {"error": f"side {side} does not exist"}
+        except ccxt.InvalidOrder as e:
+            # Precision or lot size may have changed on the exchange side
+            self.market_cache.invalidate()
+            logging.warning(f"Invalid order in create_limit_order(): {e}")
+            return {"error": str(e)}
         except Exception as e:
             logging.warning(f"An unknown error occurred in create_limit_order(): {e}")
             return {"error": str(e)}
@@ -0,0 +1,288 @@
+import math
+from collections import deque
+
+NAN = float("nan")
+
+# Streaming indicators. Each one keeps just enough rolling state to produce
+# the next value in O(1) from a new candle:
+#   update(...) consumes a closed candle and returns the indicator value
+#   peek(...)   returns the value a candle would produce without consuming it,
+#               for the candle that is still forming
+# Values match the ta / pandas implementations the strategies and scrapers
+# used before (NaN until the same number of warm-up periods has been seen).
+
+class SMA:
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.updates = 0
+        self.value = NAN
+
+    def _next(self, x):
+        if len(self.values) == self.window:
+            return self.total - self.values[0] + x, self.window
+        return self.total + x, len(self.values) + 1
+
+    def peek(self, x):
+        total, n = self._next(x)
+        return total / n if n == self.window else NAN
+
+    def update(self, x):
+        total, n = self._next(x)
+        self.values.append(x)
+        self.updates += 1
+        # Recompute now and then so the running sum cannot drift
+        self.total = math.fsum(self.values) if self.updates % 1000 == 0 else total
+        self.value = total / n if n == self.window else NAN
+        return self.value
+
+class EMA:
+    """
+    pandas ewm(span=... or alpha=..., adjust=..., min_periods=...).mean()
+    """
+    def __init__(self, span=None, alpha=None, adjust=False, min_periods=0):
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.adjust = adjust
+        self.min_periods = min_periods
+        self.count = 0
+        self.mean = NAN
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.value = NAN
+
+    def _next(self, x):
+        decay = 1 - self.alpha
+        if self.adjust:
+            numerator = x + decay * self.numerator
+            denominator = 1 + decay * self.denominator
+            return numerator / denominator, numerator, denominator
+        if self.count == 0:
+            return x, 0.0, 0.0
+        return decay * self.mean + self.alpha * x, 0.0, 0.0
+
+    def peek(self, x):
+        mean, _, _ = self._next(x)
+        return mean if self.count + 1 >= self.min_periods else NAN
+
+    def update(self, x):
+        self.mean, self.numerator, self.denominator = self._next(x)
+        self.count += 1
+        self.value = self.mean if self.count >= self.min_periods else NAN
+        return self.value
+
+class RSI:
+    """
+    ta.momentum.rsi(close, window)
+    """
+    def __init__(self, window=14):
+        self.window = window
+        self.prev_close = None
+        self.up = EMA(alpha=1 / window, min_periods=window)
+        self.down = EMA(alpha=1 / window, min_periods=window)
+        self.value = NAN
+
+    def _moves(self, close):
+        diff = close - self.prev_close if self.prev_close is not None else 0.0
+        return (diff if diff > 0 else 0.0), (-diff if diff < 0 else 0.0)
+
+    def _rsi(self, up, down):
+        if math.isnan(down):
+            return NAN
+        if down == 0:
+            return 100.0
+        return 100 - (100 / (1 + up / down))
+
+    def peek(self, close):
+        up, down = self._moves(close)
+        return self._rsi(self.up.peek(up), self.down.peek(down))
+
+    def update(self, close):
+        up, down = self._moves(close)
+        self.prev_close = close
+        self.value = self._rsi(self.up.update(up), self.down.update(down))
+        return self.value
+
+class MFI:
+    """
+    ta.volume.MFIIndicator(high, low, close, volume, window).money_flow_index()
+    """
+    def __init__(self, window=14):
+        self.window = window
+        self.prev_typical_price = None
+        self.flows = deque(maxlen=window)
+        self.positive = 0.0
+        self.negative = 0.0
+        self.negative_count = 0
+        self.value = NAN
+
+    def _flow(self, high, low, close, volume):
+        typical_price = (high + low + close) / 3.0
+        direction = 0
+        if self.prev_typical_price is not None:
+            if typical_price > self.prev_typical_price:
+                direction = 1
+            elif typical_price < self.prev_typical_price:
+                direction = -1
+        return typical_price, typical_price * volume * direction
+
+    def _next(self, flow):
+        positive, negative, negative_count = self.positive, self.negative, self.negative_count
+        if len(self.flows) == self.window:
+            dropped = self.flows[0]
+            if dropped >= 0:
+                positive -= dropped
+            else:
+                negative += dropped
+                negative_count -= 1
+        if flow >= 0:
+            positive += flow
+        else:
+            negative -= flow
+            negative_count += 1
+        if negative_count == 0:
+            negative = 0.0
+        return positive, negative, negative_count
+
+    def _mfi(self, positive, negative, n):
+        if n < self.window:
+            return NAN
+        if negative == 0:
+            return 100.0 if positive > 0 else NAN
+        return 100 - (100 / (1 + positive / negative))
+
+    def peek(self, high, low, close, volume):
+        _, flow = self._flow(high, low, close, volume)
+        positive, negative, _ = self._next(flow)
+        return self._mfi(positive, negative, min(len(self.flows) + 1, self.window))
+
+    def update(self, high, low, close, volume):
+        self.prev_typical_price, flow = self._flow(high, low, close, volume)
+        self.positive, self.negative, self.negative_count = self._next(flow)
+        self.flows.append(flow)
+        self.value = self._mfi(self.positive, self.negative, len(self.flows))
+        return self.value
+
+class ATR:
+    """
+    Rolling mean of the true range, as computed by the scrapers
+    """
+    def __init__(self, window=14):
+        self.prev_close = None
+        self.sma = SMA(window)
+        self.value = NAN
+
+    def _true_range(self, high, low):
+        if self.prev_close is None:
+            return abs(high - low)
+        return max(abs(high - low), abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def peek(self, high, low, close):
+        return self.sma.peek(self._true_range(high, low))
+
+    def update(self, high, low, close):
+        self.value = self.sma.update(self._true_range(high, low))
+        self.prev_close = close
+        return self.value
+
+class Bollinger:
+    """
+    ta.volatility.BollingerBands(close, window, window_dev), returns (mavg, hband, lband)
+    """
+    def __init__(self, window=20, window_dev=2):
+        self.window = window
+        self.window_dev = window_dev
+        self.mean = SMA(window)
+        self.squares = SMA(window)
+        self.value = (NAN, NAN, NAN)
+
+    def _bands(self, mavg, mean_square):
+        if math.isnan(mavg):
+            return (NAN, NAN, NAN)
+        std = math.sqrt(max(mean_square - mavg * mavg, 0.0))
+        return (mavg, mavg + self.window_dev * std, mavg - self.window_dev * std)
+
+    def peek(self, close):
+        return self._bands(self.mean.peek(close), self.squares.peek(close * close))
+
+    def update(self, close):
+        self.value = self._bands(self.mean.update(close), self.squares.update(close * close))
+        return self.value
+
+class ERI:
+    """
+    Elder Ray bull/bear power smoothed with an EMA, returns (bull, bear, trend)
+    """
+    def __init__(self, slow_span=64, power_span=13):
+        self.slow = EMA(span=slow_span)
+        self.bull = EMA(span=power_span)
+        self.bear = EMA(span=power_span)
+        self.value = (NAN, NAN, None)
+
+    def _trend(self, close, slow):
+        return "bullish" if close > slow else "bearish"
+
+    def peek(self, high, low, close):
+        slow = self.slow.peek(close)
+        return (self.bull.peek(high - slow), self.bear.peek(low - slow), self._trend(close, slow))
+
+    def update(self, high, low, close):
+        slow = self.slow.update(close)
+        self.value = (self.bull.update(high - slow), self.bear.update(low - slow), self._trend(close, slow))
+        return self.value
+
+def run(indicator, *columns):
+    """
+    Feed whole columns through a fresh indicator.
+
+    :returns list: one indicator value per row
+    """
+    return [indicator.update(*row) for row in zip(*columns)]
+
+class MFIRSIStream:
+    """
+    MFI(14), RSI(14) and SMA(14) over one symbol's candles, with the buy and
+    sell conditions used by Strategy.initialize_MFIRSI().
+    Closed candles are consumed once; the forming candle is only peeked.
+    """
+    def __init__(self, window=14):
+        self.mfi = MFI(window)
+        self.rsi = RSI(window)
+        self.ma = SMA(window)
+        self.last_timestamp = None
+        self.history = {}
+
+    def row(self, open_, close, mfi, rsi, ma):
+        open_less_close = int(open_ < close)
+        return {
+            "mfi": mfi,
+            "rsi": rsi,
+            "ma": ma,
+            "open_less_close": open_less_close,
+            "buy_condition": int(mfi < 20 and rsi < 35 and open_less_close == 1),
+            "sell_condition": int(mfi > 80 and rsi > 65 and open_less_close == 0),
+        }
+
+    def update(self, bars):
+        """
+        :param bars: rows of [time, open, high, low, close, volume], oldest
+            first, the last row being the candle that is still forming
+        :returns dict: indicator values and conditions for the last row
+        """
+        for timestamp, open_, high, low, close, volume in bars[:-1]:
+            if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+                continue
+            self.history[timestamp] = self.row(
+                open_, close,
+                self.mfi.update(high, low, close, volume),
+                self.rsi.update(close),
+                self.ma.update(close),
+            )
+            self.last_timestamp = timestamp
+        # Forget rows that dropped out of the candle window
+        while len(self.history) > len(bars):
+            del self.history[next(iter(self.history))]
+
+        timestamp, open_, high, low, close, volume = bars[-1]
+        last = self.row(open_, close, self.mfi.peek(high, low, close, volume), self.rsi.peek(close), self.ma.peek(close))
+        return last
@@ -0,0 +1,109 @@
+import time
+import threading
+from bisect import bisect_left
+from .strategies.logger import Logger
+
+logging = Logger(logger_name="LeverageTiers", filename="LeverageTiers.log", stream=True)
+
+class LeverageTierCache:
+    """
+    Risk limit tiers for every Bybit linear symbol, loaded with the bulk
+    /v5/market/risk-limit endpoint (one paginated request for the whole
+    category) and refreshed by a background thread.
+
+    Tiers are kept per market id in ascending riskLimitValue order, so the
+    max leverage lookup is a dict access and the tier for a notional is a
+    bisect over the handful of tiers of one symbol.
+    """
+    def __init__(self, exchange, category="linear", refresh_interval=3600):
+        self.exchange = exchange
+        self.category = category
+        self.refresh_interval = refresh_interval
+        self.tiers = {}
+        self.limits = {}
+        self.max_leverage = {}
+        self.last_refresh = 0.0
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._refresh_forever, daemon=True)
+            self.thread.start()
+
+    def _refresh_forever(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.info(f"Failed to refresh leverage tiers, keeping tiers from {time.time() - self.last_refresh:.0f}s ago: {e}")
+
+    def refresh(self):
+        tiers = {}
+        cursor = None
+        while True:
+            params = {"category": self.category}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.exchange.publicGetV5MarketRiskLimit(params)
+            result = response.get("result") or {}
+            for tier in result.get("list") or []:
+                tiers.setdefault(tier["symbol"], []).append({
+                    "id": int(tier["id"]),
+                    "risk_limit_value": float(tier["riskLimitValue"]),
+                    "maintenance_margin": float(tier["maintenanceMargin"]),
+                    "initial_margin": float(tier["initialMargin"]),
+                    "max_leverage": float(tier["maxLeverage"]),
+                })
+            cursor = result.get("nextPageCursor")
+            if not cursor:
+                break
+
+        for symbol_tiers in tiers.values():
+            symbol_tiers.sort(key=lambda t: t["risk_limit_value"])
+
+        # Swap the new tables in one go so readers never see a partial load
+        self.tiers = tiers
+        self.limits = {symbol: [t["risk_limit_value"] for t in symbol_tiers] for symbol, symbol_tiers in tiers.items()}
+        self.max_leverage = {symbol: max(t["max_leverage"] for t in symbol_tiers) for symbol, symbol_tiers in tiers.items()}
+        self.last_refresh = time.time()
+        logging.info(f"Loaded leverage tiers for {len(tiers)} {self.category} symbols")
+
+    def ensure_loaded(self):
+        if not self.tiers:
+            with self.lock:
+                if not self.tiers:
+                    self.refresh()
+        self.start()
+
+    def market_id(self, symbol):
+        try:
+            return self.exchange.market(symbol)["id"]
+        except Exception:
+            return symbol
+
+    def get_max_leverage(self, symbol):
+        """
+        :param str symbol: exchange market id or unified symbol
+        :returns float: highest leverage of the symbol's lowest risk tier, None if unknown
+        """
+        self.ensure_loaded()
+        return self.max_leverage.get(self.market_id(symbol))
+
+    def get_tier(self, symbol, notional):
+        """
+        :param str symbol: exchange market id or unified symbol
+        :param float notional: position value in quote currency
+        :returns dict: the smallest tier whose risk limit covers the notional,
+            the last tier when the notional exceeds them all, None if unknown
+        """
+        self.ensure_loaded()
+        market_id = self.market_id(symbol)
+        symbol_tiers = self.tiers.get(market_id)
+        if not symbol_tiers:
+            return None
+        i = bisect_left(self.limits[market_id], notional)
+        return symbol_tiers[min(i, len(symbol_tiers) - 1)]
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from .strategies.logger import Logger
+
+logging = Logger(logger_name="MarketCache", filename="MarketCache.log", stream=True)
+
+class MarketSpecCache:
+    """
+    Symbol specification cache (precision, tick size, min qty, qty step,
+    contract size, max leverage) for one ccxt client.
+
+    Markets are loaded once, mirrored to disk so a restart can skip
+    load_markets(), and reloaded when older than ttl_seconds or after
+    invalidate() is called because the exchange rejected an order.
+    """
+    def __init__(self, exchange, path=None, ttl_seconds=3600):
+        self.exchange = exchange
+        self.path = Path(path) if path is not None else Path("data", f"markets_{exchange.id}.json")
+        self.ttl_seconds = ttl_seconds
+        self.specs = {}
+        self.last_refresh = 0.0
+        self.lock = threading.RLock()
+
+    def load(self):
+        """
+        Load markets into the ccxt client, from disk when the snapshot is
+        still fresh and from the exchange otherwise.
+
+        :returns list: unified symbols of all loaded markets
+        """
+        with self.lock:
+            if not self.load_from_disk():
+                self.refresh()
+            return list(self.exchange.markets.keys())
+
+    def is_stale(self):
+        return time.time() - self.last_refresh > self.ttl_seconds
+
+    def invalidate(self):
+        with self.lock:
+            self.last_refresh = 0.0
+
+    def get(self, symbol):
+        """
+        :param str symbol: unified symbol or exchange market id
+        :returns dict: cached spec for the symbol
+        """
+        with self.lock:
+            if self.is_stale() or not self.exchange.markets:
+                self.refresh()
+            market = self.exchange.market(symbol)
+            spec = self.specs.get(market["symbol"])
+            if spec is None:
+                spec = self.build_spec(market)
+                self.specs[market["symbol"]] = spec
+            return spec
+
+    def refresh(self):
+        try:
+            markets = self.exchange.load_markets(reload=True)
+        except Exception as e:
+            if not self.exchange.markets:
+                raise e
+            # Keep serving the previous specs and retry in a minute
+            logging.info(f"Failed to refresh markets, serving cached specs: {e}")
+            self.last_refresh = time.time() - self.ttl_seconds + 60
+            return
+
+        specs = {symbol: self.build_spec(market) for symbol, market in markets.items()}
+        changed = [symbol for symbol, spec in specs.items() if symbol in self.specs and self.specs[symbol] != spec]
+        if changed:
+            logging.info(f"Market specs changed for: {changed}")
+
+        self.specs = specs
+        self.last_refresh = time.time()
+        self.save_to_disk()
+
+    def build_spec(self, market):
+        info = market.get("info") or {}
+        precision = market.get("precision") or {}
+        limits = market.get("limits") or {}
+
+        tick_size = (info.get("priceFilter") or {}).get("tickSize")
+        qty_step = (info.get("lotSizeFilter") or {}).get("qtyStep")
+        max_leverage = (info.get("leverageFilter") or {}).get("maxLeverage")
+
+        # Binance exposes the same values through its filters list
+        for f in info.get("filters") or []:
+            if f.get("filterType") == "PRICE_FILTER":
+                tick_size = f.get("tickSize")
+            elif f.get("filterType") == "LOT_SIZE":
+                qty_step = f.get("stepSize")
+
+        if max_leverage is None:
+            max_leverage = (limits.get("leverage") or {}).get("max")
+
+        return {
+            "symbol": market["symbol"],
+            "id": market["id"],
+            "precision": precision.get("price"),
+            "amount_precision": precision.get("amount"),
+            "tick_size": float(tick_size if tick_size is not None else precision.get("price") or 0),
+            "min_qty": (limits.get("amount") or {}).get("min"),
+            "qty_step": float(qty_step if qty_step is not None else precision.get("amount") or 0),
+            "contract_size": market.get("contractSize"),
+            "max_leverage": float(max_leverage or 0),
+        }
+
+    def load_from_disk(self):
+        if not self.path.is_file():
+            return False
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+            if time.time() - snapshot["timestamp"] > self.ttl_seconds:
+                return False
+            self.exchange.set_markets(snapshot["markets"])
+            self.specs = {symbol: self.build_spec(market) for symbol, market in self.exchange.markets.items()}
+            self.last_refresh = snapshot["timestamp"]
+            logging.info(f"Loaded {len(self.specs)} markets from {self.path}")
+            return True
+        except Exception as e:
+            logging.info(f"Ignoring unreadable market cache {self.path}: {e}")
+            return False
+
+    def save_to_disk(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"timestamp": self.last_refresh, "markets": self.exchange.markets}, f, default=str)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.info(f"Failed to write market cache {self.path}: {e}")
@@ -0,0 +1,238 @@
+import json
+import time
+import asyncio
+import threading
+from bisect import bisect_left
+import aiohttp
+from .strategies.logger import Logger
+
+logging = Logger(logger_name="OrderBook", filename="OrderBook.log", stream=True)
+
+BYBIT_PUBLIC_LINEAR_WS = "wss://stream.bybit.com/v5/public/linear"
+
+class LocalOrderBook:
+    """
+    L2 book for one symbol kept as two sorted price arrays with parallel
+    size arrays. Both sides are stored in ascending price order, so the best
+    ask is the first element and the best bid the last one.
+    """
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bid_prices = []
+        self.bid_sizes = []
+        self.ask_prices = []
+        self.ask_sizes = []
+        self.update_id = 0
+        self.last_update = 0.0
+        self.lock = threading.Lock()
+
+    def apply_snapshot(self, bids, asks, update_id=0):
+        with self.lock:
+            bids = sorted((float(p), float(q)) for p, q in bids if float(q) > 0)
+            asks = sorted((float(p), float(q)) for p, q in asks if float(q) > 0)
+            self.bid_prices = [p for p, q in bids]
+            self.bid_sizes = [q for p, q in bids]
+            self.ask_prices = [p for p, q in asks]
+            self.ask_sizes = [q for p, q in asks]
+            self.update_id = update_id
+            self.last_update = time.time()
+
+    def apply_delta(self, bids, asks, update_id=0):
+        with self.lock:
+            for price, size in bids:
+                self._set_level(self.bid_prices, self.bid_sizes, float(price), float(size))
+            for price, size in asks:
+                self._set_level(self.ask_prices, self.ask_sizes, float(price), float(size))
+            self.update_id = update_id
+            self.last_update = time.time()
+
+    def reset(self):
+        """
+        Drop the book until the next snapshot, deltas are ignored meanwhile.
+        """
+        with self.lock:
+            self.bid_prices, self.bid_sizes = [], []
+            self.ask_prices, self.ask_sizes = [], []
+            self.update_id = 0
+            self.last_update = 0.0
+
+    def _set_level(self, prices, sizes, price, size):
+        i = bisect_left(prices, price)
+        exists = i < len(prices) and prices[i] == price
+        if size == 0:
+            if exists:
+                del prices[i]
+                del sizes[i]
+        elif exists:
+            sizes[i] = size
+        else:
+            prices.insert(i, price)
+            sizes.insert(i, size)
+
+    def best_bid(self):
+        with self.lock:
+            return self.bid_prices[-1] if self.bid_prices else None
+
+    def best_ask(self):
+        with self.lock:
+            return self.ask_prices[0] if self.ask_prices else None
+
+    def depth(self, levels=None):
+        """
+        :param int levels: number of levels per side, all levels when None
+        :returns dict: {"bids": [[price, size], ...], "asks": [[price, size], ...]}
+            best price first, the same layout as ccxt fetch_order_book()
+        """
+        with self.lock:
+            n_bids = len(self.bid_prices) if levels is None else min(levels, len(self.bid_prices))
+            n_asks = len(self.ask_prices) if levels is None else min(levels, len(self.ask_prices))
+            bids = [[self.bid_prices[-1 - i], self.bid_sizes[-1 - i]] for i in range(n_bids)]
+            asks = [[self.ask_prices[i], self.ask_sizes[i]] for i in range(n_asks)]
+            return {"bids": bids, "asks": asks}
+
+    def cumulative_volume(self, side, levels=None, price_limit=None):
+        """
+        Total size on one side of the book, optionally limited to the best
+        `levels` levels or to prices at least as good as `price_limit`.
+        """
+        with self.lock:
+            if side == "bids":
+                prices, sizes = self.bid_prices[::-1], self.bid_sizes[::-1]
+            else:
+                prices, sizes = self.ask_prices, self.ask_sizes
+            total = 0.0
+            for i, price in enumerate(prices):
+                if levels is not None and i >= levels:
+                    break
+                if price_limit is not None and ((side == "bids" and price < price_limit) or (side == "asks" and price > price_limit)):
+                    break
+                total += sizes[i]
+            return total
+
+class OrderBookStream:
+    """
+    Keeps a LocalOrderBook per market id in sync with a Bybit v5 style
+    snapshot-plus-delta websocket feed. The feed runs in its own thread with
+    its own event loop; any server speaking the same protocol (for example a
+    local stand-in) can be used through `url`.
+    """
+    def __init__(self, url=BYBIT_PUBLIC_LINEAR_WS, depth=50, max_age=10, ping_interval=20):
+        self.url = url
+        self.depth = depth
+        self.max_age = max_age
+        self.ping_interval = ping_interval
+        self.books = {}
+        self.subscriptions = set()
+        self.loop = None
+        self.ws = None
+        self.thread = None
+        self.running = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.loop is not None and self.ws is not None:
+            asyncio.run_coroutine_threadsafe(self.ws.close(), self.loop)
+
+    def subscribe(self, market_id):
+        with self.lock:
+            if market_id in self.subscriptions:
+                return
+            self.subscriptions.add(market_id)
+            self.books[market_id] = LocalOrderBook(market_id)
+        self.start()
+        if self.loop is not None and self.ws is not None:
+            asyncio.run_coroutine_threadsafe(self._send_subscribe([market_id]), self.loop)
+
+    def get_book(self, market_id):
+        """
+        :returns LocalOrderBook: the synced book, or None when the symbol is
+            not subscribed yet or no update arrived within max_age seconds
+        """
+        book = self.books.get(market_id)
+        if book is None or time.time() - book.last_update > self.max_age:
+            return None
+        return book
+
+    def topic(self, market_id):
+        return f"orderbook.{self.depth}.{market_id}"
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._connect_forever())
+
+    async def _connect_forever(self):
+        delay = 1
+        while self.running:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(self.url, heartbeat=None) as ws:
+                        self.ws = ws
+                        delay = 1
+                        logging.info(f"Order book stream connected to {self.url}")
+                        with self.lock:
+                            market_ids = list(self.subscriptions)
+                        await self._send_subscribe(market_ids)
+                        pinger = asyncio.ensure_future(self._ping(ws))
+                        try:
+                            async for msg in ws:
+                                if msg.type == aiohttp.WSMsgType.TEXT:
+                                    self.handle_message(json.loads(msg.data))
+                                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                        finally:
+                            pinger.cancel()
+                            self.ws = None
+            except Exception as e:
+                logging.info(f"Order book stream error: {e}, reconnecting in {delay} seconds...")
+            if self.running:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def _send_subscribe(self, market_ids):
+        if self.ws is None or not market_ids:
+            return
+        await self.ws.send_json({"op": "subscribe", "args": [self.topic(market_id) for market_id in market_ids]})
+
+    async def _resubscribe(self, market_id):
+        # Bybit answers a new subscription with a fresh snapshot
+        if self.ws is None:
+            return
+        await self.ws.send_json({"op": "unsubscribe", "args": [self.topic(market_id)]})
+        await self._send_subscribe([market_id])
+
+    async def _ping(self, ws):
+        while not ws.closed:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send_json({"op": "ping"})
+
+    def handle_message(self, message):
+        topic = message.get("topic", "")
+        if not topic.startswith("orderbook."):
+            return
+        data = message.get("data") or {}
+        book = self.books.get(data.get("s"))
+        if book is None:
+            return
+        update_id = int(data.get("u", 0))
+        # u == 1 means the exchange restarted its book, treat it as a snapshot
+        if message.get("type") == "snapshot" or update_id == 1:
+            book.apply_snapshot(data.get("b", []), data.get("a", []), update_id)
+        elif book.last_update > 0:
+            if update_id != book.update_id + 1:
+                # A delta went missing, the book can no longer be trusted
+                logging.info(f"Order book {book.symbol} skipped from update {book.update_id} to {update_id}, resubscribing")
+                book.reset()
+                if self.loop is not None:
+                    asyncio.run_coroutine_threadsafe(self._resubscribe(book.symbol), self.loop)
+                return
+            book.apply_delta(data.get("b", []), data.get("a", []), update_id)
@@ -0,0 +1,128 @@
+import time
+import copy
+import threading
+from .strategies.logger import Logger
+
+logging = Logger(logger_name="Positions", filename="Positions.log", stream=True)
+
+def empty_position_values():
+    values = {}
+    for side in ("long", "short"):
+        values[side] = {
+            "qty": 0.0,
+            "price": 0.0,
+            "realised": 0,
+            "cum_realised": 0,
+            "upnl": 0,
+            "upnl_pct": 0,
+            "liq_price": 0,
+            "entry_price": 0,
+        }
+    return values
+
+class PositionService:
+    """
+    Account-wide position snapshot shared by every symbol worker.
+
+    One fetch_positions() call per refresh_interval covers the whole
+    account; the result is parsed once into the per-symbol long/short
+    structure returned by Exchange.get_positions_bybit().
+    """
+    def __init__(self, exchange, refresh_interval=5, retry_interval=1):
+        self.exchange = exchange
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.positions = {}
+        self.open_positions = []
+        self.last_refresh = 0.0
+        self.last_failure = 0.0
+        self.last_error = None
+        # invalidate() bumps the generation, a snapshot is only fresh when
+        # its fetch started after the last invalidation
+        self.generation = 0
+        self.snapshot_generation = 0
+        self.lock = threading.Lock()
+
+    def is_stale(self):
+        return self.snapshot_generation != self.generation or time.time() - self.last_refresh > self.refresh_interval
+
+    def invalidate(self):
+        self.generation += 1
+
+    def refresh(self):
+        # Only one thread fetches, the others wait for its result
+        with self.lock:
+            if not self.is_stale():
+                return
+            if time.time() - self.last_failure < self.retry_interval:
+                # The fetch just failed, callers queued behind it do not retry one by one
+                if self.last_refresh == 0.0:
+                    raise self.last_error
+                return
+            generation = self.generation
+            try:
+                data = self.exchange.fetch_positions()
+            except Exception as e:
+                self.last_failure = time.time()
+                self.last_error = e
+                if self.last_refresh == 0.0:
+                    raise e
+                logging.info(f"Failed to refresh positions, serving snapshot from {time.time() - self.last_refresh:.1f}s ago: {e}")
+                return
+            self.positions, self.open_positions = self.parse_positions(data)
+            self.last_refresh = time.time()
+            self.snapshot_generation = generation
+
+    def parse_positions(self, data):
+        positions = {}
+        open_positions = []
+        for position in data:
+            side = self.position_side(position)
+            if side is None:
+                continue
+            values = positions.setdefault(position["symbol"], empty_position_values())
+            info = position.get("info") or {}
+            values[side]["qty"] = float(position["contracts"] or 0)
+            values[side]["price"] = float(position["entryPrice"] or 0)
+            values[side]["realised"] = round(float(info.get("unrealisedPnl") or 0), 4)
+            values[side]["cum_realised"] = round(float(info.get("cumRealisedPnl") or 0), 4)
+            values[side]["upnl"] = round(float(info.get("unrealisedPnl") or 0), 4)
+            values[side]["upnl_pct"] = round(float(position["percentage"] or 0), 4)
+            values[side]["liq_price"] = float(position["liquidationPrice"] or 0)
+            values[side]["entry_price"] = float(position["entryPrice"] or 0)
+            if values[side]["qty"] != 0:
+                open_positions.append(position)
+        return positions, open_positions
+
+    def position_side(self, position):
+        if position.get("side") in ("long", "short"):
+            return position["side"]
+        info = position.get("info") or {}
+        position_idx = str(info.get("positionIdx", ""))
+        if position_idx == "1":
+            return "long"
+        if position_idx == "2":
+            return "short"
+        if info.get("side") == "Buy":
+            return "long"
+        if info.get("side") == "Sell":
+            return "short"
+        return None
+
+    def get(self, symbol):
+        """
+        :param str symbol: unified symbol or exchange market id
+        :returns dict: long/short position values, zeros when flat
+        """
+        if self.is_stale():
+            self.refresh()
+        unified_symbol = self.exchange.market(symbol)["symbol"]
+        values = self.positions.get(unified_symbol)
+        if values is None:
+            return empty_position_values()
+        return copy.deepcopy(values)
+
+    def get_open_positions(self):
+        if self.is_stale():
+            self.refresh()
+        return list(self.open_positions)
@@ -3,6 +3,7 @@ import math
 import logging
 from threading import Thread
 from ...strategy import Strategy
+from ...tick_context import TickContext
 from datetime import datetime, timedelta
 from typing import Tuple
 from rich.console import Console
@@ -268,8 +269,11 @@ class BybitAutoRotator(Strategy):
 
         with live:
             while True:
+                # Every exchange and API read below is fetched at most once per iteration
+                ctx = TickContext(self.exchange, self.manager, symbol, quote_currency)
+
                 # Get API data
-                data = self.manager.get_data()
+                data = ctx.quant_data()
                 one_minute_volume = self.manager.get_asset_value(symbol, data, "1mVol")
                 one_hour_volume = self.manager.get_asset_value(symbol, data, "1hVol")
                 one_minute_distance = self.manager.get_asset_value(symbol, data, "1mSpread")
@@ -290,7 +294,7 @@ class BybitAutoRotator(Strategy):
 
                 for i in range(max_retries):
                     try:
-                        total_equity = self.exchange.get_balance_bybit(quote_currency)
+                        total_equity = ctx.total_equity()
                         break
                     except Exception as e:
                         if i < max_retries - 1:
@@ -303,7 +307,7 @@ class BybitAutoRotator(Strategy):
 
                 for i in range(max_retries):
                     try:
-                        available_equity = self.exchange.get_available_balance_bybit(quote_currency)
+                        available_equity = ctx.available_equity()
                         break
                     except Exception as e:
                         if i < max_retries - 1:
@@ -314,16 +318,18 @@ class BybitAutoRotator(Strategy):
 
                 #logging.info(f"Available equity: {available_equity}")
 
-                current_price = self.exchange.get_current_price(symbol)
-                market_data = self.get_market_data_with_retry(symbol, max_retries = 5, retry_delay = 5)
+                current_price = ctx.current_price()
+                market_data = self.get_market_data_with_retry(symbol, max_retries = 5, retry_delay = 5, ctx=ctx)
                 #contract_size = self.exchange.get_contract_size_bybit(symbol)
-                best_ask_price = self.exchange.get_orderbook(symbol)['asks'][0][0]
-                best_bid_price = self.exchange.get_orderbook(symbol)['bids'][0][0]
+                best_ask_price = ctx.best_ask()
+                best_bid_price = ctx.best_bid()
 
                 if self.max_long_trade_qty is None or self.max_short_trade_qty is None:
-                    self.max_long_trade_qty = self.max_short_trade_qty = self.calc_max_trade_qty(total_equity,
+                    self.max_long_trade_qty = self.max_short_trade_qty = self.calc_max_trade_qty(symbol,
+                                                                                                total_equity,
                                                                                                 best_ask_price,
-                                                                                                max_leverage)
+                                                                                                max_leverage,
+                                                                                                ctx=ctx)
 
                     # Set initial quantities if they're None
                     if self.initial_max_long_trade_qty is None:
@@ -377,16 +383,16 @@ class BybitAutoRotator(Strategy):
 
                 # Get the 1-minute moving averages
                 logging.info(f"Fetching MA data")
-                m_moving_averages = self.manager.get_1m_moving_averages(symbol)
-                m5_moving_averages = self.manager.get_5m_moving_averages(symbol)
+                m_moving_averages = ctx.moving_averages_1m()
+                m5_moving_averages = ctx.moving_averages_5m()
                 ma_6_high = m_moving_averages["MA_6_H"]
                 ma_6_low = m_moving_averages["MA_6_L"]
                 ma_3_low = m_moving_averages["MA_3_L"]
                 ma_3_high = m_moving_averages["MA_3_H"]
-                ma_1m_3_high = self.manager.get_1m_moving_averages(symbol)["MA_3_H"]
-                ma_5m_3_high = self.manager.get_5m_moving_averages(symbol)["MA_3_H"]
+                ma_1m_3_high = m_moving_averages["MA_3_H"]
+                ma_5m_3_high = m5_moving_averages["MA_3_H"]
 
-                position_data = self.exchange.get_positions_bybit(symbol)
+                position_data = ctx.positions()
 
                 short_pos_qty = position_data["short"]["qty"]
                 long_pos_qty = position_data["long"]["qty"]
@@ -395,8 +401,8 @@ class BybitAutoRotator(Strategy):
                 short_liq_price = position_data["short"]["liq_price"]
                 long_liq_price = position_data["long"]["liq_price"]
 
-                self.bybit_reset_position_leverage_long(long_pos_qty, total_equity, best_ask_price, max_leverage)
-                self.bybit_reset_position_leverage_short(short_pos_qty, total_equity, best_ask_price, max_leverage)
+                self.bybit_reset_position_leverage_long(symbol, long_pos_qty, total_equity, best_ask_price, max_leverage)
+                self.bybit_reset_position_leverage_short(symbol, short_pos_qty, total_equity, best_ask_price, max_leverage)
 
                 short_upnl = position_data["short"]["upnl"]
                 long_upnl = position_data["long"]["upnl"]
@@ -411,12 +417,12 @@ class BybitAutoRotator(Strategy):
                 long_take_profit = None
 
                 if five_minute_distance != previous_five_minute_distance:
-                    short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance)
-                    long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance)
+                    short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance, ctx=ctx)
+                    long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance, ctx=ctx)
                 else:
                     if short_take_profit is None or long_take_profit is None:
-                        short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance)
-                        long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance)
+                        short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance, ctx=ctx)
+                        long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance, ctx=ctx)
                         
                 previous_five_minute_distance = five_minute_distance
 
@@ -525,7 +531,7 @@ class BybitAutoRotator(Strategy):
                 #     eri_trend,
                 # ))
 
-                open_orders = self.exchange.get_open_orders(symbol)
+                open_orders = ctx.open_orders()
 
                 # Entry logic
                 self.bybit_hedge_entry_maker_mfirsitrend(symbol, data, min_vol, min_dist, one_minute_volume, five_minute_distance, 
@@ -5,6 +5,7 @@ import os
 import copy
 from threading import Thread, Lock
 from ...strategy import Strategy
+from ...tick_context import TickContext
 from datetime import datetime, timedelta
 from typing import Tuple
 import pandas as pd
@@ -119,8 +120,11 @@ class BybitSpoofRotator(Strategy):
                 if should_exit:
                     break
 
+                # Every exchange and API read below is fetched at most once per iteration
+                ctx = TickContext(self.exchange, self.manager, symbol, quote_currency)
+
                 # Get API data
-                api_data = self.manager.get_api_data(symbol)
+                api_data = ctx.api_data()
                 one_minute_volume = api_data['1mVol']
                 one_minute_distance = api_data['1mSpread']
                 five_minute_distance = api_data['5mSpread']
@@ -138,7 +142,7 @@ class BybitSpoofRotator(Strategy):
 
                 for i in range(max_retries):
                     try:
-                        total_equity = self.exchange.get_balance_bybit(quote_currency)
+                        total_equity = ctx.total_equity()
                         break
                     except Exception as e:
                         if i < max_retries - 1:
@@ -151,7 +155,7 @@ class BybitSpoofRotator(Strategy):
 
                 for i in range(max_retries):
                     try:
-                        available_equity = self.exchange.get_available_balance_bybit(quote_currency)
+                        available_equity = ctx.available_equity()
                         break
                     except Exception as e:
                         if i < max_retries - 1:
@@ -162,11 +166,11 @@ class BybitSpoofRotator(Strategy):
 
                 #logging.info(f"Available equity: {available_equity}")
 
-                current_price = self.exchange.get_current_price(symbol)
-                market_data = self.get_market_data_with_retry(symbol, max_retries = 5, retry_delay = 5)
+                current_price = ctx.current_price()
+                market_data = self.get_market_data_with_retry(symbol, max_retries = 5, retry_delay = 5, ctx=ctx)
                 #contract_size = self.exchange.get_contract_size_bybit(symbol)
-                best_ask_price = self.exchange.get_orderbook(symbol)['asks'][0][0]
-                best_bid_price = self.exchange.get_orderbook(symbol)['bids'][0][0]
+                best_ask_price = ctx.best_ask()
+                best_bid_price = ctx.best_bid()
 
                 long_dynamic_amount, short_dynamic_amount, min_qty = self.calculate_dynamic_amount(
                     symbol, market_data, total_equity, best_ask_price, max_leverage
@@ -178,7 +182,7 @@ class BybitSpoofRotator(Strategy):
                 # Get moving averages
                 logging.info(f"Fetching MA data")
 
-                moving_averages = self.get_all_moving_averages(symbol)
+                moving_averages = self.get_all_moving_averages(symbol, ctx=ctx)
 
                 ma_6_high = moving_averages["ma_6_high"]
                 ma_6_low = moving_averages["ma_6_low"]
@@ -188,7 +192,7 @@ class BybitSpoofRotator(Strategy):
                 ma_5m_3_high = moving_averages["ma_5m_3_high"]
 
                 logging.info(f"Fetching position data")
-                position_data = self.exchange.get_positions_bybit(symbol)
+                position_data = ctx.positions()
 
                 open_position_data = self.exchange.get_all_open_positions_bybit()
 
@@ -254,12 +258,12 @@ class BybitSpoofRotator(Strategy):
                 #         long_take_profit = self.calculate_long_take_profit_spread_bybit_fees(long_pos_price, long_pos_qty, symbol, five_minute_distance)
                         
                 if five_minute_distance != previous_five_minute_distance:
-                    short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance)
-                    long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance)
+                    short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance, ctx=ctx)
+                    long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance, ctx=ctx)
                 else:
                     if short_take_profit is None or long_take_profit is None:
-                        short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance)
-                        long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance)
+                        short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, five_minute_distance, ctx=ctx)
+                        long_take_profit = self.calculate_long_take_profit_spread_bybit(long_pos_price, symbol, five_minute_distance, ctx=ctx)
                         
                 # if one_minute_distance != previous_one_minute_distance:
                 #     short_take_profit = self.calculate_short_take_profit_spread_bybit(short_pos_price, symbol, one_minute_distance)
@@ -324,7 +328,7 @@ class BybitSpoofRotator(Strategy):
                     self.update_shared_data(symbol_data, open_position_data, len(open_symbols))
 
                 #open_orders = self.exchange.get_open_orders(symbol)
-                open_orders = self.retry_api_call(self.exchange.get_open_orders, symbol)
+                open_orders = self.retry_api_call(ctx.open_orders)
 
                 # Check if the symbol is already being traded
                 if symbol in open_symbols:
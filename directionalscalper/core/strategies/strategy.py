@@ -3,12 +3,13 @@ from decimal import Decimal, InvalidOperation, ROUND_HALF_UP, ROUND_DOWN
 import time
 import math
 import numpy
-import ta as ta
+import pandas as pd
 import os
 import uuid
 import logging
 import json
 from .logger import Logger
+from ..indicators import MFIRSIStream
 from datetime import datetime, timedelta
 
 logging = Logger(logger_name="Strategy", filename="Strategy.log", stream=True)
@@ -27,6 +28,7 @@ class Strategy:
         self.symbols_allowed = symbols_allowed
         self.printed_trade_quantities = False
         self.last_mfirsi_signal = None
+        self.mfirsi_streams = {}
         self.TAKER_FEE_RATE = Decimal("0.00055")  # 0.055%
         self.taker_fee_rate = 0.055 / 100
         self.max_long_trade_qty = None
@@ -283,17 +285,21 @@ class Strategy:
 
     #     return long_dynamic_amount, short_dynamic_amount, min_qty
 
-    def get_all_moving_averages(self, symbol, max_retries=3, delay=5):
+    def get_all_moving_averages(self, symbol, max_retries=3, delay=5, ctx=None):
         for _ in range(max_retries):
-            m_moving_averages = self.manager.get_1m_moving_averages(symbol)
-            m5_moving_averages = self.manager.get_5m_moving_averages(symbol)
+            if ctx is not None:
+                m_moving_averages = ctx.moving_averages_1m()
+                m5_moving_averages = ctx.moving_averages_5m()
+            else:
+                m_moving_averages = self.manager.get_1m_moving_averages(symbol)
+                m5_moving_averages = self.manager.get_5m_moving_averages(symbol)
 
             ma_6_high = m_moving_averages["MA_6_H"]
             ma_6_low = m_moving_averages["MA_6_L"]
             ma_3_low = m_moving_averages["MA_3_L"]
             ma_3_high = m_moving_averages["MA_3_H"]
-            ma_1m_3_high = self.manager.get_1m_moving_averages(symbol)["MA_3_H"]
-            ma_5m_3_high = self.manager.get_5m_moving_averages(symbol)["MA_3_H"]
+            ma_1m_3_high = m_moving_averages["MA_3_H"]
+            ma_5m_3_high = m5_moving_averages["MA_3_H"]
 
             # Check if the data is correct
             if all(isinstance(value, (float, int, numpy.number)) for value in [ma_6_high, ma_6_low, ma_3_low, ma_3_high, ma_1m_3_high, ma_5m_3_high]):
@@ -308,6 +314,9 @@ class Strategy:
 
             # If the data is not correct, wait for a short delay
             time.sleep(delay)
+            if ctx is not None:
+                # Refetch instead of retrying against the memoized values
+                ctx.invalidate("moving_averages_1m", "moving_averages_5m")
 
         raise ValueError("Failed to fetch valid moving averages after multiple attempts.")
 
@@ -462,9 +471,11 @@ class Strategy:
             return False
         return long_pos_price < ma_6_low
 
-    def get_market_data_with_retry(self, symbol, max_retries=5, retry_delay=5):
+    def get_market_data_with_retry(self, symbol, max_retries=5, retry_delay=5, ctx=None):
         for i in range(max_retries):
             try:
+                if ctx is not None:
+                    return ctx.market_data()
                 return self.exchange.get_market_data_bybit(symbol)
             except Exception as e:
                 if i < max_retries - 1:
@@ -484,9 +495,11 @@ class Strategy:
                 else:
                     raise e
 
-    def get_balance_with_retry(self, quote_currency, max_retries=5, retry_delay=5):
+    def get_balance_with_retry(self, quote_currency, max_retries=5, retry_delay=5, ctx=None):
         for i in range(max_retries):
             try:
+                if ctx is not None:
+                    return ctx.total_equity()
                 return self.exchange.get_balance_bybit(quote_currency)
             except Exception as e:
                 if i < max_retries - 1:
@@ -495,11 +508,11 @@ class Strategy:
                 else:
                     raise e
 
-    def calc_max_trade_qty(self, symbol, total_equity, best_ask_price, max_leverage, max_retries=5, retry_delay=5):
+    def calc_max_trade_qty(self, symbol, total_equity, best_ask_price, max_leverage, max_retries=5, retry_delay=5, ctx=None):
         wallet_exposure = self.config.wallet_exposure
         for i in range(max_retries):
             try:
-                market_data = self.get_market_data_with_retry(symbol, max_retries = 5, retry_delay = 5)
+                market_data = self.get_market_data_with_retry(symbol, max_retries = 5, retry_delay = 5, ctx=ctx)
                 max_trade_qty = round(
                     (float(total_equity) * wallet_exposure / float(best_ask_price))
                     / (100 / max_leverage),
@@ -862,11 +875,11 @@ class Strategy:
         return None
 
 
-    def calculate_long_take_profit_spread_bybit(self, long_pos_price, symbol, increase_percentage=0):
+    def calculate_long_take_profit_spread_bybit(self, long_pos_price, symbol, increase_percentage=0, ctx=None):
         if long_pos_price is None:
             return None
 
-        five_min_data = self.manager.get_5m_moving_averages(symbol)
+        five_min_data = ctx.moving_averages_5m() if ctx is not None else self.manager.get_5m_moving_averages(symbol)
         price_precision = int(self.exchange.get_price_precision(symbol))
 
         if five_min_data is not None:
@@ -899,11 +912,11 @@ class Strategy:
             return float(long_profit_price)
         return None
 
-    def calculate_short_take_profit_spread_bybit(self, short_pos_price, symbol, increase_percentage=0):
+    def calculate_short_take_profit_spread_bybit(self, short_pos_price, symbol, increase_percentage=0, ctx=None):
         if short_pos_price is None:
             return None
 
-        five_min_data = self.manager.get_5m_moving_averages(symbol)
+        five_min_data = ctx.moving_averages_5m() if ctx is not None else self.manager.get_5m_moving_averages(symbol)
         price_precision = int(self.exchange.get_price_precision(symbol))
 
         if five_min_data is not None:
@@ -1235,23 +1248,20 @@ class Strategy:
                 print(f"Error in switching account type {e}")
                 
     # MFIRSI with retry
-    def initialize_MFIRSI(self, symbol):
+    def update_MFIRSI(self, symbol):
+        """
+        Feed new 5m candles into the symbol's streaming MFI/RSI/MA state.
+
+        :returns tuple: (bars, last) where last holds the indicator values
+            and buy/sell conditions of the forming candle
+        """
         max_retries = 5
         retry_delay = 2  # delay in seconds
         for attempt in range(max_retries):
             try:
-                df = self.exchange.fetch_ohlcv(symbol, timeframe='5m')
-
-                #print(df.head())
-                df['mfi'] = ta.volume.money_flow_index(df['high'], df['low'], df['close'], df['volume'], window=14)
-                df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-                df['ma'] = ta.trend.sma_indicator(df['close'], window=14)
-                df['open_less_close'] = (df['open'] < df['close']).astype(int)
-
-                df['buy_condition'] = ((df['mfi'] < 20) & (df['rsi'] < 35) & (df['open_less_close'] == 1)).astype(int)
-                df['sell_condition'] = ((df['mfi'] > 80) & (df['rsi'] > 65) & (df['open_less_close'] == 0)).astype(int)
-
-                return df
+                bars = self.exchange.candle_store.get(symbol, '5m')
+                stream = self.mfirsi_streams.setdefault(symbol, MFIRSIStream(window=14))
+                return bars, stream.update(bars)
             except Exception as e:
                 if attempt < max_retries - 1:  # If not the last attempt
                     print(f"Error occurred while fetching OHLCV data: {e}. Retrying in {retry_delay} seconds...")
@@ -1261,16 +1271,28 @@ class Strategy:
                     print(f"Error occurred while fetching OHLCV data: {e}. No more retries left.")
                     raise  # Re-raise the last exception
 
+    def initialize_MFIRSI(self, symbol):
+        bars, last = self.update_MFIRSI(symbol)
+        stream = self.mfirsi_streams[symbol]
+
+        df = pd.DataFrame(bars[:, 1:], columns=['open', 'high', 'low', 'close', 'volume'], index=pd.to_datetime(bars[:, 0], unit='ms'))
+        df.index.name = 'timestamp'
+        rows = [stream.history.get(timestamp) or stream.row(0, 0, numpy.nan, numpy.nan, numpy.nan) for timestamp in bars[:-1, 0]] + [last]
+        for column in ['mfi', 'rsi', 'ma', 'open_less_close', 'buy_condition', 'sell_condition']:
+            df[column] = [row[column] for row in rows]
+
+        return df
+
     def should_long_MFI(self, symbol):
-        df = self.initialize_MFIRSI(symbol)
-        condition = df.iloc[-1]['buy_condition'] == 1
+        _, last = self.update_MFIRSI(symbol)
+        condition = last['buy_condition'] == 1
         if condition:
             self.last_mfirsi_signal = 'long'
         return condition
 
     def should_short_MFI(self, symbol):
-        df = self.initialize_MFIRSI(symbol)
-        condition = df.iloc[-1]['sell_condition'] == 1
+        _, last = self.update_MFIRSI(symbol)
+        condition = last['sell_condition'] == 1
         if condition:
             self.last_mfirsi_signal = 'short'
         return condition
@@ -0,0 +1,69 @@
+class TickContext:
+    """
+    Inputs of one strategy loop iteration for one symbol.
+
+    Every read is fetched lazily on first use and memoized, so each input
+    costs at most one call per tick and every decision in the tick sees the
+    same values. Build a new context at the top of each iteration.
+    """
+    def __init__(self, exchange, manager, symbol, quote_currency="USDT"):
+        self.exchange = exchange
+        self.manager = manager
+        self.symbol = symbol
+        self.quote_currency = quote_currency
+        self.values = {}
+
+    def _memo(self, key, fetch):
+        if key not in self.values:
+            self.values[key] = fetch()
+        return self.values[key]
+
+    def invalidate(self, *keys):
+        """
+        Drop memoized reads so the next use fetches them again, for callers
+        that retry on a bad value.
+        """
+        for key in keys:
+            self.values.pop(key, None)
+
+    def quant_data(self):
+        return self._memo("quant_data", self.manager.get_data)
+
+    def asset_value(self, value):
+        return self.manager.get_asset_value(self.symbol, self.quant_data(), value)
+
+    def api_data(self):
+        return self._memo("api_data", lambda: self.manager.get_api_data(self.symbol))
+
+    def orderbook(self):
+        return self._memo("orderbook", lambda: self.exchange.get_orderbook(self.symbol))
+
+    def best_bid(self):
+        return self.orderbook()["bids"][0][0]
+
+    def best_ask(self):
+        return self.orderbook()["asks"][0][0]
+
+    def current_price(self):
+        return self._memo("current_price", lambda: self.exchange.get_current_price(self.symbol))
+
+    def positions(self):
+        return self._memo("positions", lambda: self.exchange.get_positions_bybit(self.symbol))
+
+    def open_orders(self):
+        return self._memo("open_orders", lambda: self.exchange.get_open_orders(self.symbol))
+
+    def total_equity(self):
+        return self._memo("total_equity", lambda: self.exchange.get_balance_bybit(self.quote_currency))
+
+    def available_equity(self):
+        return self._memo("available_equity", lambda: self.exchange.get_available_balance_bybit(self.quote_currency))
+
+    def market_data(self):
+        return self._memo("market_data", lambda: self.exchange.get_market_data_bybit(self.symbol))
+
+    def moving_averages_1m(self):
+        return self._memo("moving_averages_1m", lambda: self.manager.get_1m_moving_averages(self.symbol))
+
+    def moving_averages_5m(self):
+        return self._memo("moving_averages_5m", lambda: self.manager.get_5m_moving_averages(self.symbol))
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
 import logging
+import threading
 import time
 from collections import OrderedDict
+from functools import partial
 from urllib.parse import urlencode
 
+import aiohttp
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
 
 log = logging.getLogger(__name__)
 
@@ -53,30 +58,72 @@ def hashing(
     ).hexdigest()
 
 
+DEFAULT_POOL_SIZE = 20
+
+_session: requests.Session | None = None
+_session_pool_size = DEFAULT_POOL_SIZE
+_session_lock = threading.Lock()
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Keep-alive session holding up to pool_size open connections per host.
+    pool_block makes extra threads wait for a free connection instead of
+    opening (and then discarding) one-off connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Content-Type": "application/json;charset=utf-8"})
+    return session
+
+
+def configure_session_pool(pool_size: int = DEFAULT_POOL_SIZE):
+    """
+    Size the shared connection pool, e.g. to the scraper's max_workers.
+    The session is rebuilt only when the size changes.
+    """
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is not None and pool_size == _session_pool_size:
+            return
+        old_session, _session = _session, build_session(pool_size)
+        _session_pool_size = pool_size
+    if old_session is not None:
+        old_session.close()
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session(_session_pool_size)
+    return _session
+
+
 def dispatch_request(
     http_method: str,
     key: str = "",
     signature: str = "",
     timestamp: int = -1,
 ):
-    session = requests.Session()
-    session.headers.update(
-        {
-            "Content-Type": "application/json;charset=utf-8",
-            "X-MBX-APIKEY": f"{key}",
-            "X-BAPI-API-KEY": f"{key}",
-            "X-BAPI-SIGN": f"{signature}",
-            "X-BAPI-SIGN-TYPE": "2",
-            "X-BAPI-TIMESTAMP": f"{timestamp}",
-            "X-BAPI-RECV-WINDOW": "5000",
-        }
-    )
-    return {
-        "GET": session.get,
-        "DELETE": session.delete,
-        "PUT": session.put,
-        "POST": session.post,
-    }.get(http_method, "GET")
+    """
+    :returns: a request function on the shared keep-alive session. Signing
+        headers are sent with this call only, the session itself is never
+        modified, so it is safe to share between threads.
+    """
+    headers = {
+        "X-MBX-APIKEY": f"{key}",
+        "X-BAPI-API-KEY": f"{key}",
+        "X-BAPI-SIGN": f"{signature}",
+        "X-BAPI-SIGN-TYPE": "2",
+        "X-BAPI-TIMESTAMP": f"{timestamp}",
+        "X-BAPI-RECV-WINDOW": "5000",
+    }
+    method = http_method if http_method in ("GET", "DELETE", "PUT", "POST") else "GET"
+    return partial(get_session().request, method, headers=headers)
 
 
 def send_public_request(
@@ -134,6 +181,57 @@ def send_public_request(
     return empty_response, empty_response
 
 
+async def async_send_public_request(
+    session: aiohttp.ClientSession,
+    url: str,
+    method: str = "GET",
+    url_path: str | None = None,
+    payload: dict | None = None,
+    json_out: bool = True,
+):
+    """
+    send_public_request() on an aiohttp session, for the asyncio scraper.
+    Returns the same (headers, json) pair, or blank responses on failure.
+    """
+    empty_response = BlankResponse().content
+    if url_path is not None:
+        url += url_path
+    if payload is None:
+        payload = {}
+    query_string = urlencode(payload, True)
+    if query_string:
+        url = url + "?" + query_string
+
+    log.debug(f"Requesting {url}")
+
+    try:
+        async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            headers = response.headers
+            if not json_out:
+                return headers, await response.text()
+            json_response = await response.json(content_type=None)
+        if "code" in json_response and "msg" in json_response:
+            if len(json_response["msg"]) > 0:
+                raise HTTPRequestError(
+                    url=url, code=json_response["code"], msg=json_response["msg"]
+                )
+        if "retCode" in json_response:
+            if json_response["retCode"] != 0:
+                raise HTTPRequestError(
+                    url=url, code=json_response["retCode"], msg=json_response["retMsg"]
+                )
+        return headers, json_response
+    except asyncio.TimeoutError:
+        log.warning("Request timed out")
+    except aiohttp.ClientError as e:
+        log.warning(f"Request exception: {e}")
+    except ValueError as e:
+        log.warning(f"JSON decode error for URL {url}. Error: {e}")
+    except HTTPRequestError as e:
+        log.warning(f"HTTP Request error: {e}")
+    return empty_response, empty_response
+
+
 def send_signed_request(
     http_method: str,
     url_path: str,
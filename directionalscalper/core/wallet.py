@@ -0,0 +1,108 @@
+import time
+import copy
+import threading
+from .strategies.logger import Logger
+
+logging = Logger(logger_name="Wallet", filename="Wallet.log", stream=True)
+
+# Bybit coin fields kept in the snapshot, the contract account reports
+# availableBalance while the v5 wallet reports availableToWithdraw
+WALLET_FIELDS = {
+    "equity": ("equity",),
+    "wallet_balance": ("walletBalance",),
+    "available_balance": ("availableBalance", "availableToWithdraw"),
+    "position_margin": ("positionMargin", "totalPositionIM"),
+    "maintenance_margin": ("totalPositionMM",),
+    "order_margin": ("orderMargin", "totalOrderIM"),
+    "upnl": ("unrealisedPnl",),
+    "cum_realised": ("cumRealisedPnl",),
+}
+
+class WalletService:
+    """
+    Account-wide wallet snapshot shared by every symbol worker.
+
+    One fetch_balance() call per refresh_interval returns equity, available
+    balance and margin fields for every coin in the account.
+    """
+    def __init__(self, exchange, refresh_interval=5, retry_interval=1):
+        self.exchange = exchange
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.coins = {}
+        self.last_refresh = 0.0
+        self.last_failure = 0.0
+        self.last_error = None
+        # invalidate() bumps the generation, a snapshot is only fresh when
+        # its fetch started after the last invalidation
+        self.generation = 0
+        self.snapshot_generation = 0
+        self.lock = threading.Lock()
+
+    def is_stale(self):
+        return self.snapshot_generation != self.generation or time.time() - self.last_refresh > self.refresh_interval
+
+    def invalidate(self):
+        self.generation += 1
+
+    def refresh(self):
+        # Only one thread fetches, the others wait for its result
+        with self.lock:
+            if not self.is_stale():
+                return
+            if time.time() - self.last_failure < self.retry_interval:
+                # The fetch just failed, callers queued behind it do not retry one by one
+                if self.last_refresh == 0.0:
+                    raise self.last_error
+                return
+            generation = self.generation
+            try:
+                balance = self.exchange.fetch_balance()
+            except Exception as e:
+                self.last_failure = time.time()
+                self.last_error = e
+                if self.last_refresh == 0.0:
+                    raise e
+                logging.info(f"Failed to refresh wallet, serving snapshot from {time.time() - self.last_refresh:.1f}s ago: {e}")
+                return
+            self.coins = self.parse_balance(balance)
+            self.last_refresh = time.time()
+            self.snapshot_generation = generation
+
+    def parse_balance(self, balance):
+        coins = {}
+        for entry in balance["info"]["result"]["list"]:
+            # v5 nests the coins under each account, the contract account lists them directly
+            coin_list = entry["coin"] if isinstance(entry.get("coin"), list) else [entry]
+            for coin in coin_list:
+                values = {}
+                for field, keys in WALLET_FIELDS.items():
+                    values[field] = 0.0
+                    for key in keys:
+                        if coin.get(key) not in (None, ""):
+                            values[field] = float(coin[key])
+                            break
+                values["total"] = (balance.get(coin["coin"]) or {}).get("total")
+                coins[coin["coin"]] = values
+        return coins
+
+    def get_snapshot(self):
+        """
+        :returns dict: {coin: {"equity", "wallet_balance", "available_balance", ...}}
+        """
+        if self.is_stale():
+            self.refresh()
+        return copy.deepcopy(self.coins)
+
+    def get(self, coin):
+        """
+        :param str coin: coin name, e.g. "USDT"
+        :returns dict: wallet fields for the coin, None when the account has none
+        """
+        if self.is_stale():
+            self.refresh()
+        values = self.coins.get(coin)
+        return dict(values) if values is not None else None
+
+    def snapshot_age(self):
+        return time.time() - self.last_refresh
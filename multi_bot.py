@@ -67,7 +67,8 @@ class DirectionalMarketMaker:
         api_key = exchange_config.api_key
         secret_key = exchange_config.api_secret
         passphrase = exchange_config.passphrase
-        self.exchange = Exchange(self.exchange_name, api_key, secret_key, passphrase)
+        # All symbol threads of one account share a single exchange client
+        self.exchange = Exchange.get_shared(self.exchange_name, account_name, api_key, secret_key, passphrase)
 
     def run_strategy(self, symbol, strategy_name, config, account_name, symbols_to_trade=None):
         symbols_allowed = None
@@ -127,11 +128,7 @@ class DirectionalMarketMaker:
         return self.exchange.symbols
 
 
-def run_bot(symbol, args, manager, account_name, symbols_allowed, rotator_symbols=None):
-    config_file_path = Path('configs/' + args.config)
-    print("Loading config from:", config_file_path)
-    config = load_config(config_file_path)
-
+def run_bot(symbol, args, config, manager, account_name, symbols_allowed, rotator_symbols=None):
     exchange_name = args.exchange  # These are now guaranteed to be non-None
     strategy_name = args.strategy
     account_name = args.account_name  # Get the account_name from args
@@ -158,8 +155,8 @@ def run_bot(symbol, args, manager, account_name, symbols_allowed, rotator_symbol
 
     market_maker.run_strategy(symbol, strategy_name, config, rotator_symbols)
 
-def start_threads_for_symbols(symbols, args, manager, account_name, symbols_allowed):
-    threads = [threading.Thread(target=run_bot, args=(symbol, args, manager, account_name, symbols_allowed, symbols)) for symbol in symbols]
+def start_threads_for_symbols(symbols, args, config, manager, account_name, symbols_allowed):
+    threads = [threading.Thread(target=run_bot, args=(symbol, args, config, manager, account_name, symbols_allowed, symbols)) for symbol in symbols]
     for thread in threads:
         thread.start()
     return threads
@@ -225,7 +222,7 @@ if __name__ == '__main__':
     exchange_name = args.exchange  # Now it will have a value
     #market_maker = DirectionalMarketMaker(config, exchange_name)
     market_maker = DirectionalMarketMaker(config, exchange_name, args.account_name)
-    manager = Manager(market_maker.exchange, api=config.api.mode, path=Path("data", config.api.filename), url=f"{config.api.url}{config.api.filename}")
+    manager = Manager(market_maker.exchange, api=config.api.mode, path=Path("data", config.api.filename), url=f"{config.api.url}{config.api.filename}", long_poll_seconds=config.api.long_poll_seconds, rotator_url=config.api.rotator_url, delta_url=config.api.delta_url)
     
     whitelist = config.bot.whitelist
     blacklist = config.bot.blacklist
@@ -274,7 +271,7 @@ if __name__ == '__main__':
 
     # Start threads for initial set of symbols
     # active_threads = start_threads_for_symbols(symbols_to_trade, args, manager)
-    active_threads = start_threads_for_symbols(symbols_to_trade, args, manager, args.account_name, symbols_allowed)
+    active_threads = start_threads_for_symbols(symbols_to_trade, args, config, manager, args.account_name, symbols_allowed)
 
     # New section for continuous checking of rotator symbols
     while True:
@@ -288,7 +285,7 @@ if __name__ == '__main__':
         new_symbols = [s for s in rotator_symbols_standardized if s not in [t._args[0] for t in active_threads]]
 
         # Start new threads for new symbols
-        new_threads = start_threads_for_symbols(new_symbols, args, manager, args.account_name, symbols_allowed)  # Added args.account_name and symbols_allowed here
+        new_threads = start_threads_for_symbols(new_symbols, args, config, manager, args.account_name, symbols_allowed)  # Added args.account_name and symbols_allowed here
         active_threads.extend(new_threads)
 
         # Sleep for a while before the next iteration
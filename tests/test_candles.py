@@ -0,0 +1,80 @@
+from directionalscalper.core.candles import KlineCache
+
+MINUTE = 60_000
+# Open time of the newest closed 1m candle at NOW
+NOW = 1_700_000_040_000
+NEWEST = NOW - NOW % MINUTE - MINUTE
+
+
+def klines(count, newest=NEWEST, close=100.0):
+    return [
+        {"timestamp": newest - (count - 1 - i) * MINUTE, "open": 100.0, "high": 101.0, "low": 99.0, "close": close + i, "volume": 10.0 + i}
+        for i in range(count)
+    ]
+
+
+def test_only_new_candles_are_fetched():
+    cache = KlineCache()
+    assert cache.fetch_limit("BTCUSDT", "1m", 240, now=NOW) == 240
+    assert cache.merge("BTCUSDT", "1m", klines(240))
+    assert cache.fetch_limit("BTCUSDT", "1m", 240, now=NOW) == 0
+    # Three candles closed since, plus the last stored one to check continuity
+    assert cache.fetch_limit("BTCUSDT", "1m", 240, now=NOW + 3 * MINUTE) == 4
+    assert cache.merge("BTCUSDT", "1m", klines(4, newest=NEWEST + 3 * MINUTE))
+    window = cache.window("BTCUSDT", "1m", 240)
+    assert len(window) == 240
+    assert window[-1]["timestamp"] == NEWEST + 3 * MINUTE
+    assert [bar["timestamp"] for bar in window] == [bar["timestamp"] for bar in klines(240, newest=NEWEST + 3 * MINUTE)]
+
+
+def test_candles_that_do_not_connect_need_a_full_refetch():
+    cache = KlineCache()
+    cache.merge("BTCUSDT", "1m", klines(240))
+    assert not cache.merge("BTCUSDT", "1m", klines(2, newest=NEWEST + 5 * MINUTE))
+    assert cache.merge("BTCUSDT", "1m", klines(240, newest=NEWEST + 5 * MINUTE))
+    assert cache.window("BTCUSDT", "1m", 1)[0]["timestamp"] == NEWEST + 5 * MINUTE
+
+
+def test_growing_a_buffer_keeps_its_candles_and_backfills_once():
+    cache = KlineCache()
+    cache.merge("BTCUSDT", "1m", klines(100))
+    assert cache.buffer("BTCUSDT", "1m", 240).count == 100
+    assert cache.window("BTCUSDT", "1m", 240) == klines(100)
+    assert cache.fetch_limit("BTCUSDT", "1m", 240, now=NOW) == 240
+    assert cache.merge("BTCUSDT", "1m", klines(240))
+    assert cache.window("BTCUSDT", "1m", 240) == klines(240)
+    assert cache.fetch_limit("BTCUSDT", "1m", 240, now=NOW) == 0
+
+
+def test_saved_buffers_are_restored(tmp_path):
+    path = str(tmp_path / "klines.bin")
+    cache = KlineCache()
+    cache.merge("BTCUSDT", "1m", klines(240))
+    cache.merge("BTCUSDT", "5m", klines(20, newest=NEWEST - 4 * MINUTE))
+    cache.save(path)
+
+    restored = KlineCache()
+    assert restored.load(path) == 2
+    assert restored.window("BTCUSDT", "1m", 240) == klines(240)
+    assert restored.buffers[("BTCUSDT", "5m")].capacity == 20
+    assert restored.fetch_limit("BTCUSDT", "1m", 240, now=NOW + MINUTE) == 2
+
+
+def test_restored_buffer_that_disagrees_with_the_exchange_is_refetched(tmp_path):
+    path = str(tmp_path / "klines.bin")
+    cache = KlineCache()
+    cache.merge("BTCUSDT", "1m", klines(240))
+    cache.save(path)
+
+    restored = KlineCache()
+    restored.load(path)
+    # The exchange's version of the last stored candle has a different close
+    assert not restored.merge("BTCUSDT", "1m", klines(2, newest=NEWEST + MINUTE, close=50.0))
+    assert restored.fetch_limit("BTCUSDT", "1m", 240, now=NOW + MINUTE) == 240
+
+
+def test_missing_or_corrupt_snapshot_is_ignored(tmp_path):
+    assert KlineCache().load(str(tmp_path / "missing.bin")) == 0
+    corrupt = tmp_path / "corrupt.bin"
+    corrupt.write_bytes(b"not a kline snapshot")
+    assert KlineCache().load(str(corrupt)) == 0
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+from directionalscalper.core import batch_indicators
+from directionalscalper.core.indicators import MFI, RSI, run
+
+WINDOW = 14
+
+
+@pytest.fixture
+def bars():
+    """
+    OHLCV random walks for three symbols, shape (symbols, bars). The last
+    one starts flat, so the warm-up has no moves in either direction.
+    """
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, (3, 300)), axis=1)
+    close[2, :40] = 100.0
+    spread = rng.uniform(0.1, 1.0, close.shape)
+    high = close + spread
+    low = close - spread
+    low[2, :40] = high[2, :40] = 100.0
+    volume = rng.uniform(1, 1000, close.shape)
+    return high, low, close, volume
+
+
+def ta_rsi(close):
+    return ta.momentum.rsi(pd.Series(close), window=WINDOW).to_numpy()
+
+
+def ta_mfi(high, low, close, volume):
+    series = [pd.Series(column) for column in (high, low, close, volume)]
+    return ta.volume.MFIIndicator(*series, window=WINDOW).money_flow_index().to_numpy()
+
+
+def test_streaming_rsi_matches_ta(bars):
+    _, _, close, _ = bars
+    for row in close:
+        np.testing.assert_allclose(run(RSI(WINDOW), row), ta_rsi(row), rtol=1e-9, equal_nan=True)
+
+
+def test_streaming_mfi_matches_ta(bars):
+    for row in zip(*bars):
+        np.testing.assert_allclose(run(MFI(WINDOW), *row), ta_mfi(*row), rtol=1e-9, equal_nan=True)
+
+
+def test_batch_rsi_matches_ta(bars):
+    _, _, close, _ = bars
+    expected = np.array([ta_rsi(row) for row in close])
+    np.testing.assert_allclose(batch_indicators.rsi(close, WINDOW), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_batch_mfi_matches_ta(bars):
+    expected = np.array([ta_mfi(*row) for row in zip(*bars)])
+    np.testing.assert_allclose(batch_indicators.mfi(*bars, window=WINDOW), expected, rtol=1e-9, equal_nan=True)
@@ -0,0 +1,146 @@
+import json
+import types
+
+import ccxt
+import pytest
+
+import directionalscalper.core.market_cache as market_cache_module
+from directionalscalper.core.exchange import Exchange
+from directionalscalper.core.market_cache import MarketSpecCache
+
+NOW = 1_700_000_000.0
+SYMBOL = "BTC/USDT:USDT"
+
+
+def bybit_market(tick_size="0.10"):
+    return {
+        "id": "BTCUSDT",
+        "symbol": SYMBOL,
+        "precision": {"price": 0.1, "amount": 0.001},
+        "limits": {"amount": {"min": 0.001}, "leverage": {"max": 100}},
+        "contractSize": 1,
+        "info": {
+            "priceFilter": {"tickSize": tick_size},
+            "lotSizeFilter": {"qtyStep": "0.001"},
+            "leverageFilter": {"maxLeverage": "100.00"},
+        },
+    }
+
+
+class StandInClient:
+    """
+    The part of a ccxt client the cache uses, serving `listed` markets and
+    counting load_markets() calls.
+    """
+    id = "bybit"
+
+    def __init__(self):
+        self.listed = {SYMBOL: bybit_market()}
+        self.markets = {}
+        self.loads = 0
+        self.error = None
+        self.order_error = None
+
+    def load_markets(self, reload=False):
+        self.loads += 1
+        if self.error is not None:
+            raise self.error
+        self.set_markets(self.listed)
+        return self.markets
+
+    def set_markets(self, markets):
+        self.markets = {symbol: dict(market) for symbol, market in markets.items()}
+
+    def market(self, symbol):
+        for market in self.markets.values():
+            if symbol in (market["symbol"], market["id"]):
+                return market
+        raise ccxt.BadSymbol(symbol)
+
+    def create_order(self, **kwargs):
+        raise self.order_error
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOW]
+    monkeypatch.setattr(market_cache_module, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def client():
+    return StandInClient()
+
+
+def test_specs_are_served_from_memory_until_the_ttl(clock, client, tmp_path):
+    cache = MarketSpecCache(client, path=tmp_path / "markets.json", ttl_seconds=3600)
+    spec = cache.get("BTCUSDT")
+    assert spec["tick_size"] == 0.1
+    assert spec["qty_step"] == 0.001
+    assert spec["max_leverage"] == 100.0
+    assert cache.get(SYMBOL) is spec
+    assert client.loads == 1
+
+    client.listed = {SYMBOL: bybit_market(tick_size="0.50")}
+    clock[0] += 3601
+    assert cache.get(SYMBOL)["tick_size"] == 0.5
+    assert client.loads == 2
+
+
+def test_snapshot_on_disk_skips_load_markets(clock, client, tmp_path):
+    path = tmp_path / "markets.json"
+    MarketSpecCache(client, path=path).load()
+    assert json.loads(path.read_text())["timestamp"] == NOW
+
+    restarted = StandInClient()
+    cache = MarketSpecCache(restarted, path=path)
+    assert cache.load() == [SYMBOL]
+    assert cache.get("BTCUSDT")["tick_size"] == 0.1
+    assert restarted.loads == 0
+
+
+def test_stale_snapshot_on_disk_is_reloaded(clock, client, tmp_path):
+    path = tmp_path / "markets.json"
+    MarketSpecCache(client, path=path, ttl_seconds=3600).load()
+
+    clock[0] += 3601
+    restarted = StandInClient()
+    MarketSpecCache(restarted, path=path, ttl_seconds=3600).load()
+    assert restarted.loads == 1
+
+
+def test_failed_reload_serves_the_cached_specs(clock, client, tmp_path):
+    cache = MarketSpecCache(client, path=tmp_path / "markets.json", ttl_seconds=3600)
+    cache.get(SYMBOL)
+    clock[0] += 3601
+    client.error = ccxt.NetworkError("timeout")
+    assert cache.get(SYMBOL)["tick_size"] == 0.1
+    # Retried a minute later rather than on every read
+    cache.get(SYMBOL)
+    assert client.loads == 2
+    client.error = None
+    clock[0] += 61
+    cache.get(SYMBOL)
+    assert client.loads == 3
+
+
+def test_invalid_order_reloads_the_specs(clock, client, tmp_path):
+    exchange = Exchange.__new__(Exchange)
+    exchange.exchange = client
+    exchange.market_cache = MarketSpecCache(client, path=tmp_path / "markets.json")
+    assert exchange.get_market_tick_size_bybit("BTCUSDT") == "0.10"
+
+    # The exchange changed the tick size and rejected an order priced on the old one
+    client.listed = {SYMBOL: bybit_market(tick_size="0.50")}
+    client.order_error = ccxt.InvalidOrder("price precision")
+    assert "error" in exchange.create_limit_order_bybit(SYMBOL, "buy", 0.001, 100.1)
+    assert exchange.get_market_tick_size_bybit("BTCUSDT") == "0.50"
+    assert client.loads == 2
+
+
+def test_unknown_symbol_has_no_tick_size(clock, client, tmp_path):
+    exchange = Exchange.__new__(Exchange)
+    exchange.exchange = client
+    exchange.market_cache = MarketSpecCache(client, path=tmp_path / "markets.json")
+    assert exchange.get_market_tick_size_bybit("DOGEUSDT") is None
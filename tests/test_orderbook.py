@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from directionalscalper.core.orderbook import OrderBookStream
+
+SYMBOL = "BTCUSDT"
+TOPIC = f"orderbook.50.{SYMBOL}"
+
+
+class StandInFeed:
+    """
+    Local stand-in for the Bybit public websocket. Every subscription is
+    answered with a snapshot followed by the deltas queued in `deltas`.
+    """
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.requests = []
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        self.ready = threading.Event()
+        threading.Thread(target=self.run, daemon=True).start()
+        assert self.ready.wait(5)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/ws"
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.start())
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/ws", self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            message = msg.json()
+            self.requests.append(message)
+            if message["op"] != "subscribe":
+                continue
+            await ws.send_json({
+                "topic": TOPIC,
+                "type": "snapshot",
+                "data": {
+                    "s": SYMBOL,
+                    "b": [["100.0", "1"], ["99.5", "2"], ["99.0", "3"]],
+                    "a": [["100.5", "1"], ["101.0", "2"], ["101.5", "3"]],
+                    "u": 10,
+                },
+            })
+            while self.deltas:
+                update_id, bids, asks = self.deltas.pop(0)
+                await ws.send_json({
+                    "topic": TOPIC,
+                    "type": "delta",
+                    "data": {"s": SYMBOL, "b": bids, "a": asks, "u": update_id},
+                })
+        return ws
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def stream():
+    streams = []
+
+    def connect(feed):
+        stream = OrderBookStream(url=feed.url)
+        stream.subscribe(SYMBOL)
+        streams.append(stream)
+        return stream
+
+    yield connect
+    for stream in streams:
+        stream.stop()
+
+
+def test_snapshot_then_deltas(stream):
+    feed = StandInFeed([
+        # New best bid, best ask removed
+        (11, [["100.2", "4"]], [["100.5", "0"]]),
+        # Bid level resized, new ask level
+        (12, [["99.5", "5"]], [["102.0", "1"]]),
+    ])
+    book_stream = stream(feed)
+
+    assert wait_until(lambda: book_stream.get_book(SYMBOL) is not None and book_stream.get_book(SYMBOL).update_id == 12)
+    book = book_stream.get_book(SYMBOL)
+
+    assert book.best_bid() == 100.2
+    assert book.best_ask() == 101.0
+    assert book.depth(2) == {
+        "bids": [[100.2, 4.0], [100.0, 1.0]],
+        "asks": [[101.0, 2.0], [101.5, 3.0]],
+    }
+    assert book.depth()["asks"][-1] == [102.0, 1.0]
+    assert book.cumulative_volume("bids") == 13.0
+    assert book.cumulative_volume("bids", levels=2) == 5.0
+    assert book.cumulative_volume("asks", price_limit=101.5) == 5.0
+
+
+def test_sequence_gap_resubscribes(stream):
+    feed = StandInFeed([
+        (11, [["100.2", "4"]], []),
+        # Update 12 is lost
+        (13, [["100.4", "1"]], []),
+    ])
+    book_stream = stream(feed)
+
+    assert wait_until(lambda: [r["op"] for r in feed.requests] == ["subscribe", "unsubscribe", "subscribe"])
+    # The gapped delta was not applied and the book came back from the new snapshot
+    assert wait_until(lambda: book_stream.get_book(SYMBOL) is not None)
+    book = book_stream.get_book(SYMBOL)
+    assert book.update_id == 10
+    assert book.best_bid() == 100.0
+    assert book.best_ask() == 100.5
@@ -0,0 +1,91 @@
+import pytest
+
+from directionalscalper.core.positions import PositionService
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+class StandInExchange:
+    """
+    Answers fetch_positions() with one long BTC position, counting the calls.
+    `during_fetch` runs inside the call, as an order landing mid-request would.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.qty = 1.0
+        self.error = None
+        self.during_fetch = None
+
+    def fetch_positions(self):
+        self.calls += 1
+        if self.during_fetch is not None:
+            self.during_fetch()
+        if self.error is not None:
+            raise self.error
+        return [{
+            "symbol": SYMBOL,
+            "side": "long",
+            "contracts": self.qty,
+            "entryPrice": 100.0,
+            "percentage": 1.5,
+            "liquidationPrice": 50.0,
+            "info": {"positionIdx": 1, "unrealisedPnl": "2.5", "cumRealisedPnl": "-1"},
+        }]
+
+    def market(self, symbol):
+        return {"symbol": SYMBOL if symbol in ("BTCUSDT", SYMBOL) else symbol}
+
+
+@pytest.fixture
+def exchange():
+    return StandInExchange()
+
+
+def test_one_fetch_per_refresh_interval(exchange):
+    service = PositionService(exchange, refresh_interval=60)
+    assert service.get("BTCUSDT")["long"]["qty"] == 1.0
+    assert service.get(SYMBOL)["long"]["upnl"] == 2.5
+    assert service.get("ETHUSDT")["short"]["qty"] == 0.0
+    assert len(service.get_open_positions()) == 1
+    assert exchange.calls == 1
+
+
+def test_invalidate_forces_a_refetch(exchange):
+    service = PositionService(exchange, refresh_interval=60)
+    service.get("BTCUSDT")
+    exchange.qty = 2.0
+    service.invalidate()
+    assert service.get("BTCUSDT")["long"]["qty"] == 2.0
+    assert exchange.calls == 2
+
+
+def test_invalidate_during_fetch_keeps_snapshot_stale(exchange):
+    service = PositionService(exchange, refresh_interval=60)
+    # The order was placed while the fetch was in flight, its result may predate it
+    exchange.during_fetch = service.invalidate
+    service.get("BTCUSDT")
+    assert service.is_stale()
+    exchange.during_fetch = None
+    service.get("BTCUSDT")
+    assert not service.is_stale()
+    assert exchange.calls == 2
+
+
+def test_failed_refresh_serves_the_previous_snapshot(exchange):
+    service = PositionService(exchange, refresh_interval=60, retry_interval=60)
+    service.get("BTCUSDT")
+    service.invalidate()
+    exchange.error = RuntimeError("timeout")
+    assert service.get("BTCUSDT")["long"]["qty"] == 1.0
+    # Callers behind the failure do not retry until retry_interval has passed
+    service.get("BTCUSDT")
+    assert exchange.calls == 2
+
+
+def test_failure_without_a_snapshot_raises(exchange):
+    service = PositionService(exchange, retry_interval=60)
+    exchange.error = RuntimeError("timeout")
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            service.get("BTCUSDT")
+    assert exchange.calls == 1
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from api.quantdata import QuantPublisher, QuantSnapshot, decode_columns, encode_columns
+
+
+def make_rows(cycle):
+    """
+    Rows of one scraper cycle: prices move every cycle, one asset is listed
+    from cycle 2 on and another delisted from cycle 3 on.
+    """
+    rows = [
+        {"Asset": "BTCUSDT", "Min qty": 0.001, "Price": 30000.0 + cycle, "1m 1x Volume (USDT)": 5e6, "MFI": "long", "Funding": 0.01},
+        {"Asset": "ETHUSDT", "Min qty": 0.01, "Price": 2000.0, "1m 1x Volume (USDT)": float("nan"), "MFI": "neutral", "Funding": -0.02},
+        {"Asset": "DOGEUSDT", "Min qty": 1.0, "Price": 0.07 + cycle / 100, "1m 1x Volume (USDT)": 1e5, "MFI": "short", "Funding": 0.0},
+    ]
+    if cycle >= 2:
+        rows.append({"Asset": "NEWUSDT", "Min qty": 1.0, "Price": 1.0, "1m 1x Volume (USDT)": None, "MFI": "neutral", "Funding": 0.0})
+    if cycle >= 3:
+        rows = [row for row in rows if row["Asset"] != "DOGEUSDT"]
+    return rows
+
+
+def test_columnar_round_trip():
+    rows = [
+        {"Asset": "BTCUSDT", "Min qty": 0.001, "Price": 30000.5, "Trend": "long", "Timestamp": 1700000000, "Extra": {"a": 1}},
+        {"Asset": "ETHUSDT", "Min qty": 0.01, "Price": None, "Trend": None, "Timestamp": 1700000001, "Extra": [1, 2]},
+    ]
+    payload = encode_columns(rows, seq=42)
+    assert decode_columns(payload) == rows
+    snapshot = QuantSnapshot.from_columns(payload)
+    assert snapshot.seq == 42
+    assert list(snapshot) == rows
+
+
+def test_corrupted_payload_is_rejected():
+    payload = bytearray(encode_columns(make_rows(0)))
+    payload[-1] ^= 0xFF
+    with pytest.raises(ValueError):
+        decode_columns(bytes(payload))
+
+
+def test_snapshot_lookups():
+    snapshot = QuantSnapshot(make_rows(0) + [{"no": "asset"}])
+    assert len(snapshot) == 3
+    assert snapshot.rows["ETHUSDT"]["MFI"] == "neutral"
+    assert snapshot.get("BTCUSDT").min_qty == 0.001
+    assert snapshot.value("BTCUSDT", "Price") == 30000.0
+    assert snapshot.value("DOGEUSDT", "1mVol") == 1e5
+    assert snapshot.value("DOGEUSDT", "MFI") == "short"
+    assert snapshot.value("XRPUSDT", "Price") is None
+    assert snapshot.value("BTCUSDT", "Unknown") is None
+
+
+def test_deltas_rebuild_every_published_snapshot(tmp_path):
+    publisher = QuantPublisher(str(tmp_path / "q.qdc"), str(tmp_path / "q.delta.json"), keep=10)
+    publisher.publish(make_rows(0))
+    consumer = QuantSnapshot.from_columns((tmp_path / "q.qdc").read_bytes())
+    assert consumer.seq == publisher.seq
+
+    for cycle in range(1, 5):
+        seq = publisher.publish(make_rows(cycle))
+        stream = json.loads((tmp_path / "q.delta.json").read_text())
+        assert stream["seq"] == seq
+        for delta in stream["deltas"]:
+            if delta["seq"] > consumer.seq:
+                consumer = consumer.apply_delta(delta)
+
+        # The snapshot on disk is rewritten every cycle
+        published = QuantSnapshot.from_columns((tmp_path / "q.qdc").read_bytes())
+        assert published.seq == consumer.seq == seq
+        assert list(consumer.rows) == list(published.rows)
+        assert consumer.rows == published.rows
+        assert consumer.assets == published.assets
+
+    assert "DOGEUSDT" not in consumer.rows
+    # NaN is published as null
+    assert consumer.rows["ETHUSDT"]["1m 1x Volume (USDT)"] is None
+
+
+def test_unchanged_fields_are_left_out_of_deltas(tmp_path):
+    publisher = QuantPublisher(str(tmp_path / "q.qdc"), str(tmp_path / "q.delta.json"))
+    publisher.publish(make_rows(0))
+    publisher.publish(make_rows(1))
+    delta = json.loads(publisher.delta_document)["deltas"][-1]
+    assert delta["changed"] == {
+        "BTCUSDT": {"Price": 30001.0},
+        "DOGEUSDT": {"Price": 0.08},
+    }
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+from ccxt.base.errors import RateLimitExceeded
+
+from directionalscalper.core.exchange import RequestScheduler
+
+
+class StandInClient:
+    id = "bybit"
+    rateLimit = 20
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config):
+        return 1
+
+
+def scheduler(market_data=(5, 5), account=(5, 5), trading=(5, 5), max_defer=5):
+    return RequestScheduler(
+        StandInClient(),
+        limits={"market_data": market_data, "account": account, "trading": trading},
+        max_defer=max_defer,
+    )
+
+
+def start(scheduler, admitted, name, *request):
+    def run():
+        scheduler.acquire(*request)
+        admitted.append(name)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_cancels_and_reduce_only_orders_overtake_queued_entries():
+    requests = scheduler(trading=(1, 5))
+    # Drain the trading bucket, the next token is 0.2s away
+    requests.acquire("private", "POST", "v5/order/create", {})
+    admitted = []
+    threads = [start(requests, admitted, "entry", "private", "POST", "v5/order/create", {})]
+    time.sleep(0.05)
+    threads.append(start(requests, admitted, "cancel", "private", "POST", "v5/order/cancel", {}))
+    threads.append(start(requests, admitted, "reduce", "private", "POST", "v5/order/create", {"reduceOnly": True}))
+    for thread in threads:
+        thread.join(5)
+    assert admitted[-1] == "entry"
+    assert sorted(admitted[:2]) == ["cancel", "reduce"]
+
+
+def test_throttled_orders_do_not_hold_up_market_data():
+    requests = scheduler(trading=(1, 5))
+    requests.acquire("private", "POST", "v5/order/create", {})
+    admitted = []
+    threads = [start(requests, admitted, "entry", "private", "POST", "v5/order/create", {}) for _ in range(2)]
+    time.sleep(0.05)
+    started = time.monotonic()
+    for _ in range(5):
+        requests.acquire("public", "GET", "v5/market/orderbook", {})
+    assert time.monotonic() - started < 0.2
+    for thread in threads:
+        thread.join(5)
+    assert admitted == ["entry", "entry"]
+
+
+def test_market_data_is_shed_past_max_defer():
+    requests = scheduler(market_data=(1, 0.1), max_defer=0.5)
+    requests.acquire("public", "GET", "v5/market/kline", {})
+    started = time.monotonic()
+    with pytest.raises(RateLimitExceeded):
+        requests.acquire("public", "GET", "v5/market/kline", {})
+    # Shed right away instead of waiting out the 10s refill
+    assert time.monotonic() - started < 0.1
+
+
+def test_account_reads_wait_instead_of_being_shed():
+    requests = scheduler(account=(1, 4), max_defer=0.05)
+    requests.acquire("private", "GET", "v5/position/list", {})
+    started = time.monotonic()
+    requests.acquire("private", "GET", "v5/position/list", {})
+    assert time.monotonic() - started == pytest.approx(0.25, abs=0.1)
@@ -0,0 +1,62 @@
+import types
+
+import pytest
+
+import api.exchanges.exchange as exchange_module
+from api.exchanges.exchange import RequestWeight
+
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOW]
+    monkeypatch.setattr(exchange_module, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_requests_go_out_immediately_below_pace_from(clock):
+    weight = RequestWeight(limit=10, window=10, pace_from=0.5)
+    assert [weight.reserve() for _ in range(5)] == [0.0] * 5
+
+
+def test_requests_are_spaced_past_pace_from(clock):
+    weight = RequestWeight(limit=10, window=10, pace_from=0.5)
+    for _ in range(5):
+        weight.reserve()
+    # The rest of the budget is spread over the window, one request per window / limit
+    assert [weight.reserve() for _ in range(3)] == pytest.approx([1.0, 2.0, 3.0])
+    assert weight.reserve(cost=2) == pytest.approx(5.0)
+
+
+def test_full_window_waits_for_the_oldest_weight(clock):
+    weight = RequestWeight(limit=4, window=10, pace_from=1)
+    for _ in range(4):
+        weight.reserve()
+        clock[0] += 1
+    # The first request leaves the window 10s after it was sent
+    assert weight.reserve() == pytest.approx(6.0)
+
+
+def test_exhausted_server_budget_waits_for_the_reset(clock):
+    weight = RequestWeight(limit=600, window=5)
+    # X-Bapi-Limit: 600, X-Bapi-Limit-Status: 0, reset in 2.5s
+    weight.update(used=600, limit=600, reset_at=NOW + 2.5)
+    assert weight.reserve() == pytest.approx(2.5)
+
+
+def test_server_budget_past_pace_from_spaces_requests_until_the_reset(clock):
+    weight = RequestWeight(limit=600, window=5, pace_from=0.5)
+    # 8 of 10 used with 4s left: each request waits its share of the time
+    # left after the previous one, so the last goes out at the reset
+    weight.update(used=8, limit=10, reset_at=NOW + 4)
+    assert weight.reserve() == 0.0
+    assert weight.reserve() == pytest.approx(4.0)
+    assert weight.reserve() == pytest.approx(4.0)
+
+
+def test_server_view_expires_at_the_reset(clock):
+    weight = RequestWeight(limit=600, window=5)
+    weight.update(used=600, limit=600, reset_at=NOW + 2)
+    clock[0] += 2
+    assert weight.reserve() == 0.0
@@ -0,0 +1,98 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+from api.manager import Manager
+from api.quantdata import QuantPublisher
+from api.server import QuantDataServer
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_rows(cycle):
+    return [{"Asset": f"A{i}USDT", "Min qty": 1.0, "Price": 100.0 + i + cycle, "MFI": "neutral"} for i in range(50)]
+
+
+class Feed:
+    """
+    A scraper stand-in publishing one cycle at a time to a QuantDataServer.
+    """
+    def __init__(self, tmp_path):
+        self.server = QuantDataServer(host="127.0.0.1", port=free_port(), max_wait=5)
+        self.server.start()
+        self.publisher = QuantPublisher(str(tmp_path / "quantdatav2.qdc"), str(tmp_path / "quantdatav2.delta.json"))
+        self.base = f"http://127.0.0.1:{self.server.port}/data/"
+        self.cycle = 0
+
+    def publish(self):
+        rows = make_rows(self.cycle)
+        self.publisher.publish(rows)
+        self.server.publish({
+            "quantdatav2.json": json.dumps(rows).encode(),
+            "quantdatav2.qdc": self.publisher.snapshot,
+            "quantdatav2.delta.json": self.publisher.delta_document,
+        })
+        self.cycle += 1
+
+
+@pytest.fixture
+def feed(tmp_path):
+    feed = Feed(tmp_path)
+    feed.publish()
+    return feed
+
+
+def test_etag_and_gzip(feed):
+    response = requests.get(feed.base + "quantdatav2.json")
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json() == make_rows(0)
+
+    etag = response.headers["ETag"]
+    assert requests.get(feed.base + "quantdatav2.json", headers={"If-None-Match": etag}).status_code == 304
+    assert requests.get(feed.base + "missing.json").status_code == 404
+    assert requests.get(feed.base + "quantdatav2.json", params={"wait": "soon"}).status_code == 400
+
+
+def test_long_poll_returns_when_the_next_cycle_is_published(feed):
+    etag = requests.get(feed.base + "quantdatav2.json").headers["ETag"]
+    threading.Timer(0.2, feed.publish).start()
+    started = time.monotonic()
+    response = requests.get(feed.base + "quantdatav2.json", headers={"If-None-Match": etag}, params={"wait": 5})
+    assert response.status_code == 200
+    assert response.json() == make_rows(1)
+    assert time.monotonic() - started < 2
+
+
+def test_long_poll_times_out_with_not_modified(feed):
+    etag = requests.get(feed.base + "quantdatav2.json").headers["ETag"]
+    started = time.monotonic()
+    response = requests.get(feed.base + "quantdatav2.json", headers={"If-None-Match": etag}, params={"wait": 0.3})
+    assert response.status_code == 304
+    assert time.monotonic() - started >= 0.3
+
+
+def test_manager_follows_the_delta_stream(feed):
+    manager = Manager(
+        None,
+        api="remote",
+        url=feed.base + "quantdatav2.qdc",
+        delta_url=feed.base + "quantdatav2.delta.json",
+        long_poll_seconds=5,
+    )
+    assert manager.data.value("A1USDT", "Price") == 101.0
+    for cycle in (1, 2):
+        feed.publish()
+        deadline = time.monotonic() + 3
+        while manager.data.seq != feed.publisher.seq and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager.data.seq == feed.publisher.seq
+        assert manager.data.value("A1USDT", "Price") == 101.0 + cycle
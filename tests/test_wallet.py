@@ -0,0 +1,99 @@
+from directionalscalper.core.wallet import WalletService
+
+# fetch_balance() of a v5 unified account: coins nested under each account
+V5_BALANCE = {
+    "USDT": {"total": 1000.0},
+    "info": {"result": {"list": [{
+        "accountType": "UNIFIED",
+        "totalEquity": "1100",
+        "coin": [
+            {
+                "coin": "USDT",
+                "equity": "1000.5",
+                "walletBalance": "990",
+                "availableToWithdraw": "800",
+                "totalPositionIM": "150",
+                "totalPositionMM": "20",
+                "totalOrderIM": "40",
+                "unrealisedPnl": "10.5",
+                "cumRealisedPnl": "-3",
+            },
+            {"coin": "BTC", "equity": "0.01", "walletBalance": "0.01", "availableToWithdraw": ""},
+        ],
+    }]}},
+}
+
+# fetch_balance() of a contract account: every entry is a coin
+CONTRACT_BALANCE = {
+    "USDT": {"total": 500.0},
+    "info": {"result": {"list": [{
+        "coin": "USDT",
+        "equity": "500",
+        "walletBalance": "495",
+        "availableBalance": "300",
+        "positionMargin": "100",
+        "orderMargin": "25",
+        "unrealisedPnl": "5",
+        "cumRealisedPnl": "12",
+    }]}},
+}
+
+
+class StandInExchange:
+    def __init__(self, balance):
+        self.balance = balance
+        self.calls = 0
+
+    def fetch_balance(self):
+        self.calls += 1
+        return self.balance
+
+
+def test_parse_v5_balance():
+    coins = WalletService(None).parse_balance(V5_BALANCE)
+    assert coins["USDT"] == {
+        "equity": 1000.5,
+        "wallet_balance": 990.0,
+        "available_balance": 800.0,
+        "position_margin": 150.0,
+        "maintenance_margin": 20.0,
+        "order_margin": 40.0,
+        "upnl": 10.5,
+        "cum_realised": -3.0,
+        "total": 1000.0,
+    }
+    # Blank and missing fields read as zero
+    assert coins["BTC"]["available_balance"] == 0.0
+    assert coins["BTC"]["upnl"] == 0.0
+    assert coins["BTC"]["total"] is None
+
+
+def test_parse_contract_balance():
+    coins = WalletService(None).parse_balance(CONTRACT_BALANCE)
+    assert list(coins) == ["USDT"]
+    assert coins["USDT"]["available_balance"] == 300.0
+    assert coins["USDT"]["position_margin"] == 100.0
+    assert coins["USDT"]["order_margin"] == 25.0
+    assert coins["USDT"]["maintenance_margin"] == 0.0
+    assert coins["USDT"]["total"] == 500.0
+
+
+def test_invalidate_forces_a_refetch():
+    exchange = StandInExchange(V5_BALANCE)
+    wallet = WalletService(exchange, refresh_interval=60)
+    assert wallet.get("USDT")["equity"] == 1000.5
+    assert wallet.get_snapshot()["BTC"]["equity"] == 0.01
+    assert exchange.calls == 1
+
+    exchange.balance = CONTRACT_BALANCE
+    wallet.invalidate()
+    assert wallet.get("USDT")["equity"] == 500.0
+    assert wallet.get("BTC") is None
+    assert exchange.calls == 2
+
+
+def test_snapshot_is_a_copy():
+    wallet = WalletService(StandInExchange(V5_BALANCE), refresh_interval=60)
+    wallet.get_snapshot()["USDT"]["equity"] = 0.0
+    wallet.get("USDT")["equity"] = 0.0
+    assert wallet.get("USDT")["equity"] == 1000.5